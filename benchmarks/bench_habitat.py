@@ -0,0 +1,218 @@
+# benchmarks/bench_habitat.py
+"""Benchmarks sin pantalla (SDL dummy) del editor y del modelo sobre hábitats sintéticos.
+
+Uso:
+    python benchmarks/bench_habitat.py                          # todo, JSON a stdout
+    python benchmarks/bench_habitat.py --sizes 10 1000 -o run.json
+    python benchmarks/bench_habitat.py --compare base.json      # ratios contra una corrida anterior
+
+Cada medición es (forma, tamaño, métrica) con mediana / mínimo / p90 en ms.
+Las formas y los equipos salen de habitat.synth con semilla fija, así que dos
+corridas miden exactamente los mismos hábitats.
+"""
+import os, sys, json, time, random, shutil, argparse, platform, tempfile, subprocess
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import pygame
+
+from habitat.files import load_save
+from habitat.summaries import SummaryIndex, INDEX_NAME
+from habitat.chunkstore import OBJECTS_DIR
+from habitat.query import parse_query
+from habitat.synth import SHAPES, synthetic_modules
+from ui import Modulos
+
+SIZES = [10, 100, 1000, 10000, 100000]
+SCREEN = (1280, 800)
+MIN_TIME = 0.25      # s de muestreo por métrica (con al menos MIN_RUNS corridas)
+MIN_RUNS = 3
+MAX_RUNS = 200
+LISTING_FILES = 400  # saves en la carpeta del índice de resúmenes (copias de los cuatro formatos)
+LISTING_QUERY = "crew>=0 energy<=0 sort:volume limit:15"
+
+def _measure(fn, setup=None, min_time=MIN_TIME, max_runs=MAX_RUNS):
+    """Corre fn() (tras setup(), sin medirlo) hasta juntar min_time; devuelve tiempos en ms."""
+    times = []; spent = 0.0
+    while len(times) < MIN_RUNS or (spent < min_time and len(times) < max_runs):
+        if setup is not None: setup()
+        t = time.perf_counter(); fn(); dt = time.perf_counter() - t
+        times.append(dt * 1000); spent += dt
+    return times
+
+def _summary(times, per=1):
+    s = sorted(t / per for t in times)
+    return {"median": s[len(s) // 2], "min": s[0], "p90": s[min(len(s) - 1, int(len(s) * 0.9))], "runs": len(s)}
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+# -------------------- mediciones --------------------
+def bench_world(screen, mods, out):
+    """pick, frame completo, totales y reescalado de sprites sobre un Mundo con `mods`."""
+    cam = Modulos.Camera(screen)
+    world = Modulos.Mundo(cam)
+    t = time.perf_counter(); Modulos.apply_config(world, cam, {"modules": mods})
+    out["apply_config"] = _summary([(time.perf_counter() - t) * 1000])
+    hab = world.hab
+    rnd = random.Random(1)
+
+    pts = [(rnd.randrange(SCREEN[0]), rnd.randrange(SCREEN[1])) for _ in range(500)]
+    out["pick_us"] = _summary(_measure(lambda: [world.pick_modulo(p) for p in pts]), per=len(pts) / 1000)
+
+    def dirty(): world._layer_dirty = True
+    out["frame_draw"] = _summary(_measure(world.draw, setup=dirty))
+    out["frame_draw_cached"] = _summary(_measure(world.draw))
+    cam.zoom = cam.min_zoom
+    out["frame_draw_zoomed_out"] = _summary(_measure(world.draw, setup=dirty))
+
+    # reescalado: zooms fuera de la pirámide, con la LRU vacía en cada corrida
+    zooms = [0.31 + 0.0137 * i for i in range(100)]
+    def scale_all():
+        for z in zooms:
+            cam.zoom = z; world._get_scaled_sprite(0); world._get_scaled_sprite(1)
+    out["sprite_rescale_us"] = _summary(_measure(scale_all, setup=world._sprite_lru.clear), per=len(zooms) * 2 / 1000)
+    cam.zoom = 1.0
+    steps = [Modulos.ZOOM_STEP] * 8 + [1 / Modulos.ZOOM_STEP] * 8
+    def zoom_frames():
+        for zf in steps:
+            cam.zoom_at((SCREEN[0] // 2, SCREEN[1] // 2), zf); world.draw()
+    out["zoom_step_frame"] = _summary(_measure(zoom_frames), per=len(steps))
+
+    out["totals_full"] = _summary(_measure(hab.recompute_totals))
+    axs = list(hab.modulos)[:200]
+    def edits():
+        for ax in axs:
+            cur = hab.modulos[ax].equip[0]
+            hab.set_equip(ax, 0, -1 if cur >= 0 else 0)
+    out["totals_incremental_us"] = _summary(_measure(edits), per=len(axs) / 1000)
+    return world, cam
+
+def _tree_bytes(path):
+    total = 0
+    for d, _, names in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(d, n)) for n in names)
+    return total
+
+def bench_files(world, cam, folder, out):
+    """save / load en cada formato, incrementales del diario y del .habm, y el índice de resúmenes."""
+    paths = {}
+    for fmt in ("json", "binary", "journal", "dedup"):
+        sub = os.path.join(folder, fmt)
+        def reset():
+            shutil.rmtree(sub, ignore_errors=True)
+            world.hab.journal = None
+        def run():
+            if fmt == "journal": paths[fmt] = Modulos.save_journal(world, cam, save_dir=sub)
+            else: paths[fmt] = Modulos._save_full(world, cam, sub, None, Modulos.FULL_SAVE_EXTS[fmt])
+        out[f"save_{fmt}"] = _summary(_measure(run, setup=reset, max_runs=20))
+        # el .habm cuenta también sus bloques en .objects
+        out[f"save_{fmt}_bytes"] = _tree_bytes(sub) if fmt == "dedup" else os.path.getsize(paths[fmt])
+    # diario ya creado: guardar sólo unas ediciones
+    ax = next(iter(world.hab.modulos))
+    def edit():
+        world.hab.set_equip(ax, 0, -1 if world.hab.modulos[ax].equip[0] >= 0 else 0)
+    out["save_journal_incremental"] = _summary(_measure(lambda: Modulos.save_journal(world, cam, save_dir=folder),
+                                                        setup=edit, max_runs=50))
+    world.hab.journal = None
+    # .habm con los bloques ya guardados: un slot cambiado reescribe una tesela y el manifiesto
+    sub = os.path.join(folder, "dedup"); before = _tree_bytes(sub)
+    out["save_dedup_incremental"] = _summary(_measure(
+        lambda: Modulos._save_full(world, cam, sub, None, Modulos.FULL_SAVE_EXTS["dedup"]), setup=edit, max_runs=20))
+    out["save_dedup_incremental_bytes"] = (_tree_bytes(sub) - before) / out["save_dedup_incremental"]["runs"]
+    for fmt, path in paths.items():
+        out[f"load_{fmt}"] = _summary(_measure(lambda: load_save(path), max_runs=20))
+    bench_listing(paths, os.path.join(folder, "listing"), out)
+
+def bench_listing(paths, listing, out):
+    """El camino del navegador de saves: SummaryIndex.refresh + consulta sobre una carpeta de LISTING_FILES saves."""
+    os.makedirs(listing, exist_ok=True)
+    srcs = list(paths.values())
+    for i in range(LISTING_FILES):
+        src = srcs[i % len(srcs)]
+        shutil.copyfile(src, os.path.join(listing, f"s{i:05d}{os.path.splitext(src)[1]}"))
+    if "dedup" in paths:
+        shutil.copytree(os.path.join(os.path.dirname(paths["dedup"]), OBJECTS_DIR), os.path.join(listing, OBJECTS_DIR))
+    index = os.path.join(listing, INDEX_NAME)
+    def drop_index():
+        if os.path.exists(index): os.remove(index)
+    def refresh():
+        with SummaryIndex(listing) as idx: idx.refresh()
+    out["index_refresh_cold"] = _summary(_measure(refresh, setup=drop_index, max_runs=10))
+    out["index_refresh_warm"] = _summary(_measure(refresh, max_runs=50))
+    query = parse_query(LISTING_QUERY)
+    with SummaryIndex(listing) as idx:
+        out["index_latest_page"] = _summary(_measure(lambda: idx.latest(15), max_runs=MAX_RUNS))
+        out["index_query"] = _summary(_measure(lambda: (query.run(idx), query.count(idx)), max_runs=MAX_RUNS))
+    shutil.rmtree(listing, ignore_errors=True)
+
+def run(sizes, shapes, seed=0):
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN)
+    results = []
+    folder = tempfile.mkdtemp(prefix="habbench_")
+    try:
+        for shape in shapes:
+            for n in sizes:
+                mods = synthetic_modules(shape, n, seed)
+                out = {}
+                world, cam = bench_world(screen, mods, out)
+                bench_files(world, cam, folder, out)
+                for metric, val in out.items():
+                    row = {"shape": shape, "size": n, "metric": metric}
+                    row.update(val if isinstance(val, dict) else {"value": val})
+                    results.append(row)
+                print(f"{shape:>7} {n:>7}: frame {out['frame_draw']['median']:.2f} ms, "
+                      f"pick {out['pick_us']['median']:.1f} us, save json {out['save_json']['median']:.1f} ms",
+                      file=sys.stderr)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+        pygame.quit()
+    return {
+        "meta": {
+            "timestamp": time.time(), "git": _git_rev(), "python": platform.python_version(),
+            "pygame": pygame.version.ver, "numpy": Modulos.NUMPY_AVAILABLE, "platform": platform.platform(),
+            "screen": list(SCREEN), "seed": seed,
+        },
+        "results": results,
+    }
+
+def compare(new, old_path):
+    """Imprime la mediana nueva / vieja por métrica (>1 = más lento)."""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = {(r["shape"], r["size"], r["metric"]): r for r in json.load(f)["results"]}
+    for r in new["results"]:
+        o = old.get((r["shape"], r["size"], r["metric"]))
+        if o is None or "median" not in r or not o.get("median"): continue
+        ratio = r["median"] / o["median"]
+        flag = "  <-- slower" if ratio > 1.2 else ("  faster" if ratio < 0.8 else "")
+        print(f"{r['shape']:>7} {r['size']:>7} {r['metric']:<24}{o['median']:10.3f} -> {r['median']:10.3f}  x{ratio:.2f}{flag}",
+              file=sys.stderr)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless habitat editor benchmarks (JSON output).")
+    ap.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    ap.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=["spiral", "rings", "growth"])
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("-o", "--output", help="write the JSON here instead of stdout")
+    ap.add_argument("--compare", help="previous JSON run to compare medians against")
+    args = ap.parse_args(argv)
+    res = run(args.sizes, args.shapes, args.seed)
+    text = json.dumps(res, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f: f.write(text)
+    else:
+        print(text)
+    if args.compare: compare(res, args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
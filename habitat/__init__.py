@@ -0,0 +1,36 @@
+# habitat/__init__.py
+"""Modelo del hábitat en Python puro: se importa sin pygame ni pantalla.
+
+Sirve tanto al editor (ui/Modulos.py es una vista sobre Habitat) como a
+herramientas sin display que evalúan configuraciones guardadas.
+
+El paquete exporta sólo el núcleo (geometría, catálogo, totales, almacén y
+modelo), que se importa en milisegundos. Los subsistemas se importan
+explícitamente donde se usan:
+
+    habitat.files          load_save / write_save / save_summary (todos los formatos)
+    habitat.journal        diario de ediciones (.habj)
+    habitat.binfmt         binario (.habb)
+    habitat.chunkstore     deduplicado (.habm)
+    habitat.jsonstream     carga de .json por lotes
+    habitat.connectivity   componentes conexas incrementales
+    habitat.summaries      índice SQLite de resúmenes (habitat.query: consultas)
+    habitat.autosave       guardado en segundo plano y autoguardado
+    habitat.evaluate, habitat.optimize, habitat.convert, habitat.dedup   CLIs
+"""
+from habitat.geometry import (HEX_SIZE, NEI, SQRT3, APOTHEM, HEX_CORNERS, axial_to_world,
+                              world_to_axial, axial_round, hex_points_world, point_in_polygon)
+from habitat.catalog import (CATALOG_PATH, Catalog, load_catalog, format_total, CATALOG, ITEM_DEFS, ITEM_NAMES,
+                             EMPTY_LABEL, MODULE_BASE, RESOURCES, TOTAL_KEYS, ITEM_DELTAS, STYLE_DELTAS, SLOTS)
+from habitat.totals import compute_totals, totals_from_counts, totals_batch, totals_close, TotalsCounter
+from habitat.store import ModuleStore
+from habitat.model import Modulo, Habitat, iter_config_modules
+
+__all__ = [
+    "HEX_SIZE", "NEI", "SQRT3", "APOTHEM", "HEX_CORNERS", "axial_to_world", "world_to_axial",
+    "axial_round", "hex_points_world", "point_in_polygon",
+    "CATALOG_PATH", "Catalog", "load_catalog", "format_total", "CATALOG", "ITEM_DEFS", "ITEM_NAMES",
+    "EMPTY_LABEL", "MODULE_BASE", "RESOURCES", "TOTAL_KEYS", "ITEM_DELTAS", "STYLE_DELTAS", "SLOTS",
+    "compute_totals", "totals_from_counts", "totals_batch", "totals_close", "TotalsCounter",
+    "ModuleStore", "Modulo", "Habitat", "iter_config_modules",
+]
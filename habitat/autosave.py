@@ -0,0 +1,138 @@
+# habitat/autosave.py
+"""Guardado en segundo plano y autoguardado.
+
+El hilo de la UI sólo toma una copia (Habitat.snapshot(), cámara como dict) y
+la encola; SaveWorker la escribe en su propio hilo, siempre de forma atómica
+(temporal + fsync + rename, ver habitat.fsutil) o, para los diarios, agregando
+al .habj. Autosaver decide cuándo autoguardar (por tiempo o por cantidad de
+ediciones) y borra los autoguardados viejos.
+"""
+import os, time, queue, threading
+
+from habitat.binfmt import BIN_EXT
+from habitat.files import write_save
+
+__all__ = ["AUTOSAVE_INTERVAL", "AUTOSAVE_EDITS", "AUTOSAVE_KEEP", "AUTOSAVE_DIR",
+           "SaveWorker", "Autosaver", "prune_autosaves"]
+
+AUTOSAVE_INTERVAL = 60.0     # s entre autoguardados si hubo cambios
+AUTOSAVE_EDITS = 500         # o antes, tras esta cantidad de ediciones
+AUTOSAVE_KEEP = 5            # autoguardados que se conservan
+AUTOSAVE_DIR = "autosave"    # subcarpeta de la carpeta de saves
+AUTOSAVE_PREFIX = "autosave_"
+
+class SaveWorker:
+    """Hilo que ejecuta trabajos de guardado en orden; la UI encola y consulta con poll().
+
+    Cada trabajo es una función sin argumentos que devuelve la ruta escrita.
+    poll() no bloquea y devuelve [(ok, ruta o excepción, etiqueta), ...].
+    """
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._done = queue.Queue()
+        self._pending = 0            # encolados y no terminados (sólo lo toca la UI)
+        self._thread = threading.Thread(target=self._run, name="habitat-save", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self): return self._pending > 0
+
+    def submit(self, job, tag="save"):
+        self._pending += 1
+        self._jobs.put((job, tag))
+
+    def _run(self):
+        while True:
+            item = self._jobs.get()
+            if item is None: return
+            job, tag = item
+            try:
+                self._done.put((True, job(), tag))
+            except Exception as e:
+                self._done.put((False, e, tag))
+
+    def poll(self):
+        out = []
+        while True:
+            try: res = self._done.get_nowait()
+            except queue.Empty: break
+            self._pending -= 1
+            out.append(res)
+        return out
+
+    def close(self, timeout=None):
+        """Termina lo encolado y detiene el hilo; devuelve los resultados que faltaban."""
+        self._jobs.put(None)
+        self._thread.join(timeout)
+        return self.poll()
+
+def prune_autosaves(folder, keep=AUTOSAVE_KEEP):
+    """Borra los autoguardados más viejos de `folder` dejando los `keep` más nuevos."""
+    try:
+        names = [n for n in os.listdir(folder) if n.startswith(AUTOSAVE_PREFIX) and n.endswith(BIN_EXT)]
+    except OSError:
+        return []
+    # el nombre lleva la fecha con ceros a la izquierda: orden alfabético = cronológico
+    old = sorted(names)[:-keep] if keep > 0 else names
+    removed = []
+    for n in old:
+        try:
+            os.remove(os.path.join(folder, n)); removed.append(n)
+        except OSError:
+            pass
+    return removed
+
+class Autosaver:
+    """Autoguarda un Habitat en `folder` como .habb cuando hay cambios y vence un disparador.
+
+    tick() se llama una vez por cuadro: sólo compara contadores y la hora, y
+    toma la copia cuando toca. Si el autoguardado anterior sigue en curso se
+    espera al siguiente cuadro en lugar de encolar otro.
+    """
+    def __init__(self, worker, folder, interval=AUTOSAVE_INTERVAL, edits=AUTOSAVE_EDITS,
+                 keep=AUTOSAVE_KEEP, clock=time.monotonic):
+        self.worker = worker; self.folder = folder
+        self.interval = interval; self.edits = edits; self.keep = keep
+        self.clock = clock
+        self._rev = None             # revisión ya guardada (None = se toma en el primer tick)
+        self._last = clock()
+        self._running = False
+        self._retry = False          # el último falló: se reintenta al vencer el intervalo
+
+    def mark_saved(self, hab):
+        """Un guardado manual (o la carga inicial) cuenta como autoguardado: reinicia los disparadores."""
+        self._rev = hab.revision; self._last = self.clock(); self._retry = False
+
+    def due(self, hab):
+        if self._running: return False
+        if self._rev is None:
+            self.mark_saved(hab); return False
+        waited = self.clock() - self._last >= self.interval
+        if self._retry: return waited
+        changed = hab.revision - self._rev
+        return changed > 0 and (changed >= self.edits or waited)
+
+    def tick(self, hab, camera=None):
+        """Encola un autoguardado si corresponde; devuelve True si lo hizo."""
+        if not self.due(hab): return False
+        snap = hab.snapshot()
+        folder, keep = self.folder, self.keep
+        def job():
+            os.makedirs(folder, exist_ok=True)
+            now = time.time()
+            stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now)) + f"_{int(now * 1000) % 1000:03d}"
+            path = os.path.join(folder, f"{AUTOSAVE_PREFIX}{stamp}{BIN_EXT}")
+            write_save(snap, path, camera=camera, timestamp=now)
+            prune_autosaves(folder, keep)
+            return path
+        self._running = True
+        self.worker.submit(job, tag="autosave")
+        self._rev = hab.revision; self._last = self.clock()
+        return True
+
+    def finished(self, results):
+        """Se le pasan los resultados de worker.poll() para saber cuándo terminó el suyo."""
+        for ok, _, tag in results:
+            if tag == "autosave":
+                self._running = False
+                self._retry = not ok
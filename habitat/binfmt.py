@@ -0,0 +1,151 @@
+# habitat/binfmt.py
+"""Formato binario de saves (.habb): cabecera fija + registros de módulo de ancho fijo.
+
+    cabecera (little-endian):
+        magic "HABB", versión, tamaño de cabecera, tamaño de registro, flags,
+        cantidad de módulos, cámara (x, y, zoom), timestamp, cantidad de totales,
+        y por cada total del catálogo: valor f64, largo u8, nombre UTF-8
+    registros (16 bytes c/u):
+        q int32, r int32, style int8, equip 6×int8, 1 byte de relleno
+
+La lectura mapea el archivo en memoria (mmap) y arma el hábitat por columnas,
+sin pasar por dicts ni Modulo. Los tamaños de cabecera y registro van en el
+archivo, así que una versión futura puede agregar campos al final sin romper
+a los lectores de esta. Los totales van con su nombre: una columna nueva del
+catálogo entra sola. Los archivos de la versión 1 (seis totales fijos) se
+siguen leyendo. Los .json ("version": 1) siguen siendo el formato de
+intercambio; `python -m habitat.convert` pasa de uno a otro.
+"""
+import os, mmap, struct
+from array import array
+
+from habitat.catalog import SLOTS, MODULE_BASE, ITEM_DEFS
+from habitat.model import Habitat
+from habitat.fsutil import atomic_write
+from habitat.compat import NUMPY_AVAILABLE, np     # si está, los registros se separan en columnas sin bucle Python
+
+__all__ = ["BIN_EXT", "BIN_VERSION", "write_binary", "read_binary", "read_binary_header"]
+
+BIN_EXT = ".habb"
+MAGIC = b"HABB"
+BIN_VERSION = 2
+
+HEADER = struct.Struct("<4sHHHHI3ddH")     # ... timestamp, cantidad de totales
+TOTAL = struct.Struct("<dB")               # valor, largo del nombre (sigue el nombre)
+RECORD = struct.Struct("<iib6bx")
+_PREFIX = struct.Struct("<4sHH")           # magic, versión, tamaño de cabecera
+# versión 1: seis totales fijos, sin nombres
+HEADER_V1 = struct.Struct("<4sHHHHI3dd6d")
+HEADER_TOTALS_V1 = ("Energy", "O2", "Waste", "Food", "Crew", "Volume")
+FLAG_CAMERA = 1
+FLAG_TIMESTAMP = 2
+
+# -------------------- escritura --------------------
+def write_binary(hab, path, camera=None, timestamp=None):
+    """Escribe `hab` como .habb (atómico); `camera` es {"pos": [x, y], "zoom": z} o None. Devuelve bytes escritos."""
+    store = hab.modulos
+    n = len(store)
+    flags = 0; cx = cy = 0.0; cz = 1.0; ts = 0.0
+    if camera is not None:
+        flags |= FLAG_CAMERA; cx, cy = camera.get("pos", (0.0, 0.0)); cz = camera.get("zoom", 1.0)
+    if timestamp is not None:
+        flags |= FLAG_TIMESTAMP; ts = timestamp
+    totals = b""
+    for k, v in hab.totals.items():
+        name = k.encode("utf-8")
+        totals += TOTAL.pack(v, len(name)) + name
+    header = HEADER.pack(MAGIC, BIN_VERSION, HEADER.size + len(totals), RECORD.size, flags, n,
+                         cx, cy, cz, ts, len(hab.totals)) + totals
+    if NUMPY_AVAILABLE:
+        recs = np.zeros(n, dtype=_record_dtype(RECORD.size))
+        q, r, st, eq = store.columns()
+        recs["q"] = q; recs["r"] = r; recs["style"] = st; recs["equip"] = eq
+        body = recs.tobytes()
+    else:
+        body = bytearray(n * RECORD.size)
+        eq = store.equip
+        for i, (q, r, st) in enumerate(zip(store.q, store.r, store.style)):
+            RECORD.pack_into(body, i * RECORD.size, q, r, st, *eq[i * SLOTS:(i + 1) * SLOTS])
+    return atomic_write(path, lambda f: f.write(header) + f.write(body))
+
+# -------------------- lectura --------------------
+def _record_dtype(size):
+    return np.dtype({"names": ["q", "r", "style", "equip"],
+                     "formats": ["<i4", "<i4", "i1", ("i1", (SLOTS,))],
+                     "offsets": [0, 4, 8, 9], "itemsize": size})
+
+def _parse_header(buf, size):
+    """Cabecera de `buf` (al menos los primeros `tamaño de cabecera` bytes del archivo)."""
+    if size < _PREFIX.size:
+        raise ValueError("file too short for a habitat binary header")
+    magic, ver, hsize = _PREFIX.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("not a habitat binary (bad magic)")
+    if ver > BIN_VERSION:
+        raise ValueError(f"habitat binary version {ver} is newer than supported ({BIN_VERSION})")
+    fixed = HEADER_V1 if ver == 1 else HEADER
+    if size < fixed.size or hsize < fixed.size or len(buf) < hsize:
+        raise ValueError("corrupt habitat binary header")
+    if ver == 1:
+        _, _, _, rsize, flags, n, cx, cy, cz, ts, *tot = HEADER_V1.unpack_from(buf, 0)
+        totals = dict(zip(HEADER_TOTALS_V1, tot))
+    else:
+        _, _, _, rsize, flags, n, cx, cy, cz, ts, count = HEADER.unpack_from(buf, 0)
+        totals = {}; off = HEADER.size
+        for _ in range(count):
+            if off + TOTAL.size > hsize: raise ValueError("corrupt habitat binary header")
+            value, ln = TOTAL.unpack_from(buf, off); off += TOTAL.size
+            if off + ln > hsize: raise ValueError("corrupt habitat binary header")
+            totals[bytes(buf[off:off + ln]).decode("utf-8")] = value; off += ln
+    if rsize < RECORD.size:
+        raise ValueError("corrupt habitat binary header")
+    if size < hsize + n * rsize:
+        raise ValueError(f"truncated habitat binary: {n} modules announced")
+    return {
+        "version": ver, "header_size": hsize, "record_size": rsize, "modules": n,
+        "camera": {"pos": [cx, cy], "zoom": cz} if flags & FLAG_CAMERA else None,
+        "timestamp": ts if flags & FLAG_TIMESTAMP else None,
+        "totals": totals,
+    }
+
+def read_binary_header(path):
+    """Sólo la cabecera (cantidad, cámara, timestamp y totales guardados), sin leer módulos."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        head = f.read(_PREFIX.size)
+        if len(head) == _PREFIX.size and head[:4] == MAGIC:
+            head += f.read(max(0, _PREFIX.unpack(head)[2] - _PREFIX.size))
+        return _parse_header(head, size)
+
+def _columns(buf, meta):
+    n, hsize, rsize = meta["modules"], meta["header_size"], meta["record_size"]
+    if NUMPY_AVAILABLE:
+        recs = np.frombuffer(buf, dtype=_record_dtype(rsize), count=n, offset=hsize)
+        cols = (np.ascontiguousarray(recs["q"], dtype=np.int32), np.ascontiguousarray(recs["r"], dtype=np.int32),
+                np.ascontiguousarray(recs["style"]), np.ascontiguousarray(recs["equip"]))
+        del recs                       # suelta la vista sobre el mmap antes de cerrarlo
+        ok = n == 0 or (cols[2].min() >= 0 and cols[2].max() < len(MODULE_BASE) and cols[3].max() < len(ITEM_DEFS))
+        q, r, st, eq = (c.tobytes() for c in cols)
+    else:
+        q, r, st, eq = array("i"), array("i"), array("b"), array("b")
+        for i in range(n):
+            rq, rr, rs, *re = RECORD.unpack_from(buf, hsize + i * rsize)
+            q.append(rq); r.append(rr); st.append(rs); eq.extend(re)
+        ok = all(s in MODULE_BASE for s in set(st)) and all(x < len(ITEM_DEFS) for x in set(eq))
+    if not ok:
+        raise ValueError("habitat binary has unknown styles or items")
+    # columnas en orden de bytes nativo (lo que espera ModuleStore.load_columns)
+    return q, r, st, eq
+
+def read_binary(path):
+    """Carga un .habb: (Habitat, cabecera). La cabecera trae "camera" y "timestamp"."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _PREFIX.size:
+            raise ValueError("file too short for a habitat binary header")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            meta = _parse_header(mm, size)
+            cols = _columns(mm, meta)
+    hab = Habitat()
+    hab.load_columns(*cols)
+    return hab, meta
@@ -0,0 +1,101 @@
+# habitat/catalog.py
+"""Catálogo de equipos y estilos de módulo, leído de un archivo de datos.
+
+habitat/catalog.json (o el que indique HAB_CATALOG), versión 1:
+
+    resources  [{"key", "unit", "fmt"}, ...]  columnas de los totales, en orden
+               ("short": unidad abreviada para los cards de saves; si falta, "unit")
+    styles     [{"name", "deltas": {recurso: valor}}, ...]  el id es la posición
+    items      [{"name", "deltas": {recurso: valor}}, ...]  el índice es el del save
+
+Los recursos que un estilo o ítem no nombra valen 0, así que agregar un equipo
+o una columna (masa, costo) es editar el archivo. Al cargarlo se compila en
+matrices densas estilo×recurso e ítem×recurso (tuplas, y arrays NumPy si
+está); los totales de un hábitat son sus conteos por estilo e ítem por esas
+matrices (habitat.totals). Los ids de estilo e ítem van en los saves: sólo se
+agregan al final.
+"""
+import os, json
+from functools import cached_property
+
+from habitat.compat import NUMPY_AVAILABLE, np     # si está, las matrices también se compilan como arrays
+
+__all__ = ["CATALOG_PATH", "Catalog", "load_catalog", "format_total", "CATALOG",
+           "ITEM_DEFS", "ITEM_NAMES", "EMPTY_LABEL", "MODULE_BASE", "RESOURCES",
+           "TOTAL_KEYS", "ITEM_DELTAS", "STYLE_DELTAS", "ITEM_MATRIX", "STYLE_MATRIX", "SLOTS"]
+
+SLOTS = 6   # slots de equipo por módulo (fijo: es parte de los formatos de save)
+EMPTY_LABEL = "Empty"   # slot vacío
+CATALOG_VERSION = 1
+MAX_IDS = 127           # estilos e ítems se guardan como int8 en .habb / ModuleStore
+CATALOG_PATH = os.environ.get("HAB_CATALOG", os.path.join(os.path.dirname(__file__), "catalog.json"))
+
+class Catalog:
+    """Catálogo compilado: listas por id y matrices de aportes en el orden de `keys`."""
+    def __init__(self, data, source="<catalog>"):
+        def bad(msg): return ValueError(f"{source}: {msg}")
+        if not isinstance(data, dict) or data.get("version", CATALOG_VERSION) > CATALOG_VERSION:
+            raise bad(f"not a version {CATALOG_VERSION} catalog")
+        self.resources = [dict(r) for r in data.get("resources", [])]
+        self.keys = tuple(r.get("key") for r in self.resources)
+        if not self.keys or not all(isinstance(k, str) and k for k in self.keys) or len(set(self.keys)) != len(self.keys):
+            raise bad("resources need unique, non-empty keys")
+        col = {k: i for i, k in enumerate(self.keys)}
+
+        def compile_rows(kind):
+            entries = data.get(kind, [])
+            if not entries: raise bad(f"no {kind}")
+            if len(entries) > MAX_IDS: raise bad(f"at most {MAX_IDS} {kind}")
+            rows = []
+            for i, e in enumerate(entries):
+                if not isinstance(e.get("name"), str): raise bad(f"{kind}[{i}] has no name")
+                row = [0.0] * len(self.keys)
+                for k, v in e.get("deltas", {}).items():
+                    if k not in col: raise bad(f"{kind}[{i}] ({e['name']}): unknown resource {k!r}")
+                    if not isinstance(v, (int, float)): raise bad(f"{kind}[{i}] ({e['name']}): {k} is not a number")
+                    row[col[k]] = float(v)
+                rows.append(tuple(row))
+            return [dict(e) for e in entries], rows
+
+        self.styles, self.style_rows = compile_rows("styles")
+        self.items, self.item_rows = compile_rows("items")
+
+    # las matrices NumPy se arman en el primer uso: importar el catálogo no carga NumPy
+    @cached_property
+    def style_matrix(self):
+        return np.array(self.style_rows, dtype=np.float64) if NUMPY_AVAILABLE else self.style_rows
+
+    @cached_property
+    def item_matrix(self):
+        return np.array(self.item_rows, dtype=np.float64) if NUMPY_AVAILABLE else self.item_rows
+
+    def format(self, key, value, short=False):
+        """`value` del total `key` con su formato y unidad ("-350 W"); short=True usa la abreviada."""
+        r = self.resources[self.keys.index(key)]
+        unit = r.get("unit", "")
+        if short: unit = r.get("short", unit)
+        return f"{value:{r.get('fmt', '.2f')}}" + (f" {unit}" if unit else "")
+
+def load_catalog(path=None):
+    path = path or CATALOG_PATH
+    with open(path, "r", encoding="utf-8") as f:
+        return Catalog(json.load(f), source=path)
+
+CATALOG = load_catalog()
+
+# Vistas planas del catálogo cargado (lo que usa el resto del paquete)
+ITEM_DEFS = CATALOG.items
+ITEM_NAMES = [x["name"] for x in ITEM_DEFS]
+MODULE_BASE = dict(enumerate(CATALOG.styles))
+RESOURCES = CATALOG.resources
+TOTAL_KEYS = CATALOG.keys
+# Aportes por módulo de cada estilo / por unidad de cada ítem, en el orden de TOTAL_KEYS
+ITEM_DELTAS = CATALOG.item_rows
+STYLE_DELTAS = dict(enumerate(CATALOG.style_rows))
+format_total = CATALOG.format
+
+def __getattr__(name):
+    # ITEM_MATRIX (ítems × recursos) y STYLE_MATRIX (estilos × recursos), armadas al pedirlas
+    if name == "ITEM_MATRIX": return CATALOG.item_matrix
+    if name == "STYLE_MATRIX": return CATALOG.style_matrix
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,198 @@
+# habitat/chunkstore.py
+"""Saves deduplicados (.habm): un manifiesto chico + bloques de módulos por contenido.
+
+Los módulos se ordenan de forma canónica y se cortan en bloques espaciales
+(teselas de 16 × 16 hexes, como el índice de ModuleStore);
+cada bloque son registros de 16 bytes como los del .habb, comprimidos con zlib
+y guardados una sola vez en FOLDER/.objects/ab/cdef... con el nombre del
+SHA-256 de su contenido. El .habm es JSON:
+
+    {"version": 1, "camera", "timestamp", "module_count", "totals",
+     "record_size": 16, "chunks": [[sha256, módulos], ...]}
+
+Dos saves casi iguales comparten todos los bloques menos los de las teselas
+que cambiaron; uno que sólo movió la cámara no escribe ningún bloque. Primero
+se escriben los bloques nuevos y después el manifiesto (ambos atómicos), así
+que un corte deja a lo sumo bloques sin usar, que collect_garbage() borra.
+Al leer se verifica el hash de cada bloque.
+
+    python -m habitat.dedup import ui/saves --replace   # .json/.habb -> .habm
+    python -m habitat.dedup stats ui/saves
+    python -m habitat.dedup gc ui/saves
+    python -m habitat.convert ui/saves/habitat_X.habm    # -> JSON plano
+"""
+import os, json, time, zlib, hashlib
+
+from habitat.binfmt import RECORD, _record_dtype, _columns
+from habitat.compat import NUMPY_AVAILABLE, np
+from habitat.catalog import SLOTS
+from habitat.model import Habitat
+from habitat.fsutil import atomic_write
+
+__all__ = ["MANIFEST_EXT", "OBJECTS_DIR", "write_manifest", "read_manifest", "read_manifest_header",
+           "collect_garbage", "store_stats"]
+
+MANIFEST_EXT = ".habm"
+MANIFEST_VERSION = 1
+OBJECTS_DIR = ".objects"        # subcarpeta de la carpeta del manifiesto, compartida por todos
+CHUNK_TILE_BITS = 4             # bloques de 16 × 16 hexes: a lo sumo 256 módulos, 4 KB sin comprimir
+GC_MIN_AGE = 600.0              # s; un bloque más nuevo puede ser de un guardado en curso
+
+def _objects_dir(manifest_path):
+    return os.path.join(os.path.dirname(os.path.abspath(manifest_path)), OBJECTS_DIR)
+
+def _object_path(objects, digest):
+    return os.path.join(objects, digest[:2], digest[2:])
+
+# -------------------- escritura --------------------
+def _chunks(hab):
+    """[(bytes de registros, módulos)] por tesela, en orden canónico (no depende del orden de edición)."""
+    store = hab.modulos
+    n = len(store)
+    if not n: return []
+    rs = RECORD.size
+    if NUMPY_AVAILABLE:
+        q, r, st, eq = store.columns()
+        tq = q >> CHUNK_TILE_BITS; tr = r >> CHUNK_TILE_BITS
+        order = np.lexsort((q, r, tq, tr))
+        recs = np.zeros(n, dtype=_record_dtype(rs))
+        recs["q"] = q[order]; recs["r"] = r[order]; recs["style"] = st[order]; recs["equip"] = eq[order]
+        raw = recs.tobytes()
+        tq = tq[order]; tr = tr[order]
+        cuts = (np.flatnonzero((tq[1:] != tq[:-1]) | (tr[1:] != tr[:-1])) + 1).tolist()
+    else:
+        eq = store.equip
+        rows = sorted(range(n), key=lambda i: (store.r[i] >> CHUNK_TILE_BITS, store.q[i] >> CHUNK_TILE_BITS,
+                                               store.r[i], store.q[i]))
+        body = bytearray(n * rs); cuts = []; prev = None
+        for k, i in enumerate(rows):
+            q, r = store.q[i], store.r[i]
+            RECORD.pack_into(body, k * rs, q, r, store.style[i], *eq[i * SLOTS:(i + 1) * SLOTS])
+            tile = (q >> CHUNK_TILE_BITS, r >> CHUNK_TILE_BITS)
+            if prev is not None and tile != prev: cuts.append(k)
+            prev = tile
+        raw = bytes(body)
+    starts = [0] + cuts; stops = cuts + [n]
+    return [(raw[a * rs:b * rs], b - a) for a, b in zip(starts, stops)]
+
+def write_manifest(hab, path, camera=None, timestamp=None):
+    """Escribe `hab` como .habm: los bloques que falten en .objects y el manifiesto. Devuelve bytes escritos."""
+    objects = _objects_dir(path)
+    written = 0; refs = []
+    for raw, count in _chunks(hab):
+        digest = hashlib.sha256(raw).hexdigest()
+        refs.append([digest, count])
+        obj = _object_path(objects, digest)
+        try:
+            # ya está: no se vuelve a escribir; se renueva el mtime para que gc no lo borre
+            # antes de que exista el manifiesto que lo usa
+            os.utime(obj); continue
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        blob = zlib.compress(raw, 6)
+        written += atomic_write(obj, lambda f: f.write(blob))
+    data = {"version": MANIFEST_VERSION}
+    if camera is not None: data["camera"] = camera
+    if timestamp is not None: data["timestamp"] = timestamp
+    data["module_count"] = len(hab.modulos)
+    data["totals"] = dict(hab.totals)
+    data["record_size"] = RECORD.size
+    data["chunks"] = refs
+    text = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return written + atomic_write(path, lambda f: f.write(text))
+
+# -------------------- lectura --------------------
+def read_manifest_header(path):
+    """El manifiesto ya validado (sin leer bloques): "camera", "timestamp", "module_count", "totals", "chunks"."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("chunks"), list):
+        raise ValueError("not a habitat manifest")
+    if data.get("version", 0) > MANIFEST_VERSION:
+        raise ValueError(f"habitat manifest version {data['version']} is newer than supported ({MANIFEST_VERSION})")
+    if data.get("record_size", RECORD.size) < RECORD.size:
+        raise ValueError("corrupt habitat manifest")
+    try: ok = sum(c for _, c in data["chunks"]) == data.get("module_count")
+    except (TypeError, ValueError): ok = False
+    if not ok: raise ValueError("habitat manifest chunks do not add up to module_count")
+    return data
+
+def _read_chunk(objects, digest, count, rsize):
+    try:
+        with open(_object_path(objects, digest), "rb") as f:
+            raw = zlib.decompress(f.read())
+    except FileNotFoundError:
+        raise ValueError(f"missing chunk {digest[:12]}") from None
+    except zlib.error:
+        raise ValueError(f"corrupt chunk {digest[:12]}") from None
+    if len(raw) != count * rsize or hashlib.sha256(raw).hexdigest() != digest:
+        raise ValueError(f"corrupt chunk {digest[:12]}")
+    return raw
+
+def read_manifest(path):
+    """Carga un .habm: (Habitat, manifiesto). El manifiesto trae "camera" y "timestamp"."""
+    meta = read_manifest_header(path)
+    objects = _objects_dir(path); rsize = meta.get("record_size", RECORD.size)
+    buf = b"".join(_read_chunk(objects, d, c, rsize) for d, c in meta["chunks"])
+    cols = _columns(buf, {"modules": meta["module_count"], "header_size": 0, "record_size": rsize})
+    hab = Habitat()
+    hab.load_columns(*cols)
+    return hab, meta
+
+# -------------------- mantenimiento --------------------
+def _manifests(folder):
+    try:
+        return sorted(os.path.join(folder, n) for n in os.listdir(folder) if n.lower().endswith(MANIFEST_EXT))
+    except OSError:
+        return []
+
+def _objects(folder):
+    """[(digest, ruta, stat)] de los bloques guardados en FOLDER/.objects."""
+    out = []
+    objects = os.path.join(folder, OBJECTS_DIR)
+    try: subdirs = os.listdir(objects)
+    except OSError: return out
+    for sub in subdirs:
+        d = os.path.join(objects, sub)
+        try: names = os.listdir(d)
+        except OSError: continue
+        for name in names:
+            p = os.path.join(d, name)
+            try: out.append((sub + name, p, os.stat(p)))
+            except OSError: pass
+    return out
+
+def collect_garbage(folder, min_age=GC_MIN_AGE, dry_run=False):
+    """Borra los bloques que ningún manifiesto de `folder` usa; devuelve (bloques, bytes).
+
+    Los de menos de `min_age` s se dejan: pueden ser de un guardado que todavía
+    no escribió su manifiesto. Si algún manifiesto no se puede leer no se borra
+    nada (no se sabe qué bloques usa).
+    """
+    live = set()
+    for m in _manifests(folder):
+        try: live.update(d for d, _ in read_manifest_header(m)["chunks"])
+        except (OSError, ValueError) as e:
+            raise ValueError(f"{m}: {e}; not collecting") from None
+    now = time.time(); removed = freed = 0
+    for digest, p, st in _objects(folder):
+        # los .tmp de un atomic_write cortado también sobran
+        if (digest in live and not p.endswith(".tmp")) or now - st.st_mtime < min_age: continue
+        if not dry_run:
+            try: os.remove(p)
+            except OSError: continue
+        removed += 1; freed += st.st_size
+    return removed, freed
+
+def store_stats(folder):
+    """Cuánto ocupan los manifiestos y los bloques de `folder` y cuánto ocuparían sin deduplicar."""
+    refs = manifests = manifest_bytes = logical = 0
+    for m in _manifests(folder):
+        try: meta = read_manifest_header(m)
+        except (OSError, ValueError): continue
+        manifests += 1; manifest_bytes += os.path.getsize(m)
+        refs += len(meta["chunks"]); logical += meta["module_count"] * meta.get("record_size", RECORD.size)
+    objs = _objects(folder)
+    return {"manifests": manifests, "manifest_bytes": manifest_bytes, "chunk_refs": refs,
+            "chunks": len(objs), "chunk_bytes": sum(st.st_size for _, _, st in objs), "record_bytes": logical}
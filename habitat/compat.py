@@ -0,0 +1,23 @@
+# habitat/compat.py
+# Dependencias opcionales, resueltas una sola vez para el paquete y la UI.
+import sys, importlib.util
+
+__all__ = ["NUMPY_AVAILABLE", "np"]
+
+def _lazy_import(name):
+    """El módulo `name` sin ejecutarlo (se carga al primer acceso a un atributo), o None si no está instalado."""
+    if name in sys.modules: return sys.modules[name]
+    try: spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError): return None
+    if spec is None or spec.loader is None: return None
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+# NumPy es opcional: sin él todo funciona con array y bucles Python. Se detecta
+# sin importarlo y se carga en el primer uso de `np`, así `import habitat` no
+# paga los ~100 ms de NumPy; los caminos vectorizados los pagan una vez.
+np = _lazy_import("numpy")
+NUMPY_AVAILABLE = np is not None
@@ -0,0 +1,258 @@
+# habitat/connectivity.py
+"""Conectividad incremental del grafo de hexes (6 vecinos, NEI).
+
+Cada módulo lleva la etiqueta de su componente en la columna `label` del
+ModuleStore (int32 por fila, 4 bytes por módulo) y cada componente sólo su
+tamaño; no hay conjuntos de miembros. find es O(1) (leer la fila) y la unión
+reetiqueta el lado chico con un BFS sobre la columna, O(log n) amortizado por
+módulo. Borrar no se deshace con union-find, así que se resuelve aparte:
+
+  - si los vecinos presentes del hex borrado forman un solo arco del anillo,
+    siguen unidos entre sí por el anillo: no hay corte, O(1);
+  - si forman 2 o 3 arcos, se lanzan BFS intercalados desde cada arco; los
+    que se tocan se fusionan y el que se agota primero es un lado separado.
+    Se paga el tamaño del lado chico, no el del hábitat.
+
+Habitat avisa cada alta / baja por `hab.connectivity`; las cargas completas
+sólo invalidan y el índice se rearma en la próxima consulta.
+"""
+from array import array
+from collections import deque
+
+from habitat.geometry import NEI
+
+__all__ = ["Connectivity"]
+
+class Connectivity:
+    """Componentes conexas de un Habitat, al día con sus ediciones.
+
+    Consultas: connected_to_base, would_split, label_of, component_of,
+    components, detached y articulation_points. Se engancha sola al Habitat
+    al construirse.
+    """
+    def __init__(self, hab):
+        self.hab = hab
+        self.sizes = {}        # id de componente -> cantidad de módulos
+        self._next = 0
+        self._valid = False
+        self._art = (None, {}) # (revisión, {id: puntos de articulación}) en caché
+        hab.connectivity = self
+
+    # ---- índice ----
+    def _new_id(self):
+        self._next += 1
+        return self._next
+
+    def _flood(self, start, cid, new=None):
+        """Módulos con etiqueta `cid` conectados a `start` (BFS sobre la columna).
+
+        Con `new` los reetiqueta al pasar y devuelve cuántos fueron; sin `new`
+        devuelve el set.
+        """
+        store = self.hab.modulos; label = store.label; row_of = store.row_of
+        if new is not None:
+            label[row_of(*start)] = new; todo = [start]; n = 1
+            while todo:
+                q, r = todo.pop()
+                for dq, dr in NEI:
+                    row = row_of(q + dq, r + dr)
+                    if row >= 0 and label[row] == cid:
+                        label[row] = new; n += 1; todo.append((q + dq, r + dr))
+            return n
+        seen = {start}; todo = [start]
+        while todo:
+            q, r = todo.pop()
+            for dq, dr in NEI:
+                nb = (q + dq, r + dr)
+                if nb not in seen:
+                    row = row_of(nb[0], nb[1])
+                    if row >= 0 and label[row] == cid: seen.add(nb); todo.append(nb)
+        return seen
+
+    def rebuild(self):
+        """Etiqueta todo de cero con un BFS por componente (O(n))."""
+        store = self.hab.modulos
+        label = store.label = array("i", bytes(4 * len(store)))
+        nbrs = store.neighbor_rows(); sizes = self.sizes = {}
+        for row in range(len(label)):
+            if label[row]: continue
+            cid = self._new_id(); label[row] = cid; n = 1
+            todo = [row]
+            while todo:
+                for nrow in nbrs[todo.pop()]:
+                    if nrow >= 0 and not label[nrow]:
+                        label[nrow] = cid; n += 1; todo.append(nrow)
+            sizes[cid] = n
+        self._valid = True
+
+    def _ready(self):
+        if not self._valid: self.rebuild()
+
+    # ---- avisos de Habitat ----
+    def invalidate(self):
+        self._valid = False; self.sizes = {}
+
+    def added(self, q, r):
+        if not self._valid: return
+        store = self.hab.modulos; label = store.label; sizes = self.sizes
+        starts = {}            # id vecino -> un módulo suyo
+        for dq, dr in NEI:
+            row = store.row_of(q + dq, r + dr)
+            if row >= 0: starts.setdefault(label[row], (q + dq, r + dr))
+        if not starts:
+            cid = self._new_id(); sizes[cid] = 0
+        else:
+            # el componente más grande absorbe a los demás (se reetiqueta el lado chico)
+            cid = max(starts, key=sizes.get)
+            for other, start in starts.items():
+                if other != cid: sizes[cid] += self._flood(start, other, cid); del sizes[other]
+        label[store.row_of(q, r)] = cid; sizes[cid] += 1
+
+    def removed(self, q, r, cid):
+        """(q, r) ya salió del hábitat; `cid` es la etiqueta que tenía."""
+        if not self._valid: return
+        sizes = self.sizes
+        sizes[cid] -= 1
+        if not sizes[cid]:
+            del sizes[cid]; return
+        store = self.hab.modulos; label = store.label
+        for side in self._split_sides(q, r):
+            nid = self._new_id(); sizes[nid] = len(side); sizes[cid] -= len(side)
+            for m in side: label[store.row_of(m[0], m[1])] = nid
+
+    # ---- cortes ----
+    def _arcs(self, q, r):
+        """Un vecino presente por cada arco del anillo alrededor de (q, r)."""
+        mods = self.hab.modulos
+        ring = [(q + dq, r + dr) for dq, dr in NEI]      # NEI va en orden alrededor del hex
+        present = [nb in mods for nb in ring]
+        if all(present): return [ring[0]]
+        # un arco empieza donde hay vecino y el anterior (cíclico) no está
+        return [ring[i] for i in range(6) if present[i] and not present[i - 1]]
+
+    def _split_sides(self, q, r, skip=None):
+        """Lados que quedan aislados al quitar (q, r): lista de sets (vacía si no hay corte).
+
+        Se llama con (q, r) ya fuera del hábitat, o con skip=(q, r) para simular
+        el borrado. Un BFS por arco, intercalados de a un nodo; al tocarse se
+        fusionan y el que se agota es un lado separado. El último que queda es
+        "el resto" y no se recorre entero.
+        """
+        starts = self._arcs(q, r)
+        if len(starts) <= 1: return []
+        mods = self.hab.modulos
+        k = len(starts)
+        group = list(range(k))                  # unión de búsquedas (k <= 3)
+        def find(i):
+            while group[i] != i: i = group[i]
+            return i
+        owner = {s: i for i, s in enumerate(starts)}
+        frontier = [deque([s]) for s in starts]
+        seen = [{s} for s in starts]
+        alive = list(range(k)); sides = []
+        while len(alive) > 1:
+            for i in list(alive):
+                if i not in alive: continue
+                if not frontier[i]:
+                    sides.append(seen[i]); alive.remove(i)
+                    if len(alive) == 1: break
+                    continue
+                cur = i
+                x, y = frontier[cur].popleft()
+                for ddq, ddr in NEI:
+                    nb = (x + ddq, y + ddr)
+                    if nb == skip or nb not in mods: continue
+                    o = owner.get(nb)
+                    if o is None:
+                        owner[nb] = cur; seen[cur].add(nb); frontier[cur].append(nb)
+                        continue
+                    o = find(o)
+                    if o == cur: continue
+                    # se tocaron: la búsqueda más chica se vuelca en la otra
+                    a, b = (cur, o) if len(seen[cur]) >= len(seen[o]) else (o, cur)
+                    group[b] = a; seen[a] |= seen[b]; frontier[a].extend(frontier[b])
+                    frontier[b] = deque(); alive.remove(b)
+                    cur = a
+                if len(alive) == 1: break
+        return sides
+
+    # ---- consultas ----
+    def label_of(self, ax):
+        """Id de la componente de `ax` (0 si no hay módulo)."""
+        self._ready()
+        store = self.hab.modulos
+        row = store.row_of(ax[0], ax[1])
+        return store.label[row] if row >= 0 else 0
+
+    def connected(self, a, b):
+        la = self.label_of(a)
+        return la != 0 and la == self.label_of(b)
+
+    def connected_to_base(self, ax):
+        return self.connected(ax, self.hab.base_ax)
+
+    def would_split(self, ax):
+        """True si borrar `ax` dejaría módulos de su componente separados entre sí."""
+        if ax not in self.hab.modulos: return False
+        return bool(self._split_sides(ax[0], ax[1], skip=ax))
+
+    def component_of(self, ax):
+        cid = self.label_of(ax)
+        return self._flood(ax, cid) if cid else set()
+
+    def component_count(self):
+        self._ready()
+        return len(self.sizes)
+
+    def components(self):
+        """Componentes como sets, de la más grande a la más chica (recorre todo el hábitat)."""
+        self._ready()
+        store = self.hab.modulos; comps = {}
+        for ax, cid in zip(store, store.label): comps.setdefault(cid, set()).add(ax)
+        return sorted(comps.values(), key=len, reverse=True)
+
+    def detached(self):
+        """Cantidad de módulos no conectados a la base."""
+        cid = self.label_of(self.hab.base_ax)
+        return len(self.hab.modulos) - self.sizes.get(cid, 0)
+
+    def articulation_points(self, ax=None):
+        """Módulos de la componente de `ax` (por defecto la base) cuyo borrado la parte.
+
+        Tarjan iterativo sólo sobre esa componente, calculado al pedirlo y en
+        caché por revisión del hábitat.
+        """
+        ax = self.hab.base_ax if ax is None else ax
+        cid = self.label_of(ax)
+        if not cid: return set()
+        rev, cache = self._art
+        if rev != self.hab.revision: cache = {}; self._art = (self.hab.revision, cache)
+        if cid not in cache: cache[cid] = self._tarjan(ax)
+        return set(cache[cid])
+
+    def _tarjan(self, root):
+        store = self.hab.modulos
+        nbrs = store.neighbor_rows()
+        disc = [-1] * len(nbrs); low = [0] * len(nbrs)
+        top = store.row_of(root[0], root[1])
+        disc[top] = low[top] = 0; t = 1
+        out = set(); root_children = 0
+        stack = [(top, -1, iter(nbrs[top]))]
+        while stack:
+            v, parent, it = stack[-1]
+            for w in it:
+                if w < 0 or w == parent: continue
+                if disc[w] >= 0:
+                    if disc[w] < low[v]: low[v] = disc[w]
+                else:
+                    disc[w] = low[w] = t; t += 1
+                    stack.append((w, v, iter(nbrs[w])))
+                    break
+            else:
+                stack.pop()
+                if parent < 0: continue
+                if low[v] < low[parent]: low[parent] = low[v]
+                if parent == top: root_children += 1
+                elif low[v] >= disc[parent]: out.add(parent)
+        if root_children > 1: out.add(top)
+        return {(store.q[i], store.r[i]) for i in out}
@@ -0,0 +1,46 @@
+# habitat/convert.py
+"""Convierte saves entre JSON ("version": 1), el binario .habb y el manifiesto .habm.
+
+Uso:
+    python -m habitat.convert ui/saves/habitat_X.json            # -> habitat_X.habb
+    python -m habitat.convert ui/saves/habitat_X.habb -o out.json
+    python -m habitat.convert ui/saves/habitat_X.habm            # -> habitat_X.json (exportar)
+    python -m habitat.convert ui/saves/*.json --to habm
+
+Un diario .habj también se puede pasar a .habb (se reproduce su último guardado).
+"""
+import os, sys, time, argparse
+
+from habitat.binfmt import BIN_EXT
+from habitat.chunkstore import MANIFEST_EXT
+from habitat.files import load_save, write_save
+
+__all__ = ["main"]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m habitat.convert",
+                                 description="Convert habitat saves between JSON, the binary .habb and the deduplicated .habm.")
+    ap.add_argument("inputs", nargs="+", help=".json/.habj files (converted to .habb) or .habb/.habm files (converted to .json)")
+    ap.add_argument("-o", "--output", help="output path (only with a single input); default: same name, other extension")
+    ap.add_argument("--to", choices=("json", "habb", "habm"), help="output format (default: see above)")
+    args = ap.parse_args(argv)
+    if args.output and len(args.inputs) > 1:
+        ap.error("-o needs exactly one input")
+
+    bad = 0
+    for src in args.inputs:
+        ext = "." + args.to if args.to else ".json" if src.lower().endswith((BIN_EXT, MANIFEST_EXT)) else BIN_EXT
+        dst = args.output or os.path.splitext(src)[0] + ext
+        to_bin = not dst.lower().endswith(".json")
+        try:
+            hab, camera, ts = load_save(src)
+            if to_bin and ts is None: ts = time.time()
+            write_save(hab, dst, camera=camera, timestamp=ts)
+            print(f"{src} -> {dst} ({len(hab)} modules)")
+        except Exception as e:
+            bad += 1
+            print(f"{src}: {type(e).__name__}: {e}", file=sys.stderr)
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# habitat/dedup.py
+"""Mantenimiento de los saves deduplicados (.habm, ver habitat.chunkstore).
+
+Uso:
+    python -m habitat.dedup import ui/saves --replace   # cada .json/.habj/.habb -> .habm
+    python -m habitat.dedup stats ui/saves
+    python -m habitat.dedup gc ui/saves -n              # bloques sin manifiesto (sin borrar)
+
+Para exportar un .habm a JSON plano: python -m habitat.convert X.habm
+"""
+import os, sys, argparse
+
+from habitat.chunkstore import MANIFEST_EXT, GC_MIN_AGE, write_manifest, collect_garbage, store_stats
+from habitat.files import is_save_file, load_save
+
+__all__ = ["import_folder", "main"]
+
+def import_folder(folder, replace=False, log=sys.stderr):
+    """Escribe un .habm junto a cada save de `folder`; devuelve (convertidos, fallidos, bytes antes, bytes escritos)."""
+    names = sorted(n for n in os.listdir(folder) if is_save_file(n) and not n.lower().endswith(MANIFEST_EXT))
+    done = bad = before = after = 0
+    for name in names:
+        src = os.path.join(folder, name)
+        dst = os.path.splitext(src)[0] + MANIFEST_EXT
+        if os.path.exists(dst):
+            print(f"{src}: {dst} already exists, skipped", file=log); continue
+        try:
+            hab, camera, ts = load_save(src)
+            size = os.path.getsize(src)
+            after += write_manifest(hab, dst, camera=camera, timestamp=ts if ts is not None else os.path.getmtime(src))
+            before += size; done += 1
+            if replace: os.remove(src)
+        except Exception as e:
+            bad += 1; print(f"{src}: {type(e).__name__}: {e}", file=log)
+    return done, bad, before, after
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m habitat.dedup", description="Deduplicated habitat saves (.habm).")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("import", help="write a .habm next to every .json/.habj/.habb save in FOLDER")
+    p.add_argument("folder")
+    p.add_argument("--replace", action="store_true", help="delete each original once its .habm is written")
+    p = sub.add_parser("stats", help="show how much the manifests and chunks take")
+    p.add_argument("folder")
+    p = sub.add_parser("gc", help="delete chunks no manifest refers to")
+    p.add_argument("folder")
+    p.add_argument("--min-age", type=float, default=GC_MIN_AGE, help=f"keep chunks newer than this (s, default {GC_MIN_AGE:.0f})")
+    p.add_argument("-n", "--dry-run", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "import":
+        done, bad, before, after = import_folder(args.folder, args.replace)
+        print(f"{done} saves: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB written")
+        return 1 if bad else 0
+    if args.cmd == "stats":
+        s = store_stats(args.folder)
+        stored = s["manifest_bytes"] + s["chunk_bytes"]
+        print(f"{s['manifests']} manifests ({s['manifest_bytes'] / 1e6:.2f} MB), "
+              f"{s['chunks']} chunks for {s['chunk_refs']} references ({s['chunk_bytes'] / 1e6:.2f} MB)")
+        print(f"module records {s['record_bytes'] / 1e6:.2f} MB stored in {stored / 1e6:.2f} MB")
+        return 0
+    try:
+        removed, freed = collect_garbage(args.folder, args.min_age, args.dry_run)
+    except ValueError as e:
+        print(e, file=sys.stderr); return 1
+    print(f"{'would remove' if args.dry_run else 'removed'} {removed} chunks ({freed / 1e6:.2f} MB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
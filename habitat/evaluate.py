@@ -0,0 +1,84 @@
+# habitat/evaluate.py
+"""Evalúa saves de hábitat en paralelo, sin pygame ni pantalla.
+
+Uso:
+    python -m habitat.evaluate ui/saves
+    python -m habitat.evaluate "ui/saves/habitat_2025*.json" --format jsonl -j 8
+
+Emite una fila por archivo a medida que terminan (CSV por defecto). Los
+archivos inválidos salen con la columna "error" llena y no cortan la corrida;
+el código de salida es 1 si hubo alguno.
+"""
+import os, sys, csv, json, glob, argparse
+from multiprocessing import Pool
+
+from habitat.catalog import TOTAL_KEYS
+from habitat.model import Habitat
+from habitat.files import is_save_file, load_save
+
+__all__ = ["FIELDS", "evaluate_config", "evaluate_habitat", "evaluate_file", "expand_paths", "main"]
+
+# una columna por recurso del catálogo, en minúsculas ("energy", "o2", ...)
+FIELDS = ["path", "modules"] + [k.lower() for k in TOTAL_KEYS] + ["error"]
+
+def evaluate_config(cfg):
+    """Totales recalculados (no los guardados en el archivo) de una configuración."""
+    return evaluate_habitat(Habitat.from_config(cfg))
+
+def evaluate_habitat(hab):
+    row = {"modules": len(hab)}
+    row.update((k.lower(), v) for k, v in hab.totals.items())
+    return row
+
+def evaluate_file(path):
+    row = dict.fromkeys(FIELDS)
+    row["path"] = path
+    try:
+        hab, _, _ = load_save(path)
+        row.update(evaluate_habitat(hab))
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+def expand_paths(args):
+    """Directorios (sus saves: .json, .habj, .habb), globs o archivos sueltos, sin repetir."""
+    seen, out = set(), []
+    for a in args:
+        if os.path.isdir(a):
+            found = sorted(os.path.join(a, n) for n in os.listdir(a) if is_save_file(n))
+        else:
+            found = sorted(glob.glob(a)) or [a]   # un archivo inexistente se reporta como error
+        for p in found:
+            if p not in seen:
+                seen.add(p); out.append(p)
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m habitat.evaluate", description="Evaluate saved habitat configurations.")
+    ap.add_argument("paths", nargs="+", help="save files, directories or glob patterns")
+    ap.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+    ap.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    args = ap.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    out = sys.stdout
+    writer = None
+    if args.format == "csv":
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+
+    bad = 0
+    workers = max(1, min(args.workers, len(paths) or 1))
+    chunk = max(1, len(paths) // (workers * 8))
+    with Pool(workers) as pool:
+        for row in pool.imap_unordered(evaluate_file, paths, chunksize=chunk):
+            bad += bool(row["error"])
+            if writer: writer.writerow(row)
+            else: out.write(json.dumps(row) + "\n")
+            out.flush()
+    if bad:
+        print(f"{bad} of {len(paths)} files could not be evaluated", file=sys.stderr)
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# habitat/files.py
+# Carga de saves en cualquiera de los formatos, elegido por extensión.
+import os, json
+
+from habitat.journal import JOURNAL_EXT, open_journal, read_journal, journal_summary
+from habitat.binfmt import BIN_EXT, read_binary, read_binary_header, write_binary
+from habitat.chunkstore import MANIFEST_EXT, read_manifest, read_manifest_header, write_manifest
+from habitat.fsutil import atomic_write
+from habitat.jsonstream import load_json_streaming, read_save_header
+
+__all__ = ["SAVE_EXTS", "is_save_file", "load_save", "save_summary", "write_save"]
+
+SAVE_EXTS = (".json", JOURNAL_EXT, BIN_EXT, MANIFEST_EXT)
+
+def is_save_file(name):
+    return name.lower().endswith(SAVE_EXTS)
+
+def load_save(path, editable=False):
+    """(Habitat, cámara o None, timestamp o None) desde un .json, .habj, .habb o .habm.
+
+    Con editable=True un diario queda enganchado al Habitat para seguir agregando.
+    """
+    low = path.lower()
+    if low.endswith(JOURNAL_EXT):
+        if editable:
+            hab, camera = open_journal(path)
+            save = None
+        else:
+            hab, camera, save = read_journal(path)
+            if save is None: raise ValueError("journal has no complete save")
+        return hab, camera, (save[1] if save else None)
+    if low.endswith(BIN_EXT):
+        hab, meta = read_binary(path)
+        return hab, meta["camera"], meta["timestamp"]
+    if low.endswith(MANIFEST_EXT):
+        hab, meta = read_manifest(path)
+        return hab, meta.get("camera"), meta.get("timestamp")
+    hab, fields = load_json_streaming(path)
+    return hab, fields.get("camera"), fields.get("timestamp")
+
+def save_summary(path):
+    """{"timestamp", "modules", "totals"} guardados en el archivo, sin recalcular nada.
+
+    Los .habj y .habb sólo leen su registro final / cabecera; un .habm, su
+    manifiesto; un .json, sus campos de primer nivel (los módulos se cuentan
+    sin construirlos).
+    """
+    low = path.lower()
+    if low.endswith(JOURNAL_EXT):
+        data = journal_summary(path)
+        if data is None: raise ValueError("journal has no complete save")
+    elif low.endswith(BIN_EXT):
+        data = read_binary_header(path)
+    elif low.endswith(MANIFEST_EXT):
+        data = read_manifest_header(path)
+        data = {"timestamp": data.get("timestamp"), "modules": data["module_count"], "totals": data.get("totals", {})}
+    else:
+        data = read_save_header(path)
+        data = {"timestamp": data.get("timestamp"), "modules": data.get("module_count", 0),
+                "totals": data.get("totals", {})}
+    if data.get("timestamp") is None:
+        data["timestamp"] = os.path.getmtime(path)
+    return {"timestamp": data["timestamp"], "modules": data["modules"], "totals": data["totals"]}
+
+def write_save(hab, path, camera=None, timestamp=None):
+    """Save completo en `path`: .habb, .habm o .json según la extensión, escrito de forma atómica."""
+    if path.lower().endswith(BIN_EXT):
+        return write_binary(hab, path, camera=camera, timestamp=timestamp)
+    if path.lower().endswith(MANIFEST_EXT):
+        return write_manifest(hab, path, camera=camera, timestamp=timestamp)
+    data = json.dumps(hab.to_config(camera=camera, timestamp=timestamp), indent=2).encode("utf-8")
+    return atomic_write(path, lambda f: f.write(data))
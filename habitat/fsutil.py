@@ -0,0 +1,43 @@
+# habitat/fsutil.py
+# Escritura atómica de archivos: temporal en el mismo directorio + fsync + rename.
+import os, tempfile
+
+__all__ = ["atomic_write"]
+
+def _fsync_dir(path):
+    # el rename queda en disco recién cuando se sincroniza el directorio (POSIX)
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return                       # p. ej. Windows: no se pueden abrir directorios
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def atomic_write(path, write):
+    """Llama write(f) sobre un temporal binario y lo renombra a `path`.
+
+    Un corte a mitad de escritura deja el archivo anterior intacto (o ninguno),
+    nunca uno a medias. El temporal termina en ".tmp" para que no se liste
+    como save. Devuelve lo que devuelva write.
+    """
+    d = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix="." + os.path.basename(path) + ".", suffix=".tmp", dir=d)
+    try:
+        # mkstemp crea con 0600: se conservan los permisos del archivo reemplazado
+        try: mode = os.stat(path).st_mode & 0o777
+        except OSError: mode = 0o644
+        os.chmod(tmp, mode)
+        with os.fdopen(fd, "wb") as f:
+            out = write(f)
+            f.flush(); os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try: os.unlink(tmp)
+        except OSError: pass
+        raise
+    _fsync_dir(d)
+    return out
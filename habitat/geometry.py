@@ -0,0 +1,54 @@
+# habitat/geometry.py
+# Geometría axial de hexágonos pointy-top, en coordenadas de mundo (sin pygame).
+import math
+
+__all__ = ["HEX_SIZE", "NEI", "SQRT3", "APOTHEM", "HEX_CORNERS",
+           "axial_to_world", "world_to_axial", "axial_round", "hex_points_world", "point_in_polygon"]
+
+HEX_SIZE = 45
+
+# Axial (pointy-top) — orden estándar
+NEI = [(1,0),(1,-1),(0,-1),(-1,0),(-1,1),(0,1)]
+SQRT3 = math.sqrt(3.0)
+APOTHEM = HEX_SIZE * SQRT3 / 2.0
+
+# Vértices del hex relativos al centro (pointy-top), calculados una sola vez
+HEX_CORNERS = [(HEX_SIZE * math.cos(math.radians(60 * i - 30)),
+                HEX_SIZE * math.sin(math.radians(60 * i - 30))) for i in range(6)]
+
+def axial_to_world(q, r):
+    x = HEX_SIZE * SQRT3 * (q + r/2)
+    y = HEX_SIZE * 1.5 * r
+    return (x, y)
+
+def world_to_axial(x, y):
+    """Inversa de axial_to_world: (q, r) fraccionarios."""
+    q = (SQRT3 / 3.0 * x - y / 3.0) / HEX_SIZE
+    r = (2.0 / 3.0 * y) / HEX_SIZE
+    return (q, r)
+
+def axial_round(q, r):
+    """Redondea (q, r) fraccionarios al hex más cercano (redondeo en cubo)."""
+    x, z = q, r; y = -x - z
+    rx, ry, rz = round(x), round(y), round(z)
+    dx, dy, dz = abs(rx - x), abs(ry - y), abs(rz - z)
+    if dx > dy and dx > dz: rx = -ry - rz
+    elif dy > dz:           ry = -rx - rz
+    else:                   rz = -rx - ry
+    return (int(rx), int(rz))
+
+def hex_points_world(center_w):
+    cx, cy = center_w
+    return [(cx + dx, cy + dy) for dx, dy in HEX_CORNERS]
+
+def point_in_polygon(pt, poly):
+    x, y = pt
+    inside = False
+    n = len(poly)
+    for i in range(n):
+        x1, y1 = poly[i]
+        x2, y2 = poly[(i + 1) % n]
+        if (y1 > y) != (y2 > y):
+            xinters = (x2 - x1) * (y - y1) / (y2 - y1 + 1e-9) + x1
+            if x < xinters: inside = not inside
+    return inside
@@ -0,0 +1,186 @@
+# habitat/journal.py
+"""Diario de ediciones (.habj): guardar cuesta lo editado, no el tamaño del hábitat.
+
+Cada línea es un registro JSON compacto cuyo primer elemento es la operación:
+
+    ["ckpt", {config}]                   estado completo (mismo esquema que los .json)
+    ["place", q, r, style, [equip]]      módulo nuevo o reemplazado
+    ["del", q, r]
+    ["style", q, r, style]
+    ["equip", q, r, slot, item]
+    ["cam", x, y, zoom]
+    ["save", timestamp, ckpt_offset, modules, {totals}]
+
+Un guardado agrega las ediciones pendientes y cierra con un registro "save",
+que apunta al último checkpoint. Al cargar se lee el último "save" desde el
+final del archivo y se reproduce sólo desde su checkpoint; lo que haya después
+de ese "save" (un guardado cortado a la mitad) se descarta.
+"""
+import os, json, time
+
+from habitat.model import Habitat, style_id, item_id
+
+__all__ = ["JOURNAL_EXT", "CHECKPOINT_MIN_EDITS", "EditJournal", "open_journal",
+           "read_journal", "journal_summary"]
+
+JOURNAL_EXT = ".habj"
+# Se escribe un checkpoint cuando las ediciones desde el último superan el
+# tamaño del hábitat (y al menos esta cantidad): la reproducción queda acotada
+# a ~2 cargas completas y el costo amortizado de guardar sigue siendo O(ediciones).
+CHECKPOINT_MIN_EDITS = 2000
+
+_TAIL_BLOCK = 64 * 1024
+
+def _dumps(rec):
+    return json.dumps(rec, separators=(",", ":"))
+
+# -------------------- lectura --------------------
+def _lines_backward(f):
+    """Líneas completas (terminadas en "\n") desde el final: (línea, offset tras su "\n")."""
+    f.seek(0, os.SEEK_END)
+    pos = f.tell(); buf = b""; hi = None    # buf = datos[pos:...]; hi = fin de la línea en curso
+    while True:
+        if hi is None:
+            k = buf.rfind(b"\n")
+            if k >= 0: hi = k + 1                # lo que sigue a la última "\n" está incompleto
+        if hi is not None:
+            j = buf.rfind(b"\n", 0, hi - 1)
+            if j >= 0 or pos == 0:
+                yield buf[j + 1:hi - 1], pos + hi
+                hi = j + 1
+                if hi == 0: return
+                continue
+        if pos == 0: return
+        start = max(0, pos - _TAIL_BLOCK); f.seek(start)
+        block = f.read(pos - start)
+        buf = block + (buf if hi is None else buf[:hi])
+        if hi is not None: hi += len(block)
+        pos = start
+
+def _last_save(f):
+    """(registro "save", offset donde termina) del último guardado completo, o (None, 0)."""
+    for line, end in _lines_backward(f):
+        if line.startswith(b'["save"'):
+            try: return json.loads(line), end
+            except ValueError: pass
+    return None, 0
+
+def _replay(hab, f, start, stop):
+    """Aplica los registros de [start, stop) sobre hab; devuelve (cámara, ediciones)."""
+    camera = None; edits = 0
+    f.seek(start)
+    for line in f.read(stop - start).splitlines():
+        if not line: continue
+        rec = json.loads(line)
+        op = rec[0]
+        if op == "ckpt":
+            cfg = rec[1]; hab.load_modules(cfg.get("modules", [])); camera = cfg.get("camera"); edits = 0
+            continue
+        if op == "place":   hab.add_modulo((rec[1], rec[2]), style_id(rec[3]), [item_id(x) for x in rec[4]])
+        elif op == "del":   hab.remove_modulo((rec[1], rec[2]))
+        elif op == "style": hab.set_style((rec[1], rec[2]), style_id(rec[3]))
+        elif op == "equip": hab.set_equip((rec[1], rec[2]), rec[3], item_id(rec[4]))
+        elif op == "cam":   camera = {"pos": [rec[1], rec[2]], "zoom": rec[3]}; continue
+        else: continue     # "save" y operaciones desconocidas
+        edits += 1
+    return camera, edits
+
+def read_journal(path):
+    """Reproduce un .habj: (Habitat, cámara o None, registro "save" o None)."""
+    hab = Habitat()
+    with open(path, "rb") as f:
+        save, stop = _last_save(f)
+        if save is None:
+            return hab, None, None
+        camera, _ = _replay(hab, f, save[2], stop)
+    return hab, camera, save
+
+def journal_summary(path):
+    """Metadatos del último guardado sin reproducir nada: {timestamp, modules, totals} o None."""
+    with open(path, "rb") as f:
+        save, _ = _last_save(f)
+    if save is None: return None
+    return {"timestamp": save[1], "modules": save[3], "totals": save[4]}
+
+def open_journal(path, checkpoint_min=CHECKPOINT_MIN_EDITS):
+    """Carga un .habj y deja el Habitat enganchado para seguir agregando: (Habitat, cámara)."""
+    hab = Habitat()
+    with open(path, "rb") as f:
+        save, stop = _last_save(f)
+        camera, edits = _replay(hab, f, save[2], stop) if save is not None else (None, 0)
+    j = EditJournal(path, checkpoint_min)
+    j.end = stop                       # lo que siga al último "save" se descarta al guardar
+    if save is not None:
+        j.ckpt_offset = save[2]; j.since_ckpt = edits; j.camera = camera
+        j.need_ckpt = False
+    hab.journal = j
+    return hab, camera
+
+# -------------------- escritura --------------------
+class EditJournal:
+    """Ediciones pendientes de un Habitat y el archivo .habj donde se agregan.
+
+    Habitat llama record() en cada edición y reset() al reemplazar todo; flush()
+    escribe lo pendiente más un registro "save" en una sola escritura.
+    """
+    def __init__(self, path, checkpoint_min=CHECKPOINT_MIN_EDITS):
+        self.path = path
+        self.checkpoint_min = checkpoint_min
+        self.pending = []
+        self.since_ckpt = 0
+        self.need_ckpt = True          # archivo nuevo o hábitat reemplazado
+        self.ckpt_offset = 0
+        self.camera = None             # última cámara escrita
+        self.end = None                # fin del último guardado válido (None = fin del archivo)
+
+    def record(self, rec): self.pending.append(rec)
+
+    def reset(self):
+        self.pending = []; self.need_ckpt = True
+
+    def take(self):
+        """(ediciones pendientes, ¿checkpoint?) y deja el diario vacío.
+
+        Para guardar desde otro hilo: se toma junto con Habitat.snapshot() y se
+        pasa a flush(batch=...); lo que se edite mientras tanto queda para el próximo.
+        """
+        batch = (self.pending, self.need_ckpt)
+        self.pending = []; self.need_ckpt = False
+        return batch
+
+    def flush(self, hab, camera=None, timestamp=None, batch=None):
+        """Agrega lo pendiente (o un checkpoint) y el registro "save"; devuelve bytes escritos."""
+        ts = time.time() if timestamp is None else timestamp
+        pending, need_ckpt = self.take() if batch is None else batch
+        if not need_ckpt and self.since_ckpt + len(pending) >= max(self.checkpoint_min, len(hab)):
+            need_ckpt = True
+        try:
+            return self._append(hab, camera, ts, pending, need_ckpt)
+        except BaseException:
+            self.need_ckpt = True      # lo tomado se perdió: el próximo guardado es completo
+            raise
+
+    def _append(self, hab, camera, ts, pending, need_ckpt):
+        mode = "r+b" if os.path.exists(self.path) else "wb"
+        with open(self.path, mode) as f:
+            # descarta la cola de un guardado que no llegó a cerrarse
+            if self.end is not None: f.truncate(self.end)
+            f.seek(0, os.SEEK_END)
+            off = f.tell()
+            out = []
+            if need_ckpt:
+                cfg = hab.to_config(camera=camera)
+                out.append(_dumps(["ckpt", cfg]))
+                self.ckpt_offset = off; self.since_ckpt = 0
+                self.camera = camera
+            else:
+                out.extend(_dumps(list(rec)) for rec in pending)
+                self.since_ckpt += len(pending)
+                if camera is not None and camera != self.camera:
+                    out.append(_dumps(["cam", camera["pos"][0], camera["pos"][1], camera["zoom"]]))
+                    self.camera = camera
+            out.append(_dumps(["save", ts, self.ckpt_offset, len(hab), hab.totals]))
+            data = ("\n".join(out) + "\n").encode("utf-8")
+            f.write(data); f.flush(); os.fsync(f.fileno())
+            self.end = off + len(data)
+        return len(data)
@@ -0,0 +1,218 @@
+# habitat/jsonstream.py
+"""Lectura incremental de saves .json sin cargar el archivo entero.
+
+El archivo se lee por bloques y cada valor se decodifica con raw_decode a
+medida que llega: las claves sueltas (version, camera, totals, ...) salen
+como campos y el arreglo "modules" sale en lotes. Los saves nuevos escriben
+camera / timestamp / module_count / totals antes de "modules", así que el
+resumen se arma sin tocar los módulos; en los viejos (totals al final) el
+arreglo se salta contando entradas, sin construir los dicts.
+"""
+import os, re, json
+
+from habitat.model import Habitat
+
+__all__ = ["MODULE_CHUNK", "iter_save", "read_save_header", "StreamLoader", "load_json_streaming"]
+
+MODULE_CHUNK = 2048          # entradas de "modules" por lote
+READ_BLOCK = 256 * 1024      # caracteres leídos por vez
+
+_WS = re.compile(r"[ \t\n\r]*")
+_DELIMS = ",:]} \t\n\r"
+# al saltar "modules": strings enteras (pueden tener corchetes) o corchetes/llaves
+_SKIP_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*(?:"|\\?\Z)|[\[\]{}]')
+_decoder = json.JSONDecoder()
+
+class _Reader:
+    """Buffer de texto sobre un archivo, con raw_decode que pide más datos si el valor está cortado."""
+    def __init__(self, f, block=READ_BLOCK):
+        self.f = f; self.block = block
+        self.buf = ""; self.pos = 0; self.eof = False
+        self.consumed = 0          # caracteres descartados del frente del buffer
+
+    def _more(self):
+        if self.eof: return False
+        data = self.f.read(self.block)
+        if not data:
+            self.eof = True; return False
+        if self.pos > len(self.buf) // 2:
+            self.consumed += self.pos
+            self.buf = self.buf[self.pos:]; self.pos = 0
+        self.buf += data
+        return True
+
+    def peek(self):
+        """Siguiente carácter no blanco (sin consumirlo), o "" al final."""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf): return self.buf[self.pos]
+            if not self._more(): return ""
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f"expected {ch!r} at char {self.consumed + self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                val, end = _decoder.raw_decode(self.buf, self.pos)
+                # un número cortado por el bloque ("17.", "1e") se decodifica a medias:
+                # sólo vale si lo que sigue es un separador
+                if self.eof or (end < len(self.buf) and self.buf[end] in _DELIMS):
+                    self.pos = end; return val
+            except ValueError:
+                if self.eof: raise
+            self._more()
+
+    def skip_array(self):
+        """Salta un arreglo de objetos y devuelve cuántas entradas tenía."""
+        self.expect("[")
+        depth = 1; count = 0
+        while True:
+            for m in _SKIP_TOKEN.finditer(self.buf, self.pos):
+                tok = m.group()
+                if tok[0] == '"':
+                    if m.end() == len(self.buf) and not self.eof:
+                        break              # string quizá cortada: releer desde acá
+                    self.pos = m.end()
+                    continue
+                if tok in "[{":
+                    if depth == 1: count += 1
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self.pos = m.end(); return count
+                self.pos = m.end()
+            else:
+                self.pos = len(self.buf)
+            if not self._more():
+                raise ValueError("unexpected end of file inside \"modules\"")
+
+    def progress(self, total):
+        return min(1.0, (self.consumed + self.pos) / total) if total else 1.0
+
+def iter_save(f, chunk=MODULE_CHUNK, skip_modules=False, block=READ_BLOCK):
+    """Eventos de un save .json abierto en modo texto, en el orden del archivo.
+
+    ("field", clave, valor) por cada clave de primer nivel salvo "modules";
+    ("modules", [entradas]) por cada lote. Con skip_modules=True sale
+    ("modules", None) al llegar al arreglo (se puede cortar ahí) y, si se
+    sigue, ("module_count", n) sin construir las entradas.
+    """
+    rd = _Reader(f, block)
+    yield from _iter_events(rd, chunk, skip_modules)
+
+def _iter_events(rd, chunk, skip_modules):
+    rd.expect("{")
+    if rd.peek() == "}":
+        rd.pos += 1; return
+    while True:
+        key = rd.value()
+        if not isinstance(key, str):
+            raise ValueError("object key is not a string")
+        rd.expect(":")
+        if key == "modules" and rd.peek() == "[":
+            if skip_modules:
+                yield ("modules", None)
+                yield ("module_count", rd.skip_array())
+            else:
+                rd.expect("[")
+                batch = []
+                if rd.peek() == "]":
+                    rd.pos += 1
+                else:
+                    while True:
+                        batch.append(rd.value())
+                        if len(batch) >= chunk:
+                            yield ("modules", batch); batch = []
+                        sep = rd.peek()
+                        rd.pos += 1
+                        if sep == "]": break
+                        if sep != ",": raise ValueError(f"expected ',' or ']' in \"modules\", got {sep!r}")
+                if batch: yield ("modules", batch)
+        else:
+            yield ("field", key, rd.value())
+        sep = rd.peek()
+        rd.pos += 1
+        if sep == "}": return
+        if sep != ",": raise ValueError(f"expected ',' or '}}', got {sep!r}")
+
+def read_save_header(path):
+    """Campos de primer nivel de un save .json más "module_count", sin construir los módulos.
+
+    Si el archivo ya trae module_count y totals antes de "modules", la lectura
+    se corta ahí; si no, el arreglo se salta contando entradas.
+    """
+    fields = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for ev in iter_save(f, skip_modules=True):
+            if ev[0] == "field":
+                fields[ev[1]] = ev[2]
+            elif ev[0] == "modules":
+                if "module_count" in fields and "totals" in fields:
+                    break
+            else:
+                fields["module_count"] = ev[1]
+    return fields
+
+class StreamLoader:
+    """Carga un save .json en un Habitat por lotes.
+
+    step() agrega un lote (o procesa campos sueltos) y devuelve True mientras
+    quede archivo; así el editor muestra el hábitat desde el primer lote.
+    `progress(modulos_cargados, fracción)` se llama tras cada lote y
+    `on_field(clave, valor)` por cada campo de primer nivel (camera llega
+    antes que los módulos).
+    """
+    def __init__(self, path, hab, chunk=MODULE_CHUNK, progress=None, on_field=None):
+        self.path = path; self.hab = hab
+        self.progress = progress; self.on_field = on_field
+        self.fields = {}
+        self.loaded = 0
+        self.done = False
+        self._f = open(path, "r", encoding="utf-8")
+        self._size = os.fstat(self._f.fileno()).st_size
+        self._rd = _Reader(self._f)
+        self._events = _iter_events(self._rd, chunk, False)
+        hab.clear()
+
+    @property
+    def fraction(self):
+        return 1.0 if self.done else self._rd.progress(self._size)
+
+    def step(self):
+        if self.done: return False
+        try:
+            ev = next(self._events)
+        except StopIteration:
+            self._finish(); return False
+        except Exception:
+            self._finish(); raise
+        if ev[0] == "field":
+            self.fields[ev[1]] = ev[2]
+            if self.on_field: self.on_field(ev[1], ev[2])
+        else:
+            self.hab.extend_modules(ev[1])
+            self.loaded += len(ev[1])
+            if self.progress: self.progress(self.loaded, self.fraction)
+        return True
+
+    def run(self):
+        """Termina la carga (p. ej. antes de guardar)."""
+        while self.step(): pass
+        return self.hab
+
+    def _finish(self):
+        self.done = True
+        self._f.close()
+        if not len(self.hab):
+            self.hab.add_modulo((0, 0), 0)     # como load_modules con una lista vacía
+
+def load_json_streaming(path, chunk=MODULE_CHUNK, progress=None):
+    """(Habitat, campos de primer nivel) de un save .json, sin json.load del archivo entero."""
+    loader = StreamLoader(path, Habitat(), chunk, progress)
+    loader.run()
+    return loader.hab, loader.fields
@@ -0,0 +1,269 @@
+# habitat/model.py
+# Modelo del hábitat sin pygame: registro de módulo y contenedor con índice espacial.
+import os, math, bisect
+from array import array
+
+from habitat.geometry import NEI, HEX_SIZE, SQRT3, axial_to_world, world_to_axial, axial_round, hex_points_world, point_in_polygon
+from habitat.catalog import SLOTS, MODULE_BASE, ITEM_DEFS
+from habitat.totals import TotalsCounter, totals_from_counts, totals_close
+from habitat.store import Modulo, ModuleStore
+
+__all__ = ["Modulo", "Habitat", "iter_config_modules", "style_id", "item_id", "VERIFY_TOTALS"]
+
+# HAB_VERIFY_TOTALS=1 compara los totales incrementales con el recorrido completo en cada edición
+VERIFY_TOTALS = os.environ.get("HAB_VERIFY_TOTALS") == "1"
+
+def style_id(st):
+    """Estilo validado contra el catálogo (ValueError si no existe)."""
+    st = int(st)
+    if st not in MODULE_BASE: raise ValueError(f"unknown module style {st} (catalog has {len(MODULE_BASE)})")
+    return st
+
+def item_id(x):
+    """Ítem validado contra el catálogo; los negativos son slot vacío (-1)."""
+    x = int(x)
+    if x >= len(ITEM_DEFS): raise ValueError(f"unknown item {x} (catalog has {len(ITEM_DEFS)})")
+    return x if x >= 0 else -1
+
+def iter_config_modules(mods):
+    """Normaliza y valida la lista "modules" de un save: (q, r, style, equip de 6 slots).
+
+    Estilos e ítems fuera del catálogo son ValueError (como en binfmt._columns):
+    lo que pasa de acá ya entra en el ModuleStore y en los conteos sin más controles.
+    """
+    for i, m in enumerate(mods):
+        q = int(m.get("q",0)); r = int(m.get("r",0))
+        eq = m.get("equip", None)
+        try:
+            st = style_id(m.get("style",0))
+            equip = [-1]*SLOTS if eq is None else [item_id(x) for x in list(eq)[:SLOTS]]
+        except ValueError as e:
+            raise ValueError(f"module {i} at ({q}, {r}): {e}") from None
+        equip += [-1]*(SLOTS-len(equip))
+        yield q, r, st, equip
+
+# -------------------- Habitat --------------------
+class Habitat:
+    """Módulos por coordenada axial, con índice por filas y totales incrementales.
+
+    `modulos` es un ModuleStore (columnar); se lee como un dict {(q, r): Modulo}.
+    Todas las ediciones pasan por add_modulo / remove_modulo / set_style /
+    set_equip / clear, que mantienen el índice y los totales al día.
+    """
+    def __init__(self, base_ax=(0, 0)):
+        self.modulos = ModuleStore()
+        self.base_ax = base_ax
+        # Índice espacial por filas: r -> array ordenado de q (consultas por región)
+        self._rows = {}
+        self.counter = TotalsCounter()
+        self.journal = None      # EditJournal opcional (habitat.journal): recibe cada edición
+        self.revision = 0        # sube con cada edición (autoguardado: ¿hay cambios sin guardar?)
+        self.connectivity = None # Connectivity opcional (habitat.connectivity): altas y bajas
+        self.add_modulo(base_ax, 0)
+
+    @property
+    def totals(self): return self.counter.totals
+
+    def __len__(self): return len(self.modulos)
+    def __contains__(self, axial): return axial in self.modulos
+
+    # ---- edición ----
+    def add_modulo(self, axial, style=0, equip=None):
+        q, r = axial
+        old = self.modulos.get(axial)
+        if old is None:
+            bisect.insort(self._rows.setdefault(r, array("i")), q)
+        else:
+            self.counter.count(old, -1)
+        self.modulos.put(q, r, style, equip)
+        mod = self.modulos[axial]
+        self.counter.count(mod, +1)
+        if old is None and self.connectivity is not None: self.connectivity.added(q, r)
+        if self.journal is not None: self.journal.record(("place", q, r, style, mod.equip.tolist()))
+        self.revision += 1
+        self._check()
+        return mod
+
+    def remove_modulo(self, axial):
+        store = self.modulos
+        self.counter.count(store[axial], -1)
+        cid = store.label[store.row_of(axial[0], axial[1])]
+        store.remove(axial[0], axial[1])
+        row = self._rows[axial[1]]
+        del row[bisect.bisect_left(row, axial[0])]
+        if not row: del self._rows[axial[1]]
+        if self.connectivity is not None: self.connectivity.removed(axial[0], axial[1], cid)
+        if self.journal is not None: self.journal.record(("del", axial[0], axial[1]))
+        self.revision += 1
+        self._check()
+
+    def set_style(self, axial, style):
+        mod = self.modulos[axial]
+        self.counter.restyle(mod.style, style)
+        mod.style = style
+        if self.journal is not None: self.journal.record(("style", axial[0], axial[1], style))
+        self.revision += 1
+        self._check()
+
+    def set_equip(self, axial, slot, item):
+        mod = self.modulos[axial]
+        self.counter.re_equip(mod.equip[slot], item)
+        mod.equip[slot] = item
+        if self.journal is not None: self.journal.record(("equip", axial[0], axial[1], slot, item))
+        self.revision += 1
+        self._check()
+
+    def clear(self):
+        self.modulos.clear()
+        self._rows.clear()
+        self.counter.reset()
+        if self.journal is not None: self.journal.reset()   # el próximo guardado es un checkpoint
+        if self.connectivity is not None: self.connectivity.invalidate()
+        self.revision += 1
+
+    # ---- consultas espaciales ----
+    def modulo_at_world(self, pw):
+        """Axial del módulo bajo el punto de mundo `pw`, o None.
+
+        El redondeo axial da el hex; en los bordes se desempata con el mismo
+        test de polígono sobre el candidato y sus 6 vecinos (O(1), no O(n)).
+        Si el punto cae justo sobre un borde o vértice compartido gana el módulo
+        insertado primero (ModuleStore.seq), como el primer acierto recorriendo
+        el dict de módulos en orden de inserción.
+        """
+        q, r = axial_round(*world_to_axial(pw[0], pw[1]))
+        hits = [ax for ax in ((q + dq, r + dr) for dq, dr in ((0, 0), *NEI))
+                if ax in self.modulos and point_in_polygon(pw, hex_points_world(axial_to_world(*ax)))]
+        if len(hits) <= 1: return hits[0] if hits else None
+        store = self.modulos
+        return min(hits, key=lambda ax: store.seq[store.row_of(ax[0], ax[1])])
+
+    def modulos_in_rect(self, x0, y0, x1, y1):
+        """Axiales de los módulos cuyo centro (mundo) cae en el rectángulo."""
+        if x0 > x1: x0, x1 = x1, x0
+        if y0 > y1: y0, y1 = y1, y0
+        r0 = math.ceil(y0 / (1.5 * HEX_SIZE)); r1 = math.floor(y1 / (1.5 * HEX_SIZE))
+        w = HEX_SIZE * SQRT3
+        # se recorren sólo las filas del rango (o las ocupadas, si son menos)
+        if r1 - r0 + 1 <= len(self._rows): rows = range(r0, r1 + 1)
+        else: rows = sorted(r for r in self._rows if r0 <= r <= r1)
+        out = []
+        for r in rows:
+            row = self._rows.get(r)
+            if not row: continue
+            i = bisect.bisect_left(row, math.ceil(x0 / w - r / 2))
+            j = bisect.bisect_right(row, math.floor(x1 / w - r / 2))
+            out.extend((q, r) for q in row[i:j])
+        return out
+
+    def modulos_in_lasso(self, poly_world):
+        """Axiales de los módulos cuyo centro cae dentro del polígono (lazo)."""
+        if len(poly_world) < 3: return []
+        xs = [p[0] for p in poly_world]; ys = [p[1] for p in poly_world]
+        return [ax for ax in self.modulos_in_rect(min(xs), min(ys), max(xs), max(ys))
+                if point_in_polygon(axial_to_world(*ax), poly_world)]
+
+    # ---- totales ----
+    def recompute_totals(self):
+        """Recuento completo sobre las columnas (modo de verificación)."""
+        return totals_from_counts(*self.modulos.counts())
+
+    def verify_totals(self, rel_tol=1e-9, abs_tol=1e-6):
+        """True si los totales incrementales coinciden con el recorrido completo."""
+        return totals_close(self.totals, self.recompute_totals(), rel_tol, abs_tol)
+
+    def _check(self):
+        if VERIFY_TOTALS and not self.verify_totals():
+            print(f"Totals mismatch: incremental {self.totals} != full {self.recompute_totals()}")
+
+    # ---- configuración (formato de los saves, "version": 1) ----
+    def load_modules(self, mods):
+        """Reemplaza los módulos por la lista "modules" de un save (vacía = sólo la base)."""
+        rows = list(iter_config_modules(mods or []))     # valida todo antes de tocar nada
+        self.clear()
+        store = self.modulos
+        for q, r, st, equip in rows:
+            store.put(q, r, st, equip)
+        if not len(store):
+            store.put(0, 0, 0)
+        self._index_loaded()
+
+    def extend_modules(self, mods):
+        """Agrega (o reemplaza) entradas "modules" de un save sin vaciar; para cargas por partes.
+
+        Es parte de una carga, no una edición: pisa lo que haya en esas coordenadas,
+        así que no se edita hasta que termina (el editor lo bloquea).
+        """
+        store = self.modulos; rows = self._rows
+        style_count = self.counter.style_count; item_count = self.counter.item_count
+        for q, r, st, equip in list(iter_config_modules(mods)):
+            row = store.row_of(q, r)
+            if row < 0:
+                bisect.insort(rows.setdefault(r, array("i")), q)
+            else:
+                style_count[store.style[row]] -= 1
+                for idx in store.equip_row(row):
+                    if idx >= 0: item_count[idx] -= 1
+            store.put(q, r, st, equip)
+            style_count[st] += 1
+            for idx in equip:
+                if idx >= 0: item_count[idx] += 1
+        self.counter.refresh()
+        if self.journal is not None: self.journal.reset()
+        if self.connectivity is not None: self.connectivity.invalidate()
+        self.revision += 1
+        self._check()
+
+    def load_columns(self, q, r, style, equip):
+        """Como load_modules, pero desde columnas binarias (ver ModuleStore.load_columns)."""
+        self.clear()
+        try:
+            self.modulos.load_columns(q, r, style, equip)
+        finally:
+            # si las columnas se rechazan queda sólo la base, nunca un hábitat a medias
+            if not len(self.modulos):
+                self.modulos.put(0, 0, 0)
+            self._index_loaded()
+
+    def _index_loaded(self):
+        # índice y conteos de una sola pasada, no módulo a módulo
+        self._rows = self.modulos.rows_index()
+        self.counter.load_counts(*self.modulos.counts())
+        self._check()
+
+    def snapshot(self):
+        """Copia para guardar desde otro hilo: módulos, índice y totales, sin diario.
+
+        Cuesta unas copias de memoria contiguas; nadie más edita la copia.
+        """
+        snap = Habitat.__new__(Habitat)
+        snap.modulos = self.modulos.copy(); snap.base_ax = self.base_ax
+        snap._rows = {r: row[:] for r, row in self._rows.items()}
+        snap.counter = TotalsCounter()
+        snap.counter.load_counts(self.counter.style_count, self.counter.item_count)
+        snap.journal = None; snap.connectivity = None; snap.revision = self.revision
+        return snap
+
+    @classmethod
+    def from_config(cls, cfg):
+        hab = cls()
+        hab.load_modules(cfg.get("modules", []))
+        return hab
+
+    def to_config(self, camera=None, timestamp=None):
+        """Dict con el esquema de los saves; `camera` es {"pos": [x, y], "zoom": z} o None.
+
+        Los metadatos van antes de "modules" para que un lector incremental
+        (habitat.jsonstream) arme el resumen sin recorrer los módulos.
+        """
+        data = {"version": 1}
+        if camera is not None: data["camera"] = camera
+        if timestamp is not None: data["timestamp"] = timestamp
+        data["module_count"] = len(self.modulos)
+        data["totals"] = dict(self.totals)
+        store = self.modulos; eq = store.equip.tolist()
+        data["modules"] = [
+            {"q": q, "r": r, "style": st, "equip": eq[i*SLOTS:(i+1)*SLOTS]}
+            for i, (q, r, st) in enumerate(zip(store.q, store.r, store.style))
+        ]
+        return data
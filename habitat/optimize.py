@@ -0,0 +1,236 @@
+# habitat/optimize.py
+"""Optimizador de equipos para los 6 slots de cada módulo, con la distribución fija.
+
+Los totales sólo dependen de cuántas unidades de cada ítem hay instaladas (no
+de en qué slot están), así que el problema se reduce a un programa entero
+pequeño sobre los conteos n_i >= 0:
+
+    max  Energy(n)                    (mínimo consumo de energía)
+    s.a. sum(n) <= 6 * módulos        (capacidad de slots)
+         Crew(n) >= crew, O2(n) >= o2_min, Food(n) >= food_min, Waste(n) <= waste_max
+         + cotas opcionales sobre cualquier total
+
+Se resuelve con branch-and-bound usando la relajación lineal (símplex de dos
+fases) como cota, y luego se reparten los conteos en los slots conservando los
+equipos que ya estaban. El tamaño del problema depende del catálogo, no del
+hábitat: 500 módulos se resuelven en milisegundos.
+
+Uso:
+    python -m habitat.optimize ui/saves/habitat_X.json --crew 8 --waste-max -5 -o optimizado.json
+
+La entrada puede ser cualquier save (.json, .habj, .habb, .habm) y la salida
+se escribe de forma atómica en el formato que diga su extensión.
+"""
+import sys, math, time, argparse
+
+from habitat.catalog import ITEM_NAMES, ITEM_DELTAS, STYLE_DELTAS, TOTAL_KEYS, SLOTS
+from habitat.files import load_save, write_save
+
+__all__ = ["optimize_equipment", "assign_slots", "apply_assignment", "main"]
+
+EPS = 1e-9
+MAX_NODES = 50000   # pasado este número de nodos se devuelve la mejor solución hallada
+
+# -------------------- LP (símplex de dos fases) --------------------
+def _lp_max(A, b, c):
+    """max c·x  s.a.  A x <= b, x >= 0.  Devuelve (valor, x) o None si es infactible.
+
+    Tableau denso con regla de Bland; pensado para decenas de filas, no miles.
+    El problema de equipos siempre es acotado (sum(n) <= slots).
+    """
+    m, n = len(A), len(c)
+    art = n + m                        # columna de la variable artificial de la fase I
+    T = [[float(v) for v in A[i]] + [1.0 if j == i else 0.0 for j in range(m)] + [-1.0, float(b[i])]
+         for i in range(m)]
+    basis = [n + i for i in range(m)]
+
+    def pivot(r, col):
+        pr = T[r]; pv = pr[col]
+        T[r] = pr = [v / pv for v in pr]
+        for i in range(m):
+            if i != r:
+                f = T[i][col]
+                if f > EPS or f < -EPS:
+                    T[i] = [a - f * p for a, p in zip(T[i], pr)]
+        basis[r] = col
+
+    def run(cost, allowed):
+        while True:
+            cb = [cost[basis[i]] for i in range(m)]
+            enter = None
+            for j in allowed:
+                rc = cost[j] - sum(cb[i] * T[i][j] for i in range(m))
+                if rc > EPS:
+                    enter = j; break            # Bland: primera columna que mejora
+            if enter is None:
+                return sum(cb[i] * T[i][-1] for i in range(m))
+            leave = None; best = None
+            for i in range(m):
+                a = T[i][enter]
+                if a > EPS:
+                    ratio = T[i][-1] / a
+                    if best is None or ratio < best - EPS or (abs(ratio - best) <= EPS and basis[i] < basis[leave]):
+                        best = ratio; leave = i
+            if leave is None:
+                raise ArithmeticError("unbounded LP")
+            pivot(leave, enter)
+
+    cols = list(range(n + m))
+    if m and min(b) < -EPS:
+        # fase I: maximizar -x0 partiendo de la fila más negativa
+        pivot(min(range(m), key=lambda i: b[i]), art)
+        cost1 = [0.0] * (n + m + 1); cost1[art] = -1.0
+        if run(cost1, cols + [art]) < -1e-7:
+            return None
+        if art in basis:               # quedó básica en 0: sacarla por cualquier columna no nula
+            r = basis.index(art)
+            for j in cols:
+                if abs(T[r][j]) > EPS:
+                    pivot(r, j); break
+    cost2 = [float(v) for v in c] + [0.0] * (m + 1)
+    val = run(cost2, cols)
+    x = [0.0] * n
+    for i, j in enumerate(basis):
+        if j < n: x[j] = T[i][-1]
+    return val, x
+
+# -------------------- Branch-and-bound --------------------
+def _solve_counts(A, b, c, max_nodes=MAX_NODES):
+    """Máximo entero de c·n con A n <= b, n >= 0 entero. Devuelve (status, valor, n)."""
+    k = len(c)
+    best_val, best_n = -math.inf, None
+    nodes = 0
+    stack = [({}, {})]                 # (cotas inferiores, cotas superiores) por variable
+    complete = True
+    while stack:
+        if nodes >= max_nodes:
+            complete = False; break
+        lo, hi = stack.pop(); nodes += 1
+        A2 = [row for row in A]; b2 = list(b)
+        for j, v in lo.items():
+            row = [0.0] * k; row[j] = -1.0; A2.append(row); b2.append(-v)
+        for j, v in hi.items():
+            row = [0.0] * k; row[j] = 1.0; A2.append(row); b2.append(v)
+        sol = _lp_max(A2, b2, c)
+        if sol is None:
+            continue
+        val, x = sol
+        if val <= best_val + 1e-7:     # la relajación no mejora la mejor solución: podar
+            continue
+        frac = None
+        for j in range(k):
+            if abs(x[j] - round(x[j])) > 1e-6:
+                frac = j; break
+        if frac is None:
+            best_val, best_n = val, [int(round(v)) for v in x]
+            continue
+        f = math.floor(x[frac])
+        # se explora primero la rama que redondea hacia arriba (suele ser la factible)
+        stack.append(({**lo}, {**hi, frac: f}))
+        stack.append(({**lo, frac: f + 1}, {**hi}))
+    if best_n is None:
+        return ("infeasible" if complete else "unknown"), None, None
+    return ("optimal" if complete else "feasible"), best_val, best_n
+
+# -------------------- API --------------------
+def optimize_equipment(hab, crew=None, o2_min=0.0, food_min=0.0, waste_max=None, bounds=None,
+                       max_nodes=MAX_NODES):
+    """Conteos óptimos de cada ítem para el Habitat `hab` (su distribución no cambia).
+
+    `bounds` admite cotas extra {"Volume": (lo, hi), ...} sobre cualquier total;
+    None en un extremo lo deja libre. Devuelve un dict con "status"
+    ("optimal", "feasible", "infeasible" o "unknown"), "counts" {nombre: n},
+    "totals" resultantes y "equip" {(q, r): [6 slots]} listo para aplicar.
+    """
+    limits = {key: [None, None] for key in TOTAL_KEYS}
+    if crew is not None: limits["Crew"][0] = crew
+    if o2_min is not None: limits["O2"][0] = o2_min
+    if food_min is not None: limits["Food"][0] = food_min
+    if waste_max is not None: limits["Waste"][1] = waste_max
+    for key, (lo, hi) in (bounds or {}).items():
+        if lo is not None: limits[key][0] = lo
+        if hi is not None: limits[key][1] = hi
+
+    # aporte fijo de la estructura (estilos), que el optimizador no toca
+    base = [0.0] * len(TOTAL_KEYS)
+    for st, cnt in hab.counter.style_count.items():
+        for k, d in enumerate(STYLE_DELTAS[st]): base[k] += cnt * d
+
+    e = TOTAL_KEYS.index("Energy")
+    c = [d[e] for d in ITEM_DELTAS]
+    A = [[1.0] * len(ITEM_DELTAS)]; b = [float(SLOTS * len(hab))]
+    for k, key in enumerate(TOTAL_KEYS):
+        lo, hi = limits[key]
+        if lo is not None:
+            A.append([-d[k] for d in ITEM_DELTAS]); b.append(base[k] - lo)
+        if hi is not None:
+            A.append([d[k] for d in ITEM_DELTAS]); b.append(hi - base[k])
+
+    status, _, counts = _solve_counts(A, b, c, max_nodes)
+    if counts is None:
+        return {"status": status, "counts": None, "totals": None, "equip": None}
+    totals = {key: base[k] + sum(n * d[k] for n, d in zip(counts, ITEM_DELTAS)) for k, key in enumerate(TOTAL_KEYS)}
+    return {
+        "status": status,
+        "counts": dict(zip(ITEM_NAMES, counts)),
+        "totals": totals,
+        "equip": assign_slots(hab, counts),
+    }
+
+def assign_slots(hab, counts):
+    """Reparte los conteos en los slots: conserva lo ya instalado y completa en orden."""
+    left = list(counts)
+    equip = {}
+    for ax, m in hab.modulos.items():
+        eq = []
+        for idx in m.equip:
+            if idx >= 0 and left[idx] > 0:
+                left[idx] -= 1; eq.append(idx)
+            else:
+                eq.append(-1)
+        equip[ax] = eq
+    item = 0
+    for eq in equip.values():
+        for s in range(SLOTS):
+            if eq[s] >= 0: continue
+            while item < len(left) and left[item] == 0: item += 1
+            if item == len(left): return equip
+            eq[s] = item; left[item] -= 1
+    return equip
+
+def apply_assignment(hab, equip):
+    """Escribe el resultado en el hábitat slot por slot (mantiene los totales al día)."""
+    for ax, eq in equip.items():
+        for s, idx in enumerate(eq):
+            if hab.modulos[ax].equip[s] != idx:
+                hab.set_equip(ax, s, idx)
+
+# -------------------- CLI --------------------
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m habitat.optimize", description="Fill equipment slots of a saved habitat.")
+    ap.add_argument("config", help="habitat save (.json, .habj, .habb or .habm)")
+    ap.add_argument("--crew", type=float, default=None, help="minimum crew")
+    ap.add_argument("--o2-min", type=float, default=0.0)
+    ap.add_argument("--food-min", type=float, default=0.0)
+    ap.add_argument("--waste-max", type=float, default=None)
+    ap.add_argument("--max-nodes", type=int, default=MAX_NODES)
+    ap.add_argument("-o", "--output", help="write the optimized configuration here (format by extension)")
+    args = ap.parse_args(argv)
+
+    hab, camera, _ = load_save(args.config)
+    res = optimize_equipment(hab, crew=args.crew, o2_min=args.o2_min, food_min=args.food_min,
+                             waste_max=args.waste_max, max_nodes=args.max_nodes)
+    print(f"status: {res['status']}")
+    if res["counts"] is None:
+        return 1
+    for name, n in res["counts"].items():
+        print(f"  {name}: {n}")
+    print("totals: " + ", ".join(f"{k}={v:.2f}" for k, v in res["totals"].items()))
+    if args.output:
+        apply_assignment(hab, res["equip"])
+        write_save(hab, args.output, camera=camera, timestamp=time.time())
+        print(f"Saved to: {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# habitat/query.py
+"""Consultas sobre el índice de resúmenes de los saves, sin abrir los archivos.
+
+Una consulta es una lista de términos separados por espacios:
+
+    crew>=8 energy>=-2000 sort:volume limit:20
+    modules=100..500 o2>0 sort:+timestamp
+
+    campo OP valor   OP es >=, <=, >, < o =; "a..b" con = es un rango (incluido)
+    sort:[+|-]campo  orden (por defecto descendente; "+" ascendente)
+    limit:N          los N primeros
+
+Los campos son los de habitat.summaries.FIELDS (timestamp, modules y los
+recursos del catálogo en minúsculas). Cada uno tiene su índice en SQLite, así
+que filtrar y sacar los k primeros sobre decenas de miles de saves lleva
+milisegundos.
+
+    python -m habitat.query ui/saves "crew>=8 energy>=-2000" --sort volume --limit 10
+"""
+import sys, csv, json, math, time, argparse
+
+from habitat.summaries import FIELDS, SummaryIndex
+
+__all__ = ["Query", "parse_query", "run_query", "main"]
+
+_OPS = (">=", "<=", ">", "<", "=")
+
+class Query:
+    """Consulta ya interpretada: rangos {campo: (mín, máx)}, orden y límite."""
+    def __init__(self, ranges=None, order_by="timestamp", descending=True, limit=None):
+        self.ranges = dict(ranges or {})
+        self.order_by = order_by; self.descending = descending; self.limit = limit
+
+    def narrow(self, field, lo=None, hi=None):
+        """Intersecta el rango de `field` con [lo, hi]."""
+        old_lo, old_hi = self.ranges.get(field, (None, None))
+        if old_lo is not None and (lo is None or old_lo > lo): lo = old_lo
+        if old_hi is not None and (hi is None or old_hi < hi): hi = old_hi
+        self.ranges[field] = (lo, hi)
+
+    def run(self, index, offset=0, limit=None):
+        """Página de resultados de `index` (limit=None: el de la consulta)."""
+        return index.query(self.ranges, self.order_by, self.descending,
+                           self.limit if limit is None else limit, offset)
+
+    def count(self, index):
+        n = index.count(self.ranges, self.order_by)
+        return n if self.limit is None else min(n, self.limit)
+
+def _field(name, text):
+    name = name.strip().lower()
+    if name not in FIELDS: raise ValueError(f"{text!r}: unknown field {name!r} (known: {', '.join(FIELDS)})")
+    return name
+
+def _number(value, text):
+    try: return float(value)
+    except ValueError: raise ValueError(f"{text!r}: {value!r} is not a number") from None
+
+def parse_query(text):
+    """Query a partir del texto; ValueError con el término que no se entiende."""
+    q = Query()
+    for term in text.split():
+        low = term.lower()
+        if low.startswith("sort:"):
+            name = term[5:]
+            q.descending = not name.startswith("+")
+            q.order_by = _field(name.lstrip("+-"), term)
+            continue
+        if low.startswith("limit:"):
+            try: q.limit = int(term[6:])
+            except ValueError: raise ValueError(f"{term!r}: limit must be an integer") from None
+            if q.limit < 0: raise ValueError(f"{term!r}: limit must be >= 0")
+            continue
+        op = next((o for o in _OPS if o in term), None)
+        if op is None: raise ValueError(f"{term!r}: expected field>=value, field<=value, field=a..b, sort:field or limit:N")
+        name, value = term.split(op, 1)
+        field = _field(name, term)
+        if op == "=" and ".." in value:
+            lo, hi = value.split("..", 1)
+            q.narrow(field, _number(lo, term) if lo else None, _number(hi, term) if hi else None)
+            continue
+        v = _number(value, term)
+        # > y < estrictos: el siguiente float representable (los índices comparan en REAL)
+        if op == ">=": q.narrow(field, lo=v)
+        elif op == ">": q.narrow(field, lo=math.nextafter(v, math.inf))
+        elif op == "<=": q.narrow(field, hi=v)
+        elif op == "<": q.narrow(field, hi=math.nextafter(v, -math.inf))
+        else: q.narrow(field, v, v)
+    return q
+
+def run_query(folder, text, refresh=True):
+    """Atajo: resultados de la consulta `text` sobre los saves de `folder`."""
+    with SummaryIndex(folder) as idx:
+        if refresh: idx.refresh()
+        return parse_query(text).run(idx)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m habitat.query", description="Filter and sort saved habitats by their summary fields.")
+    ap.add_argument("folder", help="saves folder (the index lives in FOLDER/.summaries.sqlite)")
+    ap.add_argument("query", nargs="*", help='terms like "crew>=8 energy>=-2000 sort:volume limit:10"')
+    ap.add_argument("--sort", help="field to sort by; prefix with + for ascending (default: -timestamp)")
+    ap.add_argument("--limit", type=int, help="at most N results")
+    ap.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    ap.add_argument("--no-refresh", action="store_true", help="use the index as is, without scanning the folder")
+    args = ap.parse_args(argv)
+    try:
+        q = parse_query(" ".join(args.query + ([f"sort:{args.sort}"] if args.sort else [])))
+    except ValueError as e:
+        ap.error(str(e))
+    if args.limit is not None: q.limit = args.limit
+
+    with SummaryIndex(args.folder) as idx:
+        t = time.perf_counter()
+        if not args.no_refresh: idx.refresh()
+        t_refresh = time.perf_counter() - t
+        t = time.perf_counter()
+        rows = q.run(idx)
+        t_query = time.perf_counter() - t
+
+    out = sys.stdout
+    cols = ["path"] + list(FIELDS)
+    writer = None
+    if args.format == "csv":
+        writer = csv.DictWriter(out, fieldnames=cols)
+        writer.writeheader()
+    for r in rows:
+        row = {"path": r["path"], "timestamp": r["timestamp"], "modules": r["modules"]}
+        row.update((k.lower(), v) for k, v in r["totals"].items())
+        if writer: writer.writerow({c: row.get(c) for c in cols})
+        else: out.write(json.dumps(row) + "\n")
+    print(f"{len(rows)} saves (index {t_refresh * 1000:.1f} ms, query {t_query * 1000:.1f} ms)", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
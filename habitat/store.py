@@ -0,0 +1,285 @@
+# habitat/store.py
+# Almacén columnar de módulos: columnas q / r / estilo y matriz de equipos N×6,
+# más un índice axial -> fila. Modulo es sólo una vista sobre una fila.
+from array import array
+from collections.abc import Mapping
+
+from habitat.geometry import NEI
+from habitat.catalog import SLOTS, MODULE_BASE, ITEM_DEFS
+from habitat.compat import NUMPY_AVAILABLE, np     # columns() devuelve arrays para pasadas vectorizadas
+
+__all__ = ["Modulo", "ModuleStore", "TILE_BITS"]
+
+# El índice axial -> fila es una tabla paginada: teselas de 16×16 hexes, cada
+# una un array de int32 (fila + 1, 0 = vacío). Para hábitats compactos cuesta
+# ~5 bytes por módulo, contra ~100 de un dict con claves (q, r).
+TILE_BITS = 4
+TILE = 1 << TILE_BITS
+TILE_MASK = TILE - 1
+_EMPTY_TILE = array("i", [0]) * (TILE * TILE)
+
+# -------------------- Module (vista) --------------------
+class Modulo:
+    """Un módulo: vista (q, r) sobre una fila del ModuleStore.
+
+    Construido a mano (Modulo(q, r, style, equip)) es un registro suelto que
+    guarda sus propios valores. Las vistas siguen válidas tras borrar otros
+    módulos (se resuelven por coordenada, no por número de fila).
+    """
+    __slots__ = ("_store", "q", "r", "_style", "_equip")
+
+    def __init__(self, q, r, style=0, equip=None):
+        self._store = None
+        self.q=q; self.r=r; self._style=style
+        # 6 slots, -1 = empty
+        self._equip = list(equip) if equip is not None else [-1]*SLOTS
+
+    @classmethod
+    def _view(cls, store, q, r):
+        m = cls.__new__(cls)
+        m._store = store; m.q = q; m.r = r
+        return m
+
+    def _row(self):
+        i = self._store.row_of(self.q, self.r)
+        if i < 0: raise KeyError((self.q, self.r))
+        return i
+
+    @property
+    def style(self):
+        return self._style if self._store is None else self._store.style[self._row()]
+    @style.setter
+    def style(self, value):
+        if self._store is None: self._style = value
+        else: self._store.style[self._row()] = value
+
+    @property
+    def equip(self):
+        return self._equip if self._store is None else _EquipView(self)
+    @equip.setter
+    def equip(self, values):
+        if self._store is None: self._equip = list(values)
+        else: self._store.set_equip_row(self._row(), values)
+
+    def axial(self): return (self.q, self.r)
+    def neighbors_axial(self):
+        q, r = self.q, self.r
+        for dq, dr in NEI:
+            yield (q + dq, r + dr)
+
+class _EquipView:
+    """Los 6 slots de un módulo del almacén; se indexa y asigna como la lista de antes."""
+    __slots__ = ("_mod",)
+    def __init__(self, mod): self._mod = mod
+    def __len__(self): return SLOTS
+    def __getitem__(self, slot):
+        if isinstance(slot, slice): return self.tolist()[slot]
+        if not -SLOTS <= slot < SLOTS: raise IndexError(slot)
+        return self._mod._store.equip[self._mod._row() * SLOTS + slot % SLOTS]
+    def __setitem__(self, slot, item):
+        if not -SLOTS <= slot < SLOTS: raise IndexError(slot)
+        self._mod._store.equip[self._mod._row() * SLOTS + slot % SLOTS] = item
+    def __iter__(self): return iter(self.tolist())
+    def __eq__(self, other): return self.tolist() == list(other)
+    def __repr__(self): return repr(self.tolist())
+    def tolist(self):
+        row = self._mod._row()
+        return self._mod._store.equip[row * SLOTS:(row + 1) * SLOTS].tolist()
+
+# -------------------- Store --------------------
+class ModuleStore(Mapping):
+    """Módulos en columnas contiguas: q, r (int32), style (int8) y equip (int8, N×6 aplanada).
+
+    Se usa como un dict {(q, r): Modulo} de sólo lectura; las escrituras van por
+    put / remove / set_equip_row. Insertar y borrar son O(1): el borrado mueve la
+    última fila al hueco (el orden de iteración es el de las filas). `seq` guarda
+    el orden de inserción de cada fila (el orden del dict de antes), que el
+    swap-remove no conserva en las filas. `label` es la componente conexa de
+    cada fila (habitat.connectivity; 0 = sin etiquetar).
+    """
+    def __init__(self):
+        self.q = array("i"); self.r = array("i")
+        self.style = array("b")
+        self.equip = array("b")
+        self.seq = array("q")      # número de inserción; reemplazar un módulo no lo cambia
+        self._next_seq = 0
+        self.label = array("i")    # id de componente conexa (lo mantiene Connectivity)
+        self._tiles = {}   # (q >> TILE_BITS, r >> TILE_BITS) -> array de fila + 1
+
+    # ---- índice axial -> fila ----
+    def row_of(self, q, r):
+        """Fila del módulo en (q, r), o -1 si no hay."""
+        t = self._tiles.get((q >> TILE_BITS, r >> TILE_BITS))
+        if t is None: return -1
+        return t[((r & TILE_MASK) << TILE_BITS) | (q & TILE_MASK)] - 1
+
+    def _set_row(self, q, r, row):
+        key = (q >> TILE_BITS, r >> TILE_BITS)
+        t = self._tiles.get(key)
+        if t is None:
+            if row < 0: return
+            t = self._tiles[key] = array("i", _EMPTY_TILE)
+        t[((r & TILE_MASK) << TILE_BITS) | (q & TILE_MASK)] = row + 1
+        if row < 0 and t.count(0) == TILE * TILE:
+            del self._tiles[key]
+
+    # ---- Mapping ----
+    def __len__(self): return len(self.q)
+    def __iter__(self): return zip(self.q, self.r)
+    def __contains__(self, axial): return self.row_of(axial[0], axial[1]) >= 0
+    def __getitem__(self, axial):
+        if self.row_of(axial[0], axial[1]) < 0: raise KeyError(axial)
+        return Modulo._view(self, axial[0], axial[1])
+
+    # ---- escritura ----
+    def put(self, q, r, style=0, equip=None):
+        """Inserta (o reemplaza) el módulo en (q, r) y devuelve su fila."""
+        eq = array("b", [-1] * SLOTS if equip is None else equip)
+        row = self.row_of(q, r)
+        if row >= 0:
+            self.style[row] = style; self.equip[row * SLOTS:(row + 1) * SLOTS] = eq
+            return row
+        row = len(self.q)
+        self.q.append(q); self.r.append(r); self.style.append(style); self.equip.extend(eq)
+        self.seq.append(self._next_seq); self._next_seq += 1
+        self.label.append(0)
+        self._set_row(q, r, row)
+        return row
+
+    def remove(self, q, r):
+        """Borra (q, r) moviendo la última fila a su lugar (swap-remove)."""
+        row = self.row_of(q, r)
+        if row < 0: raise KeyError((q, r))
+        last = len(self.q) - 1
+        if row != last:
+            lq, lr = self.q[last], self.r[last]
+            self.q[row] = lq; self.r[row] = lr; self.style[row] = self.style[last]
+            self.equip[row * SLOTS:(row + 1) * SLOTS] = self.equip[last * SLOTS:]
+            self.seq[row] = self.seq[last]; self.label[row] = self.label[last]
+            self._set_row(lq, lr, row)
+        self.q.pop(); self.r.pop(); self.style.pop(); self.seq.pop(); self.label.pop()
+        del self.equip[last * SLOTS:]
+        self._set_row(q, r, -1)
+
+    def load_columns(self, q, r, style, equip):
+        """Reemplaza todo por columnas ya armadas (array/bytes: int32, int32, int8, int8 N×6).
+
+        Carga masiva para formatos binarios: copia las columnas tal cual y arma el
+        índice de una vez. ValueError si hay coordenadas repetidas.
+        """
+        self.clear()
+        self.q.frombytes(bytes(q)); self.r.frombytes(bytes(r))
+        self.style.frombytes(bytes(style)); self.equip.frombytes(bytes(equip))
+        n = len(self.q)
+        if not (len(self.r) == len(self.style) == n and len(self.equip) == n * SLOTS):
+            self.clear(); raise ValueError("column lengths do not match")
+        self.seq = array("q", range(n)); self._next_seq = n     # el orden del archivo
+        self.label = array("i", bytes(4 * n))
+        if NUMPY_AVAILABLE and n:
+            qa = np.frombuffer(self.q, dtype=np.int32).astype(np.int64)
+            ra = np.frombuffer(self.r, dtype=np.int32).astype(np.int64)
+            # clave de tesela en un solo int64 (tq arriba, tr abajo) para un unique 1D
+            keys, inv = np.unique(((qa >> TILE_BITS) << 32) | ((ra >> TILE_BITS) & 0xFFFFFFFF), return_inverse=True)
+            tiles = np.zeros((len(keys), TILE * TILE), dtype=np.int32)
+            tiles[inv.reshape(-1), ((ra & TILE_MASK) << TILE_BITS) | (qa & TILE_MASK)] = np.arange(1, n + 1, dtype=np.int32)
+            dup = int(np.count_nonzero(tiles)) != n
+            if not dup:
+                tq = (keys >> 32).tolist(); tr = (((keys & 0xFFFFFFFF) ^ 0x80000000) - 0x80000000).tolist()
+                self._tiles = {key: array("i", t.tobytes()) for key, t in zip(zip(tq, tr), tiles)}
+        else:
+            for row, (mq, mr) in enumerate(zip(self.q, self.r)):
+                if self.row_of(mq, mr) >= 0: break
+                self._set_row(mq, mr, row)
+            dup = len(self) and self.row_of(self.q[-1], self.r[-1]) != n - 1
+        if dup:
+            self.clear(); raise ValueError("duplicate module coordinates")
+
+    def rows_index(self):
+        """{r: array ordenado de q} de todos los módulos (índice por filas de Habitat)."""
+        if NUMPY_AVAILABLE and len(self.q):
+            qa = np.frombuffer(self.q, dtype=np.int32); ra = np.frombuffer(self.r, dtype=np.int32)
+            order = np.lexsort((qa, ra))
+            rs = ra[order]; qs = qa[order].astype(np.int32)
+            cuts = (np.flatnonzero(np.diff(rs)) + 1).tolist()
+            starts = [0] + cuts; stops = cuts + [len(rs)]
+            out = {int(rs[a]): array("i", qs[a:b].tobytes()) for a, b in zip(starts, stops)}
+            del qa, ra, order, rs    # sin vistas vivas sobre las columnas
+            return out
+        rows = {}
+        for q, r in zip(self.q, self.r): rows.setdefault(r, []).append(q)
+        return {r: array("i", sorted(qs)) for r, qs in rows.items()}
+
+    def set_equip_row(self, row, values):
+        self.equip[row * SLOTS:(row + 1) * SLOTS] = array("b", values)
+
+    def copy(self):
+        """Copia independiente de columnas e índice (slices de array: memcpy, sin vistas)."""
+        new = ModuleStore()
+        new.q = self.q[:]; new.r = self.r[:]; new.style = self.style[:]; new.equip = self.equip[:]
+        new.seq = self.seq[:]; new._next_seq = self._next_seq; new.label = self.label[:]
+        new._tiles = {key: t[:] for key, t in self._tiles.items()}
+        return new
+
+    def clear(self):
+        for col in (self.q, self.r, self.style, self.equip, self.seq, self.label): del col[:]
+        self._next_seq = 0
+        self._tiles.clear()
+
+    # ---- pasadas completas ----
+    def equip_row(self, row):
+        return self.equip[row * SLOTS:(row + 1) * SLOTS].tolist()
+
+    def counts(self):
+        """(módulos por estilo, equipos por ítem) contados sobre las columnas, sin vistas."""
+        if NUMPY_AVAILABLE and len(self.q):
+            st = np.bincount(np.frombuffer(self.style, dtype=np.int8).astype(np.intp), minlength=len(MODULE_BASE))
+            eq = np.frombuffer(self.equip, dtype=np.int8)
+            it = np.bincount(eq[eq >= 0].astype(np.intp), minlength=len(ITEM_DEFS))
+            return {s: int(st[s]) for s in MODULE_BASE}, it.tolist()
+        # array.count recorre en C: una pasada por valor posible
+        return ({s: self.style.count(s) for s in MODULE_BASE},
+                [self.equip.count(i) for i in range(len(ITEM_DEFS))])
+
+    def columns(self):
+        """Copias NumPy (q, r, style, equip N×6) para pasadas vectorizadas; requiere NumPy.
+
+        Son copias a propósito: una vista sobre los array bloquearía append/pop.
+        """
+        return (np.array(self.q, dtype=np.int32), np.array(self.r, dtype=np.int32),
+                np.array(self.style, dtype=np.int8), np.array(self.equip, dtype=np.int8).reshape(-1, SLOTS))
+
+    def neighbor_rows(self):
+        """Por fila, las filas de sus 6 vecinos en el orden de NEI (-1 = vacío); para pasadas sobre todo el grafo.
+
+        Con NumPy se buscan todas a la vez: en una grilla densa si el hábitat es
+        compacto, si no con searchsorted sobre las claves axiales ordenadas.
+        Sin NumPy, row_of por vecino.
+        """
+        n = len(self.q)
+        if NUMPY_AVAILABLE and n:
+            qa = np.frombuffer(self.q, dtype=np.int32).astype(np.int64)
+            ra = np.frombuffer(self.r, dtype=np.int32).astype(np.int64)
+            out = np.empty((n, len(NEI)), dtype=np.int64)
+            q0 = int(qa.min()) - 1; r0 = int(ra.min()) - 1
+            w = int(qa.max()) - q0 + 2; h = int(ra.max()) - r0 + 2
+            if w * h <= 16 * n + 4096:
+                grid = np.full(w * h, -1, dtype=np.int64)
+                grid[(ra - r0) * w + (qa - q0)] = np.arange(n)
+                for k, (dq, dr) in enumerate(NEI): out[:, k] = grid[(ra + dr - r0) * w + (qa + dq - q0)]
+                del grid
+            else:
+                keys = (qa << 32) | (ra & 0xFFFFFFFF)
+                order = np.argsort(keys); skeys = keys[order]
+                for k, (dq, dr) in enumerate(NEI):
+                    nk = ((qa + dq) << 32) | ((ra + dr) & 0xFFFFFFFF)
+                    pos = np.minimum(np.searchsorted(skeys, nk), n - 1)
+                    out[:, k] = np.where(skeys[pos] == nk, order[pos], -1)
+            del qa, ra               # sin vistas vivas sobre las columnas
+            return out.tolist()
+        row_of = self.row_of
+        return [[row_of(q + dq, r + dr) for dq, dr in NEI] for q, r in zip(self.q, self.r)]
+
+    def nbytes(self):
+        """Memoria aproximada de columnas e índice (bytes)."""
+        cols = sum(c.itemsize * c.buffer_info()[1] for c in (self.q, self.r, self.style, self.equip, self.seq, self.label))
+        return cols + len(self._tiles) * TILE * TILE * 4
@@ -0,0 +1,172 @@
+# habitat/summaries.py
+"""Índice persistente de resúmenes de los saves de una carpeta (SQLite).
+
+El índice vive al lado de los saves (.summaries.sqlite) y guarda, por nombre
+de archivo, lo que devuelve save_summary() junto con el mtime (ns) y el tamaño
+con que se leyó. refresh() recorre la carpeta con os.scandir y sólo vuelve a
+abrir los archivos nuevos o cambiados; los que ya no están se borran del
+índice. Los que no se pueden leer quedan anotados con su error y no se
+reintentan hasta que cambien.
+
+Cada métrica (modules, timestamp y una columna por recurso del catálogo:
+energy, o2, ..., en minúsculas) tiene su propia columna con índice, así que
+query() filtra por rangos y devuelve los k primeros por cualquier métrica
+sin tocar los saves. Si cambian las columnas del catálogo el índice se arma
+de nuevo.
+
+    idx = SummaryIndex("ui/saves")
+    idx.refresh()
+    idx.latest(15)      # [{"path", "timestamp", "modules", "totals"}, ...]
+    idx.query({"crew": (8, None), "energy": (-2000, None)}, order_by="volume", limit=10)
+    idx.close()
+
+Si el archivo no se puede abrir o escribir (carpeta de sólo lectura, índice
+corrupto) se usa un índice en memoria: funciona igual, sin persistir.
+"""
+import os, re, json, sqlite3
+
+from habitat.catalog import TOTAL_KEYS
+from habitat.files import is_save_file, save_summary
+
+__all__ = ["INDEX_NAME", "FIELDS", "SummaryIndex"]
+
+INDEX_NAME = ".summaries.sqlite"
+SCHEMA_VERSION = 2
+
+# métrica -> columna; los recursos del catálogo van como t_<clave>
+METRIC_COLUMNS = {k.lower(): "t_" + re.sub(r"\W", "_", k.lower()) for k in TOTAL_KEYS}
+FIELDS = ("timestamp", "modules") + tuple(METRIC_COLUMNS)
+_COLUMNS = {"timestamp": "timestamp", "modules": "modules", **METRIC_COLUMNS}
+_LAYOUT = json.dumps(list(TOTAL_KEYS))     # si cambia, se rearma el índice
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS summaries (
+    name      TEXT PRIMARY KEY,
+    mtime_ns  INTEGER NOT NULL,
+    size      INTEGER NOT NULL,
+    timestamp REAL,
+    modules   INTEGER,
+    totals    TEXT,
+    error     TEXT{"".join(f", {c} REAL" for c in METRIC_COLUMNS.values())}
+);
+""" + "".join(f"CREATE INDEX IF NOT EXISTS summaries_{c} ON summaries ({c});\n" for c in _COLUMNS.values())
+
+class SummaryIndex:
+    """Resúmenes en caché de los saves de `folder`, validados por mtime y tamaño."""
+    def __init__(self, folder, index_path=None):
+        self.folder = folder
+        self.path = index_path or os.path.join(folder, INDEX_NAME)
+        self.db = self._open(self.path) or self._open(":memory:")
+
+    @staticmethod
+    def _open(path):
+        """Conexión con el esquema listo, o None si el archivo no sirve."""
+        for attempt in range(2):
+            db = None
+            try:
+                db = sqlite3.connect(path)
+                stale = db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION
+                if not stale:
+                    row = db.execute("SELECT value FROM meta WHERE key = 'layout'").fetchone()
+                    stale = row is None or row[0] != _LAYOUT
+                if stale:
+                    db.executescript("DROP TABLE IF EXISTS summaries; DROP TABLE IF EXISTS meta;")
+                    db.executescript(_SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};")
+                    with db: db.execute("INSERT INTO meta VALUES ('layout', ?)", (_LAYOUT,))
+                return db
+            except sqlite3.Error:
+                if db is not None: db.close()
+                # corrupto: se borra y se arma de nuevo (es sólo una caché)
+                if attempt: return None
+                try: os.remove(path)
+                except OSError: return None
+        return None
+
+    def _scan(self):
+        """{nombre: (mtime_ns, tamaño)} de los saves de la carpeta."""
+        out = {}
+        try:
+            with os.scandir(self.folder) as it:
+                for e in it:
+                    if is_save_file(e.name) and e.is_file():
+                        st = e.stat()
+                        out[e.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return out
+
+    def refresh(self):
+        """Sincroniza con la carpeta; devuelve (releídos, borrados)."""
+        disk = self._scan()
+        known = {n: (m, s) for n, m, s in self.db.execute("SELECT name, mtime_ns, size FROM summaries")}
+        gone = [(n,) for n in known if n not in disk]
+        rows = []; blank = (None,) * len(TOTAL_KEYS)
+        for name, key in disk.items():
+            if known.get(name) == key: continue
+            try:
+                s = save_summary(os.path.join(self.folder, name))
+                t = s["totals"]
+                rows.append((name, *key, float(s["timestamp"]), int(s["modules"]), json.dumps(t), None,
+                             *(t.get(k) for k in TOTAL_KEYS)))
+            except Exception as e:
+                rows.append((name, *key, None, None, None, f"{type(e).__name__}: {e}", *blank))
+        if gone or rows:
+            try:
+                with self.db:
+                    self.db.executemany("DELETE FROM summaries WHERE name = ?", gone)
+                    marks = ", ".join("?" * (7 + len(TOTAL_KEYS)))
+                    self.db.executemany(f"INSERT OR REPLACE INTO summaries (name, mtime_ns, size, timestamp, modules, totals, error"
+                                        f"{''.join(', ' + c for c in METRIC_COLUMNS.values())}) VALUES ({marks})", rows)
+            except sqlite3.Error:
+                # no se pudo escribir el índice en disco: se sigue en memoria
+                self.db.close(); self.db = self._open(":memory:")
+                return self.refresh()
+        return len(rows), len(gone)
+
+    # ---- consultas ----
+    @staticmethod
+    def _where(ranges):
+        """WHERE para {métrica: (mín, máx)} (None = sin cota; cotas incluidas)."""
+        sql = ["error IS NULL"]; args = []
+        for field, (lo, hi) in (ranges or {}).items():
+            col = _COLUMNS.get(field)
+            if col is None: raise ValueError(f"unknown field {field!r} (known: {', '.join(FIELDS)})")
+            if lo is not None: sql.append(f"{col} >= ?"); args.append(lo)
+            if hi is not None: sql.append(f"{col} <= ?"); args.append(hi)
+        return " AND ".join(sql), args
+
+    def query(self, ranges=None, order_by="timestamp", descending=True, limit=None, offset=0):
+        """Saves que cumplen `ranges`, ordenados por `order_by` (los que no tienen esa métrica quedan fuera)."""
+        col = _COLUMNS.get(order_by)
+        if col is None: raise ValueError(f"unknown field {order_by!r} (known: {', '.join(FIELDS)})")
+        where, args = self._where(ranges)
+        sql = (f"SELECT name, timestamp, modules, totals FROM summaries WHERE {where} AND {col} IS NOT NULL "
+               f"ORDER BY {col} {'DESC' if descending else 'ASC'}, name LIMIT ? OFFSET ?")
+        folder = self.folder
+        return [{"path": os.path.join(folder, n), "timestamp": ts, "modules": mods, "totals": json.loads(tot)}
+                for n, ts, mods, tot in self.db.execute(sql, (*args, -1 if limit is None else limit, offset))]
+
+    def count(self, ranges=None, order_by="timestamp"):
+        """Cuántos saves devolvería query(ranges, order_by) sin límite."""
+        where, args = self._where(ranges)
+        return self.db.execute(f"SELECT COUNT(*) FROM summaries WHERE {where} AND {_COLUMNS[order_by]} IS NOT NULL",
+                               args).fetchone()[0]
+
+    def latest(self, limit=None, offset=0):
+        """Resúmenes legibles del más nuevo al más viejo."""
+        return self.query(limit=limit, offset=offset)
+
+    def errors(self):
+        """[(ruta, error)] de los saves que no se pudieron leer."""
+        return [(os.path.join(self.folder, n), err) for n, err in
+                self.db.execute("SELECT name, error FROM summaries WHERE error IS NOT NULL ORDER BY name")]
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM summaries WHERE error IS NULL").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close(); return False
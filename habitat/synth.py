@@ -0,0 +1,77 @@
+# habitat/synth.py
+"""Hábitats sintéticos deterministas (benchmarks y pruebas de carga).
+
+Tres formas, todas conexas y creciendo desde la base (0, 0):
+
+    spiral   disco lleno, anillo por anillo
+    rings    anillos concéntricos de por medio, unidos por un rayo (tiene huecos)
+    growth   crecimiento aleatorio: un vecino libre de un módulo al azar
+
+Los equipos se sortean con la misma semilla, así que (forma, n, semilla)
+siempre da el mismo hábitat.
+"""
+import random
+
+from habitat.geometry import NEI
+from habitat.catalog import SLOTS, ITEM_DEFS
+from habitat.model import Habitat
+
+__all__ = ["SHAPES", "hex_ring", "spiral", "rings", "random_growth", "synthetic_modules", "synthetic_habitat"]
+
+def hex_ring(radius, center=(0, 0)):
+    """Los 6·radius hexes a distancia `radius` de `center`, en orden alrededor."""
+    if radius == 0:
+        yield center; return
+    q, r = center[0] + NEI[4][0] * radius, center[1] + NEI[4][1] * radius
+    for side in range(6):
+        dq, dr = NEI[side]
+        for _ in range(radius):
+            yield (q, r)
+            q += dq; r += dr
+
+def spiral(n, seed=0):
+    out = []; radius = 0
+    while len(out) < n:
+        for ax in hex_ring(radius):
+            out.append(ax)
+            if len(out) == n: break
+        radius += 1
+    return out
+
+def rings(n, seed=0):
+    # radios pares llenos; en los impares sólo el hex del rayo que los une
+    out = []; radius = 0
+    while len(out) < n:
+        ring = hex_ring(radius) if radius % 2 == 0 else iter([next(hex_ring(radius))])
+        for ax in ring:
+            out.append(ax)
+            if len(out) == n: break
+        radius += 1
+    return out
+
+def random_growth(n, seed=0):
+    rnd = random.Random(seed)
+    out = [(0, 0)]; taken = {(0, 0)}
+    while len(out) < n:
+        q, r = out[rnd.randrange(len(out))]
+        dq, dr = NEI[rnd.randrange(6)]
+        ax = (q + dq, r + dr)
+        if ax not in taken:
+            taken.add(ax); out.append(ax)
+    return out
+
+SHAPES = {"spiral": spiral, "rings": rings, "growth": random_growth}
+
+def synthetic_modules(shape, n, seed=0, equip_fill=0.5):
+    """Lista "modules" (esquema de los saves) de `n` módulos con forma `shape`."""
+    rnd = random.Random(seed)
+    mods = []
+    for q, r in SHAPES[shape](n, seed):
+        equip = [rnd.randrange(len(ITEM_DEFS)) if rnd.random() < equip_fill else -1 for _ in range(SLOTS)]
+        mods.append({"q": q, "r": r, "style": rnd.randrange(2), "equip": equip})
+    return mods
+
+def synthetic_habitat(shape, n, seed=0, equip_fill=0.5):
+    hab = Habitat()
+    hab.load_modules(synthetic_modules(shape, n, seed, equip_fill))
+    return hab
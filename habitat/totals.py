@@ -0,0 +1,96 @@
+# habitat/totals.py
+# Totales del hábitat: conteos por estilo e ítem por las matrices del catálogo.
+import math
+
+from habitat.catalog import CATALOG, ITEM_DEFS, MODULE_BASE, TOTAL_KEYS, ITEM_DELTAS, STYLE_DELTAS
+from habitat.compat import NUMPY_AVAILABLE, np
+
+__all__ = ["compute_totals", "totals_from_counts", "totals_batch", "totals_close", "TotalsCounter"]
+
+def compute_totals(modulos):
+    """Recorre todos los módulos (iterable de Modulo), cuenta estilos y equipos y suma."""
+    style_count = dict.fromkeys(MODULE_BASE, 0)
+    item_count = [0] * len(ITEM_DEFS)
+    for m in modulos:
+        style_count[m.style] += 1
+        for idx in m.equip:
+            if idx >= 0: item_count[idx] += 1
+    return totals_from_counts(style_count, item_count)
+
+def totals_from_counts(style_count, item_count):
+    """Totales a partir de módulos por estilo {style: n} y equipos por ítem [n, ...]."""
+    t = [0.0] * len(TOTAL_KEYS)
+    for st, n in style_count.items():
+        if n:
+            for k, d in enumerate(STYLE_DELTAS[st]): t[k] += n * d
+    for idx, n in enumerate(item_count):
+        if n:
+            for k, d in enumerate(ITEM_DELTAS[idx]): t[k] += n * d
+    return dict(zip(TOTAL_KEYS, t))
+
+def totals_batch(style_counts, item_counts):
+    """Totales de muchos hábitats candidatos a la vez.
+
+    style_counts: N × estilos, item_counts: N × ítems (conteos por fila).
+    Devuelve N × recursos en el orden de TOTAL_KEYS: con NumPy es un array
+    (dos productos de matrices), sin NumPy una lista de listas.
+    """
+    if NUMPY_AVAILABLE:
+        return np.asarray(style_counts, dtype=np.float64) @ CATALOG.style_matrix + np.asarray(item_counts, dtype=np.float64) @ CATALOG.item_matrix
+    out = []
+    for sc, ic in zip(style_counts, item_counts):
+        t = [0.0] * len(TOTAL_KEYS)
+        for rows, counts in ((STYLE_DELTAS, sc), (ITEM_DELTAS, ic)):
+            for i, n in enumerate(counts):
+                if n:
+                    for k, d in enumerate(rows[i]): t[k] += n * d
+        out.append(t)
+    return out
+
+def totals_close(a, b, rel_tol=1e-9, abs_tol=1e-6):
+    return all(math.isclose(a[k], b[k], rel_tol=rel_tol, abs_tol=abs_tol) for k in TOTAL_KEYS)
+
+class TotalsCounter:
+    """Cuenta módulos por estilo y equipos por ítem; los totales salen de los conteos.
+
+    Cada edición aplica sólo su delta, y `totals` cuesta O(estilos + ítems)
+    sin importar el tamaño del hábitat.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.style_count = {st: 0 for st in MODULE_BASE}
+        self.item_count = [0] * len(ITEM_DEFS)
+        self.totals = dict.fromkeys(TOTAL_KEYS, 0.0)
+
+    def count(self, mod, sign):
+        """Suma (sign=+1) o resta (sign=-1) un módulo completo."""
+        self.count_all((mod,), sign)
+
+    def count_all(self, mods, sign=+1):
+        """Como count() para muchos módulos, con un solo refresh al final."""
+        style_count = self.style_count; item_count = self.item_count
+        for mod in mods:
+            style_count[mod.style] += sign
+            for idx in mod.equip:
+                if idx >= 0: item_count[idx] += sign
+        self.refresh()
+
+    def load_counts(self, style_count, item_count):
+        """Reemplaza los conteos (p. ej. los de ModuleStore.counts()) y recalcula."""
+        self.style_count = {st: style_count.get(st, 0) for st in MODULE_BASE}
+        self.item_count = list(item_count)
+        self.refresh()
+
+    def restyle(self, old, new):
+        self.style_count[old] -= 1; self.style_count[new] += 1
+        self.refresh()
+
+    def re_equip(self, old, new):
+        if old >= 0: self.item_count[old] -= 1
+        if new >= 0: self.item_count[new] += 1
+        self.refresh()
+
+    def refresh(self):
+        self.totals = totals_from_counts(self.style_count, self.item_count)
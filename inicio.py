@@ -3,6 +3,8 @@ import sys
 import os
 from ui.Datos import datos_screen
 from ui.Modulos import modulos_screen
+from ui.Fuentes import get_font, render_text
+from ui import Redibujo
 
 # Try to import Pillow for animated GIF support
 try:
@@ -33,10 +35,10 @@ screen = pygame.display.set_mode((info.current_w, info.current_h), flags)
 pygame.display.set_caption("CONDOR HAS LANDED")
 WIDTH, HEIGHT = screen.get_size()
 
-font_title = pygame.font.SysFont(None, 100)
-font_button = pygame.font.SysFont(None, 36)
+font_title = get_font(None, 100)
+font_button = get_font(None, 36)
 
-title_text = font_title.render("CONDOR HAS LANDED", True, TITLE_COLOR)
+title_text = render_text(font_title, "CONDOR HAS LANDED", TITLE_COLOR)
  # Position title at top center (small margin) without removing existing content
 title_rect = title_text.get_rect(midtop=(WIDTH // 2, 20))
 
@@ -44,7 +46,7 @@ title_rect = title_text.get_rect(midtop=(WIDTH // 2, 20))
 # Calculate button sizes so the label text always fits (with padding)
 labels = ["Simular habitat", "Ver habitat", "Salir"]
 # Render texts once to measure
-rendered_texts = [font_button.render(lbl, True, BLACK) for lbl in labels]
+rendered_texts = [render_text(font_button, lbl, BLACK) for lbl in labels]
 text_widths = [t.get_width() for t in rendered_texts]
 text_heights = [t.get_height() for t in rendered_texts]
 padding_x = max(20, int(WIDTH * 0.02))
@@ -73,7 +75,7 @@ def draw_button(rect, text):
     pygame.draw.rect(surf, alpha_color, surf.get_rect(), border_radius=10)
     screen.blit(surf, rect.topleft)
     # Use title color for button text to match the title (except Exit button)
-    txt = font_button.render(text, True, TITLE_COLOR)
+    txt = render_text(font_button, text, TITLE_COLOR)
     txt_rect = txt.get_rect(center=rect.center)
     screen.blit(txt, txt_rect)
 
@@ -85,7 +87,7 @@ def draw_exit_button(rect, text):
     alpha_color = (*exit_color, 180)
     pygame.draw.rect(surf, alpha_color, surf.get_rect(), border_radius=10)
     screen.blit(surf, rect.topleft)
-    txt = font_button.render(text, True, WHITE)
+    txt = render_text(font_button, text, WHITE)
     txt_rect = txt.get_rect(center=rect.center)
     screen.blit(txt, txt_rect)
 
@@ -118,18 +120,19 @@ def load_gif_frames_with_pillow(path):
 
 def credits_screen(screen):
     """Simple credits screen: shows some text and returns to main when any key or mouse button is pressed."""
-    clock = pygame.time.Clock()
-    small_font = pygame.font.SysFont(None, 30)
-    title_font = pygame.font.SysFont(None, 40)
+    sched = Redibujo.Scheduler(60)
+    small_font = get_font(None, 30)
+    title_font = get_font(None, 40)
     lines = ["Credits", "Developed by:","Juan David Chica Garcia","Francisco Andres Forero Daza","Daniel Sneyder Ramirez Torres","Daniela Alejandra Castillo Avellaneda","Maria Jose Barrios Riaño","Assets: NASA / internal", "Press any key or click to return"]
     while True:
-        clock.tick(60)
-        for event in pygame.event.get():
+        for event in sched.events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             elif event.type == pygame.KEYDOWN or (event.type == pygame.MOUSEBUTTONDOWN and event.button == 1):
                 return
+        if not sched.frame():
+            continue
 
         # Draw background
         screen.fill(WHITE)
@@ -137,9 +140,9 @@ def credits_screen(screen):
         y = HEIGHT // 4
         for i, line in enumerate(lines):
             if i == 0:
-                txt = title_font.render(line, True, TITLE_COLOR)
+                txt = render_text(title_font, line, TITLE_COLOR)
             else:
-                txt = small_font.render(line, True, BLACK)
+                txt = render_text(small_font, line, BLACK)
             rect = txt.get_rect(center=(WIDTH // 2, y))
             screen.blit(txt, rect)
             y += 50
@@ -214,12 +217,34 @@ def main():
     else:
         print("ini.gif not found in script dir or cwd. Place ini.gif next to inicio.py")
 
-    clock = pygame.time.Clock()
+    # Only the animated GIF needs continuous frames; otherwise the menu sleeps until an event
+    sched = Redibujo.Scheduler(60)
+    sched.animate(use_gif and len(frames) > 1)
     bg_index = 0
     bg_acc = 0
 
     while True:
-        dt = clock.tick(60)
+        for event in sched.events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if button1_rect.collidepoint(event.pos):
+                    datos_screen(screen)
+                elif button2_rect.collidepoint(event.pos):
+                    modulos_screen(screen)
+                elif exit_button_rect.collidepoint(event.pos):
+                    pygame.quit()
+                    sys.exit()
+                elif credits_button_rect.collidepoint(event.pos):
+                    credits_screen(screen)
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    pygame.quit()
+                    sys.exit()
+        dt = sched.dt
+        if not sched.frame():
+            continue
 
         # Update background
         if use_gif and frames:
@@ -252,25 +277,6 @@ def main():
         draw_button(credits_button_rect, "Credits")
         draw_exit_button(exit_button_rect, "Exit")
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if button1_rect.collidepoint(event.pos):
-                    datos_screen(screen)
-                elif button2_rect.collidepoint(event.pos):
-                    modulos_screen(screen)
-                elif exit_button_rect.collidepoint(event.pos):
-                    pygame.quit()
-                    sys.exit()
-                elif credits_button_rect.collidepoint(event.pos):
-                    credits_screen(screen)
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-
         pygame.display.flip()
 
 
@@ -0,0 +1,9 @@
+# tests/conftest.py
+# Las pruebas importan habitat/ y ui/ desde la raíz del proyecto; la UI, sin display.
+import os, sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
@@ -0,0 +1,52 @@
+# tests/helpers.py
+# Ediciones al azar y comparaciones de fuerza bruta compartidas por las pruebas.
+from collections import deque
+
+from habitat import NEI, SLOTS, ITEM_DEFS, STYLE_DELTAS
+
+CAMERA = {"pos": [12.5, -3.0], "zoom": 1.25}
+
+def free_neighbor(hab, rng):
+    """Un hex libre pegado a un módulo al azar (el hábitat crece como en el editor)."""
+    mods = list(hab.modulos)
+    while True:
+        q, r = rng.choice(mods)
+        dq, dr = rng.choice(NEI)
+        if (q + dq, r + dr) not in hab.modulos: return (q + dq, r + dr)
+
+def random_equip(rng):
+    return [rng.randrange(-1, len(ITEM_DEFS)) for _ in range(SLOTS)]
+
+def random_edit(hab, rng):
+    """Una edición al azar: alta, baja, estilo o equipo (nunca se borra la base)."""
+    op = rng.random()
+    mods = list(hab.modulos)
+    if op < 0.35 or len(mods) < 3:
+        hab.add_modulo(free_neighbor(hab, rng), rng.randrange(len(STYLE_DELTAS)), random_equip(rng))
+    elif op < 0.55:
+        hab.remove_modulo(rng.choice([ax for ax in mods if ax != hab.base_ax]))
+    elif op < 0.7:
+        hab.set_style(rng.choice(mods), rng.randrange(len(STYLE_DELTAS)))
+    else:
+        hab.set_equip(rng.choice(mods), rng.randrange(SLOTS), rng.randrange(-1, len(ITEM_DEFS)))
+
+def state(hab):
+    """Contenido comparable de un hábitat (sobre su snapshot()): módulos ordenados y totales."""
+    snap = hab.snapshot()
+    mods = sorted((q, r, snap.modulos[(q, r)].style, tuple(snap.modulos[(q, r)].equip)) for q, r in snap.modulos)
+    return mods, dict(snap.totals)
+
+def bfs_components(cells):
+    """Componentes conexas de `cells` por BFS desde cero."""
+    seen = set(); out = []
+    for start in cells:
+        if start in seen: continue
+        comp = {start}; seen.add(start); todo = deque([start])
+        while todo:
+            q, r = todo.popleft()
+            for dq, dr in NEI:
+                nb = (q + dq, r + dr)
+                if nb in cells and nb not in seen:
+                    seen.add(nb); comp.add(nb); todo.append(nb)
+        out.append(comp)
+    return out
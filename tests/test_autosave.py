@@ -0,0 +1,101 @@
+# tests/test_autosave.py
+"""Guardado en segundo plano (SaveWorker, Autosaver, prune_autosaves) y escritura atómica."""
+import os, time
+
+import pytest
+
+from habitat.autosave import SaveWorker, Autosaver, prune_autosaves
+from habitat.files import load_save
+from habitat.fsutil import atomic_write
+from habitat.synth import synthetic_habitat
+from helpers import state
+
+class Clock:
+    def __init__(self): self.t = 0.0
+    def __call__(self): return self.t
+
+def _wait(worker, auto=None):
+    results = worker.close(timeout=10)
+    if auto is not None: auto.finished(results)
+    return results
+
+# -------------------- escritura atómica --------------------
+def test_atomic_write_failure_keeps_the_original(tmp_path):
+    path = tmp_path / "save.json"
+    path.write_bytes(b"original"); os.chmod(path, 0o640)
+    def broken(f):
+        f.write(b"half of the new"); raise OSError("disk full")
+    with pytest.raises(OSError, match="disk full"):
+        atomic_write(str(path), broken)
+    assert path.read_bytes() == b"original"
+    assert os.listdir(tmp_path) == ["save.json"]                  # sin .tmp
+    assert atomic_write(str(path), lambda f: f.write(b"new")) == 3
+    assert path.read_bytes() == b"new" and os.stat(path).st_mode & 0o777 == 0o640
+
+# -------------------- SaveWorker --------------------
+def test_worker_runs_jobs_in_order_and_reports_errors():
+    worker = SaveWorker()
+    def fail(): raise ValueError("boom")
+    worker.submit(lambda: "a", "one"); worker.submit(fail, "two"); worker.submit(lambda: "c", "three")
+    assert worker.busy
+    results = _wait(worker)
+    assert [(ok, tag) for ok, _, tag in results] == [(True, "one"), (False, "two"), (True, "three")]
+    assert isinstance(results[1][1], ValueError) and not worker.busy
+
+# -------------------- autoguardado --------------------
+def test_prune_keeps_the_newest(tmp_path):
+    names = [f"autosave_2025010{i}_120000_000.habb" for i in range(1, 8)]
+    for n in names + ["habitat_1.habb", "autosave_notes.txt"]: (tmp_path / n).write_bytes(b"")
+    assert prune_autosaves(str(tmp_path), keep=3) == names[:4]
+    assert sorted(os.listdir(tmp_path)) == sorted(names[4:] + ["habitat_1.habb", "autosave_notes.txt"])
+    assert sorted(prune_autosaves(str(tmp_path), keep=0)) == names[4:]
+    assert prune_autosaves(str(tmp_path / "missing")) == []
+
+def test_autosaver_triggers_on_edits_or_time(tmp_path):
+    clock = Clock(); worker = SaveWorker()
+    hab = synthetic_habitat("spiral", 30)
+    auto = Autosaver(worker, str(tmp_path / "auto"), interval=60, edits=5, keep=2, clock=clock)
+    clock.t = 1000
+    assert not auto.tick(hab)                                     # el primer tick sólo toma la revisión
+    clock.t = 2000
+    assert not auto.tick(hab)                                     # sin cambios no se guarda
+    auto.mark_saved(hab)
+    hab.add_modulo((50, 50))
+    clock.t = 2030
+    assert not auto.tick(hab)                                     # un cambio, antes del intervalo
+    for q in range(51, 56): hab.add_modulo((q, 50))
+    assert auto.tick(hab)                                         # llegó a `edits`
+    saved = state(hab)
+    hab.add_modulo((60, 60)); clock.t = 5000
+    assert not auto.tick(hab)                                     # el anterior sigue en curso
+    _wait(worker, auto)
+    files = os.listdir(tmp_path / "auto")
+    assert len(files) == 1
+    assert state(load_save(str(tmp_path / "auto" / files[0]))[0]) == saved     # la copia, no lo editado después
+
+def test_autosaves_are_pruned_and_failures_retried(tmp_path):
+    clock = Clock()
+    hab = synthetic_habitat("spiral", 30)
+    folder = tmp_path / "auto"
+    for i in range(4):
+        worker = SaveWorker()
+        auto = Autosaver(worker, str(folder), interval=1, edits=1, keep=2, clock=clock)
+        auto.mark_saved(hab)
+        hab.add_modulo((100 + i, 0))
+        assert auto.tick(hab)
+        _wait(worker, auto)
+        time.sleep(0.002)                                         # nombres con milisegundos distintos
+    files = sorted(os.listdir(folder))
+    assert len(files) == 2
+    assert state(load_save(str(folder / files[-1]))[0]) == state(hab)
+    # carpeta imposible de crear: falla, y se reintenta al vencer el intervalo aunque no haya cambios
+    blocker = tmp_path / "file"; blocker.write_bytes(b"")
+    worker = SaveWorker()
+    auto = Autosaver(worker, str(blocker / "auto"), interval=10, edits=1, clock=clock)
+    auto.mark_saved(hab); hab.add_modulo((200, 0))
+    assert auto.tick(hab)
+    results = _wait(worker, auto)
+    assert results and not results[0][0]
+    assert not auto.tick(hab)
+    clock.t += 10
+    assert auto.due(hab)
@@ -0,0 +1,77 @@
+# tests/test_binfmt.py
+"""Formato binario (.habb): ida y vuelta, con y sin NumPy, versión 1 y archivos dañados."""
+import random
+
+import pytest
+
+import habitat.binfmt as binfmt
+from habitat import MODULE_BASE, SLOTS, totals_close
+from habitat.binfmt import write_binary, read_binary, read_binary_header
+from habitat.files import load_save, write_save
+from habitat.synth import synthetic_habitat
+from helpers import CAMERA, random_edit, state
+
+def _edited(seed=7):
+    rng = random.Random(seed)
+    hab = synthetic_habitat("growth", 300, seed=seed)
+    for _ in range(200): random_edit(hab, rng)
+    return hab, rng
+
+def test_full_save_round_trip(tmp_path):
+    hab, rng = _edited()
+    path = str(tmp_path / "habitat.habb")
+    write_save(hab, path, camera=CAMERA, timestamp=1234.5)
+    back, camera, ts = load_save(path)
+    assert state(back) == state(hab)
+    assert camera == CAMERA and ts == 1234.5
+    for _ in range(50): random_edit(hab, rng)
+    write_save(hab, path, camera=CAMERA, timestamp=1300.0)
+    assert state(load_save(path)[0]) == state(hab)
+
+@pytest.mark.parametrize("write_np, read_np", [(True, False), (False, True), (False, False)])
+def test_numpy_and_pure_python_paths_agree(tmp_path, monkeypatch, write_np, read_np):
+    if (write_np or read_np) and not binfmt.NUMPY_AVAILABLE: pytest.skip("numpy not installed")
+    hab, _ = _edited(3)
+    path = str(tmp_path / "habitat.habb")
+    monkeypatch.setattr(binfmt, "NUMPY_AVAILABLE", write_np)
+    write_binary(hab, path)
+    monkeypatch.setattr(binfmt, "NUMPY_AVAILABLE", read_np)
+    back, meta = read_binary(path)
+    assert state(back) == state(hab)
+    assert meta["camera"] is None and meta["timestamp"] is None
+
+def test_version_1_files_still_load(tmp_path):
+    hab, _ = _edited(4)
+    path = tmp_path / "old.habb"
+    tot = [hab.totals[k] for k in binfmt.HEADER_TOTALS_V1]
+    head = binfmt.HEADER_V1.pack(binfmt.MAGIC, 1, binfmt.HEADER_V1.size, binfmt.RECORD.size,
+                                 binfmt.FLAG_TIMESTAMP, len(hab), 0.0, 0.0, 1.0, 99.0, *tot)
+    store = hab.modulos
+    body = b"".join(binfmt.RECORD.pack(q, r, st, *store.equip[i * SLOTS:(i + 1) * SLOTS])
+                    for i, (q, r, st) in enumerate(zip(store.q, store.r, store.style)))
+    path.write_bytes(head + body)
+    meta = read_binary_header(str(path))
+    assert meta["version"] == 1 and meta["timestamp"] == 99.0 and meta["camera"] is None
+    assert totals_close(meta["totals"], hab.totals)
+    assert state(read_binary(str(path))[0]) == state(hab)
+
+def test_damaged_files_raise_value_error(tmp_path):
+    hab, _ = _edited(5)
+    good = tmp_path / "good.habb"
+    write_binary(hab, str(good))
+    data = good.read_bytes()
+    cases = {
+        "short": (b"HA", "too short"),
+        "magic": (b"XXXX" + data[4:], "bad magic"),
+        "newer": (data[:4] + (binfmt.BIN_VERSION + 1).to_bytes(2, "little") + data[6:], "newer"),
+        "truncated": (data[:-5], "truncated"),
+    }
+    for name, (blob, msg) in cases.items():
+        path = tmp_path / f"{name}.habb"
+        path.write_bytes(blob)
+        with pytest.raises(ValueError, match=msg): read_binary(str(path))
+    # un estilo fuera del catálogo en el primer registro
+    hsize = binfmt._PREFIX.unpack_from(data)[2]
+    bad = bytearray(data); bad[hsize + 8] = len(MODULE_BASE)
+    path = tmp_path / "style.habb"; path.write_bytes(bytes(bad))
+    with pytest.raises(ValueError, match="unknown styles"): read_binary(str(path))
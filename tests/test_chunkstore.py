@@ -0,0 +1,69 @@
+# tests/test_chunkstore.py
+"""Saves deduplicados (.habm): bloques compartidos, verificación de hash y recolección de basura."""
+import os, random
+
+import pytest
+
+from habitat.chunkstore import (OBJECTS_DIR, write_manifest, read_manifest, read_manifest_header,
+                                collect_garbage, store_stats)
+from habitat.synth import synthetic_habitat
+from helpers import CAMERA, random_edit, state
+
+def _objects(folder):
+    root = folder / OBJECTS_DIR
+    return {d.name + f.name for d in root.iterdir() for f in d.iterdir()} if root.exists() else set()
+
+def _live(*manifests):
+    return {d for m in manifests for d, _ in read_manifest_header(str(m))["chunks"]}
+
+def test_camera_only_save_writes_no_chunks(tmp_path):
+    hab = synthetic_habitat("growth", 2000, seed=1)
+    path = tmp_path / "a.habm"
+    write_manifest(hab, str(path), camera=CAMERA)
+    before = _objects(tmp_path)
+    written = write_manifest(hab, str(path), camera={"pos": [0, 0], "zoom": 2.0})
+    assert _objects(tmp_path) == before and written == path.stat().st_size
+
+def test_gc_keeps_every_chunk_a_manifest_still_uses(tmp_path):
+    rng = random.Random(2)
+    hab = synthetic_habitat("growth", 3000, seed=2)
+    a, b = tmp_path / "a.habm", tmp_path / "b.habm"
+    write_manifest(hab, str(a))
+    for _ in range(40): random_edit(hab, rng)
+    write_manifest(hab, str(b))                                   # comparte casi todo con a
+    first = state(read_manifest(str(b))[0])
+    for _ in range(40): random_edit(hab, rng)
+    write_manifest(hab, str(b))                                   # los bloques sólo de la b anterior sobran
+    stale = os.path.join(tmp_path, OBJECTS_DIR, "ab", "cdef.tmp")  # un atomic_write cortado
+    os.makedirs(os.path.dirname(stale), exist_ok=True); open(stale, "wb").close()
+    live = _live(a, b)
+    garbage = _objects(tmp_path) - live
+    assert garbage and first != state(hab)
+
+    assert collect_garbage(str(tmp_path)) == (0, 0)              # todo es nuevo: min_age lo protege
+    removed, _ = collect_garbage(str(tmp_path), min_age=0)
+    assert removed == len(garbage)
+    assert _objects(tmp_path) == live
+    assert state(read_manifest(str(b))[0]) == state(hab)
+    read_manifest(str(a))
+    assert store_stats(str(tmp_path))["chunks"] == len(live)
+
+def test_gc_does_nothing_if_a_manifest_is_unreadable(tmp_path):
+    hab = synthetic_habitat("spiral", 500)
+    write_manifest(hab, str(tmp_path / "a.habm"))
+    (tmp_path / "b.habm").write_text("{not json")
+    before = _objects(tmp_path)
+    with pytest.raises(ValueError, match="not collecting"):
+        collect_garbage(str(tmp_path), min_age=0)
+    assert _objects(tmp_path) == before
+
+def test_missing_or_corrupt_chunk_is_a_value_error(tmp_path):
+    hab = synthetic_habitat("spiral", 500)
+    path = str(tmp_path / "a.habm")
+    write_manifest(hab, path)
+    digest = read_manifest_header(path)["chunks"][0][0]
+    obj = tmp_path / OBJECTS_DIR / digest[:2] / digest[2:]
+    obj.write_bytes(b"garbage")
+    with pytest.raises(ValueError, match="corrupt chunk"): read_manifest(path)
+    obj.unlink()
+    with pytest.raises(ValueError, match="missing chunk"): read_manifest(path)
@@ -0,0 +1,67 @@
+# tests/test_connectivity.py
+"""Connectivity (etiquetas en la columna label del ModuleStore) contra un BFS completo."""
+import random
+
+import pytest
+
+from habitat import Habitat
+from habitat.connectivity import Connectivity
+from habitat.synth import synthetic_habitat
+from helpers import random_edit, bfs_components
+
+SEEDS = range(8)
+STEPS = 400
+
+def _check(hab, conn, where):
+    cells = set(hab.modulos)
+    comps = bfs_components(cells)
+    assert sorted(map(sorted, conn.components())) == sorted(map(sorted, comps)), where
+    assert sorted(conn.sizes.values()) == sorted(map(len, comps)), where
+    assert conn.component_count() == len(comps)
+    for comp in comps:
+        assert len({conn.label_of(ax) for ax in comp}) == 1, where
+    base = next(c for c in comps if hab.base_ax in c)
+    assert conn.detached() == len(cells) - len(base)
+    for comp in comps:
+        cuts = {ax for ax in comp if len(bfs_components(comp - {ax})) > 1}
+        for ax in comp:
+            assert conn.would_split(ax) == (ax in cuts), f"{where}, {ax}"
+        assert conn.articulation_points(next(iter(comp))) == cuts, where
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_incremental_labels_match_bfs(seed):
+    rng = random.Random(seed)
+    hab = synthetic_habitat("rings", 80, seed=seed)
+    conn = Connectivity(hab)
+    for step in range(STEPS):
+        random_edit(hab, rng)          # las bajas pueden partir el hábitat: se prueban los cortes
+        if step % 10 == 0: _check(hab, conn, f"seed {seed}, step {step}")
+
+def test_merge_and_split_through_one_hex():
+    hab = Habitat(); conn = Connectivity(hab)
+    for q in (1, 2, 4, 5): hab.add_modulo((q, 0))
+    assert conn.component_count() == 2 and conn.detached() == 2
+    hab.add_modulo((3, 0))                                   # une las dos
+    assert conn.component_count() == 1 and conn.connected_to_base((5, 0))
+    assert conn.would_split((3, 0)) and conn.articulation_points() == {(1, 0), (2, 0), (3, 0), (4, 0)}
+    hab.remove_modulo((3, 0))                                # las vuelve a separar
+    assert conn.component_of((5, 0)) == {(4, 0), (5, 0)} and not conn.connected_to_base((4, 0))
+    assert conn.label_of((3, 0)) == 0 and conn.component_of((3, 0)) == set()
+
+def test_loads_invalidate_and_rebuild():
+    hab = synthetic_habitat("spiral", 50)
+    conn = Connectivity(hab)
+    assert conn.component_count() == 1
+    hab.load_modules([{"q": 0, "r": 0}, {"q": 5, "r": 5}, {"q": 5, "r": 6}])
+    _check(hab, conn, "load_modules")
+    hab.extend_modules([{"q": 1, "r": 0}, {"q": 9, "r": 9}])
+    _check(hab, conn, "extend_modules")
+    assert hab.snapshot().connectivity is None
+
+def test_labels_live_in_the_store():
+    hab = synthetic_habitat("spiral", 200)
+    before = hab.modulos.nbytes()
+    conn = Connectivity(hab); conn.rebuild()
+    # una columna int32 más, no un dict por módulo
+    assert len(hab.modulos.label) == len(hab) and hab.modulos.nbytes() == before
+    assert set(hab.modulos.label) == {conn.label_of(hab.base_ax)}
@@ -0,0 +1,48 @@
+# tests/test_evaluate.py
+"""CLI de evaluación: filas por archivo, archivos dañados y código de salida."""
+import os, csv, io, json
+
+import pytest
+
+from habitat.evaluate import FIELDS, main
+from habitat.files import write_save
+from habitat.synth import synthetic_habitat
+
+@pytest.fixture
+def folder(tmp_path):
+    hab = synthetic_habitat("growth", 80, seed=1)
+    write_save(hab, str(tmp_path / "good.json"))
+    # totales guardados falsos: se informan los recalculados
+    data = json.loads((tmp_path / "good.json").read_text())
+    data["totals"] = {k: 0 for k in data["totals"]}
+    (tmp_path / "good.json").write_text(json.dumps(data))
+    write_save(hab, str(tmp_path / "good.habb"))
+    return tmp_path, hab
+
+def _rows(text):
+    return {os.path.basename(r["path"]): r for r in map(json.loads, text.splitlines())}
+
+def test_all_good_exits_zero(folder, capsys):
+    path, hab = folder
+    assert main([str(path), "-j", "2", "--format", "jsonl"]) == 0
+    out, err = capsys.readouterr()
+    rows = _rows(out)
+    assert sorted(rows) == ["good.habb", "good.json"] and err == ""
+    for row in rows.values():
+        assert row["error"] is None and row["modules"] == len(hab)
+        assert row["energy"] == pytest.approx(hab.totals["Energy"])
+
+def test_corrupt_files_are_reported_and_exit_one(folder, capsys):
+    path, _ = folder
+    (path / "broken.json").write_text('{"modules": [')
+    (path / "short.habb").write_bytes((path / "good.habb").read_bytes()[:-7])
+    missing = str(path / "nope.json")
+    assert main([str(path), missing, "-j", "2"]) == 1
+    out, err = capsys.readouterr()
+    rows = {os.path.basename(r["path"]): r for r in csv.DictReader(io.StringIO(out))}
+    assert list(csv.DictReader(io.StringIO(out)).fieldnames) == FIELDS
+    assert rows["broken.json"]["error"].startswith("JSONDecodeError")
+    assert rows["short.habb"]["error"].startswith("ValueError: truncated habitat binary")
+    assert rows["nope.json"]["error"].startswith("FileNotFoundError")
+    assert rows["good.json"]["error"] == "" and rows["broken.json"]["modules"] == ""
+    assert "3 of 5 files could not be evaluated" in err
@@ -0,0 +1,39 @@
+# tests/test_files.py
+"""habitat.files: guardado completo y resumen según la extensión (.habb y .habj tienen además sus propias pruebas)."""
+import random
+
+import pytest
+
+from habitat import totals_close
+from habitat.files import load_save, write_save, save_summary
+from habitat.synth import synthetic_habitat
+from helpers import CAMERA, random_edit, state
+
+@pytest.fixture
+def edited():
+    rng = random.Random(7)
+    hab = synthetic_habitat("growth", 300, seed=7)
+    for _ in range(200): random_edit(hab, rng)
+    return hab, rng
+
+@pytest.mark.parametrize("ext", [".json", ".habm"])
+def test_full_save_round_trip(tmp_path, edited, ext):
+    hab, rng = edited
+    path = str(tmp_path / f"habitat{ext}")
+    write_save(hab, path, camera=CAMERA, timestamp=1234.5)
+    back, camera, ts = load_save(path)
+    assert state(back) == state(hab)
+    assert camera == CAMERA and ts == 1234.5
+    # segundo guardado sobre el mismo archivo (en .habm reusa los bloques que no cambiaron)
+    for _ in range(50): random_edit(hab, rng)
+    write_save(hab, path, camera=CAMERA, timestamp=1300.0)
+    assert state(load_save(path)[0]) == state(hab)
+
+@pytest.mark.parametrize("ext", [".json", ".habb", ".habm"])
+def test_summary_matches_the_saved_habitat(tmp_path, edited, ext):
+    hab, _ = edited
+    path = str(tmp_path / f"habitat{ext}")
+    write_save(hab, path, timestamp=99.0)
+    s = save_summary(path)
+    assert s["timestamp"] == 99.0 and s["modules"] == len(hab)
+    assert totals_close(s["totals"], hab.totals)
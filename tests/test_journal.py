@@ -0,0 +1,58 @@
+# tests/test_journal.py
+"""Diario de ediciones (.habj): guardados incrementales, reapertura y guardados cortados."""
+import random
+
+from habitat.journal import EditJournal, read_journal
+from habitat.files import load_save
+from habitat.synth import synthetic_habitat
+from helpers import CAMERA, random_edit, state
+
+def _edited(seed=7):
+    rng = random.Random(seed)
+    hab = synthetic_habitat("growth", 300, seed=seed)
+    for _ in range(200): random_edit(hab, rng)
+    return hab, rng
+
+def test_journal_round_trip(tmp_path):
+    hab, rng = _edited()
+    path = str(tmp_path / "habitat.habj")
+    hab.journal = EditJournal(path)
+    hab.journal.flush(hab, camera=CAMERA, timestamp=1000.0)            # checkpoint
+    for ts in (1001.0, 1002.0):
+        for _ in range(30): random_edit(hab, rng)
+        hab.journal.flush(hab, camera=CAMERA, timestamp=ts)            # sólo las ediciones
+        back, camera, saved = load_save(path)
+        assert state(back) == state(hab)
+        assert camera == CAMERA and saved == ts
+    # reabierto para seguir editando: lo nuevo se agrega al mismo diario
+    back, _, _ = load_save(path, editable=True)
+    for _ in range(30): random_edit(back, rng)
+    back.journal.flush(back, camera=CAMERA, timestamp=1003.0)
+    assert state(load_save(path)[0]) == state(back)
+
+def test_torn_save_is_dropped_and_overwritten(tmp_path):
+    hab, rng = _edited(8)
+    path = str(tmp_path / "habitat.habj")
+    hab.journal = EditJournal(path)
+    hab.journal.flush(hab, camera=CAMERA, timestamp=1000.0)
+    saved = state(hab)
+    # un guardado que se cortó a la mitad: ediciones sin su registro "save"
+    with open(path, "ab") as f: f.write(b'["del",0,0]\n["place",9,9,0,[')
+    back, _, save = read_journal(path)
+    assert state(back) == saved and save[1] == 1000.0
+    # al reabrir y guardar, la cola cortada se trunca
+    back, _, _ = load_save(path, editable=True)
+    for _ in range(20): random_edit(back, rng)
+    back.journal.flush(back, camera=CAMERA, timestamp=1001.0)
+    assert state(load_save(path)[0]) == state(back)
+
+def test_checkpoint_once_edits_outgrow_the_habitat(tmp_path):
+    hab, rng = _edited(9)
+    path = str(tmp_path / "habitat.habj")
+    hab.journal = j = EditJournal(path, checkpoint_min=10)
+    j.flush(hab, timestamp=1.0)
+    first = j.ckpt_offset
+    for _ in range(3 * len(hab)): random_edit(hab, rng)         # más ediciones que módulos
+    j.flush(hab, timestamp=2.0)
+    assert j.ckpt_offset > first and j.since_ckpt == 0
+    assert state(load_save(path)[0]) == state(hab)
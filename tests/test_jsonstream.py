@@ -0,0 +1,60 @@
+# tests/test_jsonstream.py
+"""Carga de .json por lotes (StreamLoader) contra json.load y el hábitat guardado."""
+import json, random
+
+import pytest
+
+from habitat import Habitat
+from habitat.files import write_save
+from habitat.jsonstream import StreamLoader, load_json_streaming, read_save_header
+from habitat.synth import synthetic_habitat
+from helpers import CAMERA, random_edit, state
+
+@pytest.fixture
+def saved(tmp_path):
+    rng = random.Random(7)
+    hab = synthetic_habitat("growth", 300, seed=7)
+    for _ in range(200): random_edit(hab, rng)
+    path = str(tmp_path / "habitat.json")
+    write_save(hab, path, camera=CAMERA, timestamp=1234.5)
+    return hab, path
+
+def test_streamed_json_round_trip(saved):
+    hab, path = saved
+    # lotes chicos: varios extend_modules, con cortes en cualquier lugar
+    for chunk in (1, 7, 1000):
+        back, fields = load_json_streaming(path, chunk=chunk)
+        assert state(back) == state(hab) and back.verify_totals()
+        assert fields["camera"] == CAMERA and fields["timestamp"] == 1234.5
+    with open(path, encoding="utf-8") as f:
+        assert state(Habitat.from_config(json.load(f))) == state(hab)
+
+def test_loader_steps_report_progress_and_camera_first(saved):
+    hab, path = saved
+    seen = []; progress = []
+    loader = StreamLoader(path, Habitat(), chunk=50, progress=lambda n, frac: progress.append((n, frac)),
+                          on_field=lambda k, v: seen.append((k, loader.loaded)))
+    while loader.step(): pass
+    assert ("camera", 0) in seen                      # la cámara llega antes que los módulos
+    assert [n for n, _ in progress] == sorted(n for n, _ in progress) and progress[-1][0] == len(hab)
+    assert all(0 <= f <= 1 for _, f in progress) and loader.fraction == 1.0
+    assert state(loader.hab) == state(hab)
+
+def test_header_without_modules(saved):
+    hab, path = saved
+    fields = read_save_header(path)
+    assert fields["module_count"] == len(hab) and fields["camera"] == CAMERA
+    assert "modules" not in fields
+
+def test_old_layout_counts_modules(tmp_path):
+    # saves viejos: totals al final y sin module_count
+    path = tmp_path / "old.json"
+    mods = [{"q": i, "r": 0, "style": 0, "equip": [-1] * 6} for i in range(30)]
+    path.write_text(json.dumps({"version": 1, "modules": mods, "totals": {"Energy": 1.0}}))
+    assert read_save_header(str(path))["module_count"] == 30
+
+def test_truncated_file_raises(tmp_path):
+    path = tmp_path / "broken.json"
+    path.write_text('{"version": 1, "modules": [{"q": 0, "r": 0}, {"q": 1')
+    with pytest.raises(ValueError):
+        load_json_streaming(str(path))
@@ -0,0 +1,73 @@
+# tests/test_optimize.py
+"""Optimizador de equipos (branch-and-bound + símplex) contra la enumeración de todos los conteos."""
+import itertools, random
+
+import pytest
+
+from habitat import Habitat, ITEM_DELTAS, STYLE_DELTAS, TOTAL_KEYS, SLOTS, totals_close
+from habitat.files import write_save
+from habitat.optimize import optimize_equipment, apply_assignment, _solve_counts, main
+
+def _count_vectors(total, k):
+    """Todos los n >= 0 enteros de largo k con sum(n) <= total."""
+    for bars in itertools.combinations(range(total + k), k):
+        n, prev = [], -1
+        for b in bars: n.append(b - prev - 1); prev = b
+        yield n
+
+def _brute(hab, limits):
+    base = [sum(cnt * STYLE_DELTAS[st][k] for st, cnt in hab.counter.style_count.items())
+            for k in range(len(TOTAL_KEYS))]
+    best = None
+    for n in _count_vectors(SLOTS * len(hab), len(ITEM_DELTAS)):
+        tot = {key: base[k] + sum(c * d[k] for c, d in zip(n, ITEM_DELTAS)) for k, key in enumerate(TOTAL_KEYS)}
+        if all((lo is None or tot[key] >= lo - 1e-9) and (hi is None or tot[key] <= hi + 1e-9)
+               for key, (lo, hi) in limits.items()):
+            if best is None or tot["Energy"] > best: best = tot["Energy"]
+    return best
+
+CASES = [
+    dict(crew=4),
+    dict(crew=6, waste_max=-2),
+    dict(crew=2, o2_min=6, food_min=2),
+    dict(crew=0, bounds={"Volume": (3.0, None)}),
+]
+
+@pytest.mark.parametrize("case", CASES)
+def test_optimal_matches_brute_force(case):
+    hab = Habitat(); hab.add_modulo((1, 0), 1)          # 2 módulos: 12 slots
+    res = optimize_equipment(hab, **case)
+    limits = {"Crew": (case.get("crew"), None), "O2": (case.get("o2_min", 0.0), None),
+              "Food": (case.get("food_min", 0.0), None), "Waste": (None, case.get("waste_max"))}
+    limits.update(case.get("bounds", {}))
+    best = _brute(hab, limits)
+    assert best is not None and res["status"] == "optimal"
+    assert res["totals"]["Energy"] == pytest.approx(best)
+    # lo asignado en los slots da exactamente esos totales
+    apply_assignment(hab, res["equip"])
+    assert totals_close(hab.totals, res["totals"]) and hab.verify_totals()
+
+def test_integer_solver_on_random_programs():
+    rng = random.Random(5)
+    for _ in range(40):
+        k = rng.randrange(2, 4)
+        A = [[1.0] * k] + [[rng.randint(-3, 3) for _ in range(k)] for _ in range(2)]
+        b = [float(rng.randint(3, 7))] + [float(rng.randint(-2, 6)) for _ in range(2)]
+        c = [rng.randint(-5, 5) for _ in range(k)]
+        feasible = [n for n in _count_vectors(int(b[0]), k)
+                    if all(sum(a * x for a, x in zip(row, n)) <= bi + 1e-9 for row, bi in zip(A, b))]
+        status, val, n = _solve_counts(A, b, c)
+        if not feasible:
+            assert status == "infeasible" and n is None
+        else:
+            assert status == "optimal"
+            assert val == pytest.approx(max(sum(ci * x for ci, x in zip(c, f)) for f in feasible))
+            assert n in feasible
+
+def test_infeasible_request(tmp_path, capsys):
+    hab = Habitat()                                     # 6 slots: a lo sumo 12 de tripulación
+    res = optimize_equipment(hab, crew=100)
+    assert res == {"status": "infeasible", "counts": None, "totals": None, "equip": None}
+    path = str(tmp_path / "one.json"); write_save(hab, path)
+    assert main([path, "--crew", "100"]) == 1
+    assert "status: infeasible" in capsys.readouterr().out
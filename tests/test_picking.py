@@ -0,0 +1,61 @@
+# tests/test_picking.py
+"""Habitat.modulo_at_world (redondeo axial + vecinos) contra el recorrido completo del original."""
+import random
+
+import pytest
+
+from habitat import Habitat, NEI, HEX_CORNERS, axial_to_world, hex_points_world, point_in_polygon
+from habitat.synth import synthetic_habitat
+from helpers import random_edit
+
+def _brute(hab, pw):
+    # el pick original: primer módulo, en orden de inserción, cuyo hexágono contiene el punto
+    store = hab.modulos
+    for ax in sorted(store, key=lambda ax: store.seq[store.row_of(*ax)]):
+        if point_in_polygon(pw, hex_points_world(axial_to_world(*ax))): return ax
+    return None
+
+def _points(hab, rng):
+    """Centros, vértices, puntos medios de lados y puntos al azar alrededor de los módulos."""
+    for ax in list(hab.modulos)[:60]:
+        cx, cy = axial_to_world(*ax)
+        yield cx, cy
+        corners = [(cx + dx, cy + dy) for dx, dy in HEX_CORNERS]
+        for i, (x1, y1) in enumerate(corners):
+            x2, y2 = corners[(i + 1) % 6]
+            yield x1, y1                                  # vértice (compartido por hasta 3 hexes)
+            yield (x1 + x2) / 2, (y1 + y2) / 2            # borde (compartido por 2)
+        for _ in range(5):
+            yield cx + rng.uniform(-60, 60), cy + rng.uniform(-60, 60)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_pick_matches_the_insertion_order_scan(seed):
+    rng = random.Random(seed)
+    hab = synthetic_habitat("growth", 120, seed=seed)
+    # bajas y altas: el orden de filas del store deja de ser el de inserción
+    for _ in range(150): random_edit(hab, rng)
+    for pw in _points(hab, rng):
+        assert hab.modulo_at_world(pw) == _brute(hab, pw), pw
+
+def _double_hit():
+    """Un punto sobre un lado común que el test de polígono da dentro de los dos hexes."""
+    for c in ((3, 0), (2, 2), (-4, 1)):
+        for dq, dr in NEI:
+            a, b = c, (c[0] + dq, c[1] + dr)
+            pa, pb = (hex_points_world(axial_to_world(*ax)) for ax in (a, b))
+            (x1, y1), (x2, y2) = [v for v in pa if any(abs(v[0] - w[0]) < 1e-9 and abs(v[1] - w[1]) < 1e-9 for w in pb)]
+            for t in range(2001):
+                pw = (x1 + (x2 - x1) * t / 2000, y1 + (y2 - y1) * t / 2000)
+                if point_in_polygon(pw, pa) and point_in_polygon(pw, pb): return a, b, pw
+    return None
+
+def test_shared_edge_goes_to_the_older_module():
+    hit = _double_hit()
+    assert hit is not None
+    a, b, pw = hit
+    hab = Habitat()
+    hab.add_modulo(b); hab.add_modulo(a)
+    assert hab.modulo_at_world(pw) == _brute(hab, pw) == b
+    hab.remove_modulo(b); hab.add_modulo(b)               # ahora `a` es el más viejo
+    assert hab.modulo_at_world(pw) == _brute(hab, pw) == a
+    assert hab.modulo_at_world((1e6, 1e6)) is None
@@ -0,0 +1,97 @@
+# tests/test_query.py
+"""Consultas (habitat.query) y el índice de resúmenes que las responde (habitat.summaries)."""
+import math, os
+
+import pytest
+
+import habitat.summaries as summaries
+from habitat.files import write_save
+from habitat.query import parse_query, run_query
+from habitat.summaries import SummaryIndex, INDEX_NAME
+from habitat.synth import synthetic_habitat
+
+# -------------------- parser --------------------
+def test_parse_ranges_sort_and_limit():
+    q = parse_query("crew>=8 energy>-2000 modules=100..500 o2<3 volume<=9 sort:+timestamp limit:20")
+    assert q.ranges["crew"] == (8, None)
+    assert q.ranges["energy"] == (math.nextafter(-2000.0, math.inf), None)
+    assert q.ranges["modules"] == (100, 500)
+    assert q.ranges["o2"] == (None, math.nextafter(3.0, -math.inf))
+    assert q.ranges["volume"] == (None, 9)
+    assert q.order_by == "timestamp" and not q.descending and q.limit == 20
+
+def test_repeated_terms_intersect():
+    q = parse_query("crew>=2 crew>=5 crew<=9 crew=..7 Crew=3..")
+    assert q.ranges["crew"] == (5, 7)
+    assert parse_query("").ranges == {} and parse_query("sort:-volume").descending
+
+@pytest.mark.parametrize("text, msg", [
+    ("mass>=3", "'mass>=3': unknown field 'mass'"),
+    ("crew>=lots", "'crew>=lots': 'lots' is not a number"),
+    ("modules=1..x", "'x' is not a number"),
+    ("sort:color", "'sort:color': unknown field 'color'"),
+    ("limit:ten", "'limit:ten': limit must be an integer"),
+    ("limit:-1", "limit must be >= 0"),
+    ("crew", "'crew': expected field>=value"),
+])
+def test_errors_name_the_bad_term(text, msg):
+    with pytest.raises(ValueError, match=msg.replace("(", r"\(").replace(".", r"\.")):
+        parse_query("crew>=1 " + text)
+
+# -------------------- índice --------------------
+def _folder(tmp_path, n=12):
+    for i in range(n):
+        hab = synthetic_habitat("growth", 20 + 10 * i, seed=i)
+        write_save(hab, str(tmp_path / f"h{i:02d}{('.json', '.habb', '.habm')[i % 3]}"), timestamp=1000.0 + i)
+    return tmp_path
+
+def test_query_matches_filtering_in_python(tmp_path):
+    folder = _folder(tmp_path)
+    with SummaryIndex(str(folder)) as idx:
+        assert idx.refresh() == (12, 0)
+        every = idx.latest()
+        assert [it["timestamp"] for it in every] == sorted((it["timestamp"] for it in every), reverse=True)
+        q = parse_query("modules>=60 sort:+volume limit:4")
+        want = sorted((it for it in every if it["modules"] >= 60), key=lambda it: it["totals"]["Volume"])[:4]
+        assert [it["path"] for it in q.run(idx)] == [it["path"] for it in want]
+        assert [it["path"] for it in q.run(idx, offset=2, limit=2)] == [it["path"] for it in want[2:]]
+        assert q.count(idx) == 4 and parse_query("modules>=60").count(idx) == sum(it["modules"] >= 60 for it in every)
+    small = [it["path"] for it in every if it["modules"] <= 40]
+    assert small and [it["path"] for it in run_query(str(folder), "modules<=40")] == small
+
+def test_refresh_rereads_only_what_changed(tmp_path):
+    folder = _folder(tmp_path)
+    with SummaryIndex(str(folder)) as idx:
+        idx.refresh()
+        assert idx.refresh() == (0, 0)
+        # reescrito con otro tamaño: se relee; borrado: sale del índice
+        write_save(synthetic_habitat("spiral", 999), str(folder / "h03.json"), timestamp=5.0)
+        os.remove(folder / "h04.habb")
+        assert idx.refresh() == (1, 1) and len(idx) == 11
+        assert parse_query("modules>=999").run(idx)[0]["timestamp"] == 5.0
+    # el índice persiste: otra instancia no relee nada
+    with SummaryIndex(str(folder)) as idx:
+        assert idx.refresh() == (0, 0) and len(idx) == 11
+
+def test_unreadable_saves_are_recorded_until_they_change(tmp_path):
+    folder = _folder(tmp_path, 3)
+    bad = folder / "broken.json"; bad.write_text("{")
+    with SummaryIndex(str(folder)) as idx:
+        assert idx.refresh() == (4, 0)
+        assert [p for p, _ in idx.errors()] == [str(bad)] and len(idx) == 3
+        assert idx.refresh() == (0, 0)                   # no se reintenta
+        write_save(synthetic_habitat("spiral", 5), str(bad))
+        assert idx.refresh() == (1, 0) and idx.errors() == [] and len(idx) == 4
+
+def test_stale_or_corrupt_index_is_rebuilt(tmp_path, monkeypatch):
+    folder = _folder(tmp_path, 3)
+    with SummaryIndex(str(folder)) as idx: idx.refresh()
+    # otras columnas en el catálogo: el índice viejo no sirve
+    monkeypatch.setattr(summaries, "_LAYOUT", summaries._LAYOUT + "x")
+    with SummaryIndex(str(folder)) as idx:
+        assert len(idx) == 0 and idx.refresh() == (3, 0)
+    (folder / INDEX_NAME).write_bytes(b"not a database" * 100)
+    with SummaryIndex(str(folder)) as idx:
+        assert idx.refresh() == (3, 0)
+    with SummaryIndex(str(folder)) as idx:                # y vuelve a persistir
+        assert idx.refresh() == (0, 0)
@@ -0,0 +1,89 @@
+# tests/test_store.py
+"""ModuleStore (columnas + índice paginado) contra un dict, y validación de ids al cargar."""
+import json, random
+from array import array
+
+import pytest
+
+from habitat import Habitat, ModuleStore, SLOTS, ITEM_DEFS, MODULE_BASE
+import habitat.store as store_mod
+from helpers import random_equip
+
+def test_store_matches_a_dict_under_put_and_remove():
+    rng = random.Random(3)
+    store = ModuleStore(); ref = {}
+    for step in range(3000):
+        q, r = rng.randrange(-40, 40), rng.randrange(-40, 40)
+        if (q, r) in ref and rng.random() < 0.5:
+            store.remove(q, r); del ref[(q, r)]
+        else:
+            st = rng.randrange(len(MODULE_BASE)); eq = random_equip(rng)
+            store.put(q, r, st, eq); ref[(q, r)] = (st, eq)
+        if step % 100 == 0:
+            assert len(store) == len(ref)
+            assert {ax: (store[ax].style, store[ax].equip.tolist()) for ax in store} == ref
+            for row, ax in enumerate(store):
+                assert store.row_of(*ax) == row
+    assert (99, 99) not in store
+    with pytest.raises(KeyError): store.remove(99, 99)
+
+def test_seq_keeps_insertion_order_through_swap_remove():
+    store = ModuleStore()
+    for i in range(10): store.put(i, 0)
+    store.remove(2, 0); store.remove(5, 0)
+    store.put(3, 0, 1)                              # reemplazar no cambia el orden
+    order = sorted(store, key=lambda ax: store.seq[store.row_of(*ax)])
+    assert order == [(i, 0) for i in range(10) if i not in (2, 5)]
+    copy = store.copy(); copy.put(20, 0)
+    assert len(copy) == len(store) + 1 and (20, 0) not in store
+
+def test_load_columns_rejects_duplicates_and_bad_lengths():
+    store = ModuleStore()
+    eq = array("b", [-1] * (2 * SLOTS))
+    with pytest.raises(ValueError, match="duplicate"):
+        store.load_columns(array("i", [1, 1]), array("i", [0, 0]), array("b", [0, 0]), eq)
+    assert len(store) == 0
+    with pytest.raises(ValueError, match="lengths"):
+        store.load_columns(array("i", [1, 2]), array("i", [0]), array("b", [0, 0]), eq)
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_counts_with_and_without_numpy(monkeypatch, numpy):
+    if numpy and not store_mod.NUMPY_AVAILABLE: pytest.skip("numpy not installed")
+    monkeypatch.setattr(store_mod, "NUMPY_AVAILABLE", numpy)
+    rng = random.Random(4)
+    store = ModuleStore()
+    for i in range(200): store.put(i, 0, rng.randrange(len(MODULE_BASE)), random_equip(rng))
+    styles, items = store.counts()
+    assert styles == {s: sum(store[ax].style == s for ax in store) for s in MODULE_BASE}
+    assert items == [sum(store[ax].equip.tolist().count(i) for ax in store) for i in range(len(ITEM_DEFS))]
+
+# -------------------- ids fuera del catálogo --------------------
+BAD = [{"q": 1, "r": 0, "style": len(MODULE_BASE)},
+       {"q": 1, "r": 0, "equip": [0, len(ITEM_DEFS)]},
+       {"q": 1, "r": 0, "equip": [300]}]
+
+@pytest.mark.parametrize("bad", BAD)
+def test_bad_ids_are_a_clear_value_error(bad):
+    hab = Habitat(); hab.add_modulo((5, 5))
+    with pytest.raises(ValueError, match=r"module 1 at \(1, 0\): unknown"):
+        hab.load_modules([{"q": 0, "r": 0}, bad])
+    # se valida antes de tocar nada
+    assert (5, 5) in hab.modulos and hab.verify_totals()
+    with pytest.raises(ValueError, match="unknown"):
+        hab.extend_modules([{"q": 7, "r": 7}, bad])
+    assert (7, 7) not in hab.modulos and hab.verify_totals()
+
+def test_negative_items_are_empty_slots():
+    hab = Habitat()
+    hab.load_modules([{"q": 0, "r": 0, "equip": [-5, 2]}])
+    assert hab.modulos[(0, 0)].equip.tolist() == [-1, 2] + [-1] * (SLOTS - 2)
+
+def test_journal_replay_rejects_bad_ids(tmp_path):
+    from habitat.journal import read_journal
+    path = tmp_path / "bad.habj"
+    lines = [["ckpt", {"version": 1, "modules": [{"q": 0, "r": 0}]}],
+             ["place", 1, 0, 0, [len(ITEM_DEFS)] + [-1] * (SLOTS - 1)],
+             ["save", 1.0, 0, 2, {}]]
+    path.write_text("".join(json.dumps(x) + "\n" for x in lines))
+    with pytest.raises(ValueError, match="unknown item"):
+        read_journal(str(path))
@@ -0,0 +1,47 @@
+# tests/test_totals.py
+"""Totales incrementales (TotalsCounter en Habitat) contra el recuento completo."""
+import random
+
+import pytest
+
+from habitat import Habitat, totals_close, compute_totals, totals_batch, TOTAL_KEYS
+from habitat.synth import synthetic_habitat
+from helpers import random_edit
+
+SEEDS = range(8)
+STEPS = 400
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_totals_match_recompute_after_every_edit(seed):
+    rng = random.Random(seed)
+    hab = synthetic_habitat("growth", 60, seed=seed)
+    assert hab.verify_totals()
+    for step in range(STEPS):
+        random_edit(hab, rng)
+        assert totals_close(hab.totals, hab.recompute_totals()), f"seed {seed}, step {step}"
+    assert totals_close(hab.totals, compute_totals(hab.modulos.values()))
+
+def test_clear_and_reload_reset_the_counts():
+    rng = random.Random(1)
+    hab = synthetic_habitat("spiral", 50)
+    for _ in range(50): random_edit(hab, rng)
+    hab.clear()
+    assert all(v == 0 for v in hab.totals.values())
+    hab.add_modulo((0, 0))
+    assert hab.verify_totals()
+    hab.load_modules([{"q": 0, "r": 0, "style": 1, "equip": [0, 1]}, {"q": 1, "r": 0}])
+    assert hab.verify_totals()
+
+def test_totals_batch_matches_one_by_one():
+    rng = random.Random(2)
+    habs = [synthetic_habitat("growth", 30, seed=s) for s in range(5)]
+    for hab in habs:
+        for _ in range(20): random_edit(hab, rng)
+    counts = [hab.modulos.counts() for hab in habs]
+    batch = totals_batch([[sc[s] for s in sorted(sc)] for sc, _ in counts], [ic for _, ic in counts])
+    for hab, row in zip(habs, batch):
+        assert totals_close(hab.totals, dict(zip(TOTAL_KEYS, [float(v) for v in row])))
+
+def test_empty_habitat_has_only_the_base():
+    hab = Habitat()
+    assert len(hab) == 1 and hab.verify_totals()
@@ -2,6 +2,8 @@ import os
 import pygame
 import sys
 
+from ui.Fuentes import get_font, render_text
+
 # Title / background color
 TITLE_COLOR = (34, 49, 73)
 PANEL_BG = (240, 240, 245)
@@ -45,7 +47,7 @@ def load_modules_from_ui_dir():
 def draw_text(surface, text, pos, font, color=(20, 20, 20)):
     if font is None:
         return
-    surf = font.render(text, True, color)
+    surf = render_text(font, text, color)
     surface.blit(surf, pos)
 
 
@@ -82,8 +84,8 @@ def cohete_screen(screen):
 
     # Fonts
     try:
-        title_font = pygame.font.SysFont(None, 30)
-        small_font = pygame.font.SysFont(None, 20)
+        title_font = get_font(None, 30)
+        small_font = get_font(None, 20)
     except Exception:
         title_font = None
         small_font = None
@@ -3,6 +3,9 @@ import pygame
 import sys
 import subprocess
 
+from ui.Fuentes import get_font, render_text
+from ui import Perfil, Redibujo
+
 WHITE = (255, 255, 255)
 BLUE = (30, 144, 255)
 TITLE_COLOR = (34, 49, 73)  # #223149
@@ -23,7 +26,7 @@ class InputBox:
         self.color = self.color_inactive
         self.text = text
         self.font = font
-        self.txt_surface = font.render(text, True, TEXT_COLOR)
+        self.txt_surface = render_text(font, text, TEXT_COLOR)
         self.active = False
         # By default allow any characters; can be set externally to restrict to digits only
         self.digits_only = False
@@ -55,7 +58,7 @@ class InputBox:
                             pass
                     else:
                         self.text += ch
-            self.txt_surface = self.font.render(self.text, True, TEXT_COLOR)
+            self.txt_surface = render_text(self.font, self.text, TEXT_COLOR)
 
     def update(self):
         width = max(200, self.txt_surface.get_width()+10)
@@ -69,7 +72,6 @@ class InputBox:
 
 
 def datos_screen(screen):
-    clock = pygame.time.Clock()
     # Ensure pygame and display surface are initialized. This prevents errors when
     # the module is imported before pygame.init() or if another module changed the display.
     try:
@@ -108,9 +110,9 @@ def datos_screen(screen):
         except Exception:
             bg_image = None
     # Increase title font size by ~30% (40 -> 52)
-    font_title = pygame.font.SysFont(None, 52)
-    font_label = pygame.font.SysFont(None, 26)
-    font_input = pygame.font.SysFont(None, 24)
+    font_title = get_font(None, 52)
+    font_label = get_font(None, 26)
+    font_input = get_font(None, 24)
 
     sw, sh = screen.get_size()
     # Scale and flip background to mirror horizontally if available.
@@ -172,7 +174,7 @@ def datos_screen(screen):
             condor4_raw = pygame.image.load(os.path.join(base_path, '..', 'Condor4.png')).convert_alpha()
         except Exception:
             condor4_raw = None
-    title_text = font_title.render("Habitat Information", True, TEXT_COLOR)
+    title_text = render_text(font_title, "Habitat Information", TEXT_COLOR)
     title_rect = title_text.get_rect(center=(sw//2, int(sh*0.08)))
 
     questions = [
@@ -222,7 +224,7 @@ def datos_screen(screen):
     # and vertically aligned with that label (index 1).
     # Calculamos la posición x usando el ancho renderizado de la etiqueta
     # para que quede justo a su derecha con un pequeño margen.
-    label_for_location = font_label.render(questions[1], True, TEXT_COLOR)
+    label_for_location = render_text(font_label, questions[1], TEXT_COLOR)
     label_width = label_for_location.get_width()
     small_margin = 12
     location_x = label_x + label_width + small_margin
@@ -376,10 +378,16 @@ def datos_screen(screen):
     cm_to_inch = 1.0 / 2.54
     extra_lift_pixels_5cm = int(5.0 * cm_to_inch * DPI)
 
+    sched = Redibujo.Scheduler(30)
+    prof = Perfil.start("datos")
     running = True
     while running:
-        for event in pygame.event.get():
+        events = sched.events()
+        prof.begin_frame()
+        for event in events:
+            if prof.handle_event(event): continue
             if event.type == pygame.QUIT:
+                prof.close()
                 pygame.quit()
                 sys.exit()
             for box in input_boxes.values():
@@ -510,6 +518,8 @@ def datos_screen(screen):
                             print('Error loading Superficie.py:', e)
                 elif back_rect.collidepoint(event.pos):
                     running = False
+        prof.mark("events")
+        if not sched.frame(): continue
 
         # Draw mirrored background if available, otherwise fill white
         if bg_image:
@@ -520,7 +530,7 @@ def datos_screen(screen):
 
         # Draw questions and inputs (no form background as requested)
         for i, q in enumerate(questions):
-            label = font_label.render(q, True, TEXT_COLOR)
+            label = render_text(font_label, q, TEXT_COLOR)
             screen.blit(label, (label_x, start_y + i*gap + 4))
             if i in input_boxes:
                 input_boxes[i].update()
@@ -563,15 +573,18 @@ def datos_screen(screen):
         pygame.draw.rect(screen, GRAY, location_rect, border_radius=8)
         pygame.draw.rect(screen, GRAY, back_rect, border_radius=8)
         # Use the title color for button labels to match the main screen
-        txt_submit = font_label.render("Submit", True, TITLE_COLOR)
-        txt_location = font_label.render("Location", True, TITLE_COLOR)
-        txt_back = font_label.render("Back", True, TITLE_COLOR)
+        txt_submit = render_text(font_label, "Submit", TITLE_COLOR)
+        txt_location = render_text(font_label, "Location", TITLE_COLOR)
+        txt_back = render_text(font_label, "Back", TITLE_COLOR)
         screen.blit(txt_submit, txt_submit.get_rect(center=submit_rect.center))
         screen.blit(txt_location, txt_location.get_rect(center=location_rect.center))
         screen.blit(txt_back, txt_back.get_rect(center=back_rect.center))
+        prof.mark("draw")
+        prof.draw(screen)
 
         pygame.display.flip()
-        clock.tick(30)
+        prof.end_frame()
+    prof.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,50 @@
+# ui/Fuentes.py
+# Registro de fuentes compartido por todas las pantallas + caché LRU de textos renderizados.
+from collections import OrderedDict
+import pygame
+
+__all__ = ["get_font", "render_text", "clear_caches", "TEXT_CACHE_MAX"]
+
+TEXT_CACHE_MAX = 1024   # superficies de texto guardadas como máximo
+
+_fonts = {}                 # (name, size) -> pygame.font.Font
+_texts = OrderedDict()      # (font, text, color, antialias) -> Surface, en orden de uso
+_quit_hooked = False
+
+def clear_caches():
+    """Suelta fuentes y textos (las fuentes dejan de ser válidas tras pygame.quit)."""
+    _fonts.clear()
+    _texts.clear()
+
+def _on_quit():
+    global _quit_hooked
+    _quit_hooked = False    # pygame olvida los hooks tras quit(); se vuelve a registrar
+    clear_caches()
+
+def get_font(name=None, size=24):
+    """Fuente del sistema `name` a tamaño `size`, creada una sola vez por proceso."""
+    global _quit_hooked
+    key = (name, int(size))
+    f = _fonts.get(key)
+    if f is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if not _quit_hooked:
+            pygame.register_quit(_on_quit); _quit_hooked = True
+        f = _fonts[key] = pygame.font.SysFont(name, key[1])
+    return f
+
+def render_text(font, text, color, antialias=True):
+    """Como font.render, pero reutiliza la superficie si ya se rasterizó.
+
+    La superficie devuelta es compartida: se puede blitear, no modificar.
+    """
+    key = (font, text, tuple(color), antialias)
+    surf = _texts.get(key)
+    if surf is not None:
+        _texts.move_to_end(key)
+        return surf
+    surf = _texts[key] = font.render(text, antialias, color)
+    if len(_texts) > TEXT_CACHE_MAX:
+        _texts.popitem(last=False)
+    return surf
@@ -0,0 +1,189 @@
+# ui/Miniaturas.py
+"""Miniaturas de la distribución de hexes de cada save, con caché en disco.
+
+Se dibujan fuera de pantalla (pygame.Surface, sin display) con la misma
+geometría que axial_to_world, un color por estilo de módulo, y se guardan
+como PNG en saves/.thumbs/ con el nombre del hash (SHA-1) del contenido del
+save: un save que no cambió nunca se vuelve a dibujar, y dos copias iguales
+comparten la miniatura.
+
+ThumbnailCache reparte el trabajo en un Pool de procesos (uno por núcleo) y
+la UI sólo consulta con poll() si algo terminó: el bucle de cuadros nunca
+espera. Los procesos se arrancan con "spawn", no con fork: la UI ya tiene
+hilos (SaveWorker) y el display de SDL abierto, y un hijo forkeado heredaría
+sus locks y su estado. Cada hijo arranca limpio, sólo importa este módulo
+(dibujo fuera de pantalla, con SDL_VIDEODRIVER=dummy) y nunca abre display.
+Como con todo "spawn", el script principal tiene que estar protegido con
+if __name__ == "__main__" (ui/Saves.py lo está).
+
+    python -m ui.Miniaturas ui/saves          # genera todas, con todos los núcleos
+"""
+import os, sys, time, hashlib, argparse, multiprocessing
+from multiprocessing.pool import ThreadPool
+
+import pygame
+
+from habitat.geometry import HEX_SIZE, HEX_CORNERS, axial_to_world
+from habitat.files import is_save_file, load_save
+from habitat.fsutil import atomic_write
+
+__all__ = ["THUMB_SIZE", "THUMB_DIR", "STYLE_COLORS", "render_thumbnail", "thumbnail_for", "ThumbnailCache", "main"]
+
+THUMB_SIZE = (160, 96)
+THUMB_DIR = ".thumbs"         # subcarpeta de la carpeta de saves
+THUMB_VERSION = 1             # cambia el nombre de las entradas si cambia el dibujo
+STYLE_COLORS = [(196, 160, 92), (92, 150, 196), (150, 196, 92), (196, 92, 150)]
+BASE_COLOR = (235, 235, 240)
+EDGE_COLOR = (20, 20, 24)
+
+# -------------------- dibujo --------------------
+def render_thumbnail(hab, size=THUMB_SIZE):
+    """Surface (con alfa) de `size` con los hexes de `hab` ajustados al recuadro."""
+    w, h = size
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    store = hab.modulos
+    n = len(store)
+    if not n: return surf
+    # centros en coordenadas de mundo, como en el editor
+    xs, ys = zip(*map(axial_to_world, store.q, store.r))
+    x0, x1, y0, y1 = min(xs) - HEX_SIZE, max(xs) + HEX_SIZE, min(ys) - HEX_SIZE, max(ys) + HEX_SIZE
+    margin = 4
+    scale = min((w - 2 * margin) / (x1 - x0), (h - 2 * margin) / (y1 - y0))     # px por unidad de mundo
+    ox = (w - (x1 - x0) * scale) / 2 - x0 * scale
+    oy = (h - (y1 - y0) * scale) / 2 - y0 * scale
+    radius = HEX_SIZE * scale                                                    # radio de un hex en px
+    corners = [(dx * scale, dy * scale) for dx, dy in HEX_CORNERS]
+    colors = [STYLE_COLORS[s % len(STYLE_COLORS)] for s in range(max(store.style) + 1)]
+    if radius >= 2.5:
+        outline = radius >= 5
+        for x, y, st in zip(xs, ys, store.style):
+            cx, cy = ox + x * scale, oy + y * scale
+            pts = [(cx + dx, cy + dy) for dx, dy in corners]
+            pygame.draw.polygon(surf, colors[st], pts)
+            if outline: pygame.draw.polygon(surf, EDGE_COLOR, pts, 1)
+    else:
+        # hexes de menos de ~3 px: un cuadrado por módulo alcanza
+        side = max(1, int(radius * 1.8))
+        for x, y, st in zip(xs, ys, store.style):
+            surf.fill(colors[st], (int(ox + x * scale) - side // 2, int(oy + y * scale) - side // 2, side, side))
+    # la base (0, 0)
+    pygame.draw.circle(surf, BASE_COLOR, (round(ox), round(oy)), max(2, int(radius * 0.5)))
+    return surf
+
+def _digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def thumbnail_for(path, cache_dir, size=THUMB_SIZE):
+    """Ruta del PNG de `path` en `cache_dir`, dibujándolo sólo si no está (corre en los procesos hijos)."""
+    name = f"{_digest(path)}_{size[0]}x{size[1]}_v{THUMB_VERSION}.png"
+    out = os.path.join(cache_dir, name)
+    if os.path.exists(out): return out
+    hab, _, _ = load_save(path)
+    surf = render_thumbnail(hab, size)
+    os.makedirs(cache_dir, exist_ok=True)
+    atomic_write(out, lambda f: pygame.image.save(surf, f, "thumb.png"))
+    return out
+
+# -------------------- caché para la UI --------------------
+def _file_key(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+def _init_worker():
+    # los hijos dibujan sólo en Surfaces: nada de ventana ni audio
+    os.environ["SDL_VIDEODRIVER"] = "dummy"; os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+def _make_pool(processes=None):
+    if "spawn" in multiprocessing.get_all_start_methods():
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")     # sin el saludo de pygame en cada hijo
+        return multiprocessing.get_context("spawn").Pool(processes or os.cpu_count() or 1, initializer=_init_worker)
+    return ThreadPool(1)
+
+class ThumbnailCache:
+    """Miniaturas de los saves de `folder` para la UI: request() encola, poll() recoge, get() dibuja.
+
+    Cada entrada se valida por mtime y tamaño del save; si cambió se pide de
+    nuevo (y el hash decide si hay que redibujar). El Pool se crea con el
+    primer pedido.
+    """
+    def __init__(self, folder, size=THUMB_SIZE, processes=None):
+        self.cache_dir = os.path.join(folder, THUMB_DIR)
+        self.size = size; self.processes = processes
+        self._pool = None
+        self._jobs = {}        # ruta del save -> (clave del archivo, AsyncResult)
+        self._done = {}        # ruta del save -> (clave del archivo, ruta del PNG o None si falló)
+        self._surfs = {}       # ruta del PNG -> Surface
+
+    @property
+    def busy(self): return bool(self._jobs)
+
+    def request(self, path):
+        key = _file_key(path)
+        done = self._done.get(path)
+        if done is not None and done[0] == key: return
+        job = self._jobs.get(path)
+        if job is not None and job[0] == key: return
+        if self._pool is None: self._pool = _make_pool(self.processes)
+        self._jobs[path] = (key, self._pool.apply_async(thumbnail_for, (path, self.cache_dir, self.size)))
+
+    def poll(self):
+        """Recoge las terminadas sin bloquear; True si llegó alguna."""
+        ready = [p for p, (_, res) in self._jobs.items() if res.ready()]
+        for p in ready:
+            key, res = self._jobs.pop(p)
+            try: self._done[p] = (key, res.get())
+            except Exception: self._done[p] = (key, None)       # save ilegible: queda el placeholder
+        return bool(ready)
+
+    def get(self, path):
+        """Surface de la miniatura de `path`, o None mientras no esté (o si no se pudo dibujar)."""
+        done = self._done.get(path)
+        if done is None or done[1] is None: return None
+        surf = self._surfs.get(done[1])
+        if surf is None:
+            try: surf = self._surfs[done[1]] = pygame.image.load(done[1])
+            except (pygame.error, OSError): return None
+        return surf
+
+    def forget(self, keep):
+        """Suelta las Surfaces de los saves que no están en `keep` (los PNG quedan en disco)."""
+        keep_png = {self._done[p][1] for p in keep if p in self._done}
+        for png in [x for x in self._surfs if x not in keep_png]: del self._surfs[png]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate(); self._pool = None
+        self._jobs = {}
+
+# -------------------- CLI --------------------
+def _cli_job(args):
+    path, cache_dir, size = args
+    try:
+        return path, thumbnail_for(path, cache_dir, size), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m ui.Miniaturas", description="Render thumbnails for every save in a folder.")
+    ap.add_argument("folder", help="saves folder (thumbnails go to FOLDER/.thumbs)")
+    ap.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+    args = ap.parse_args(argv)
+    paths = sorted(os.path.join(args.folder, n) for n in os.listdir(args.folder) if is_save_file(n))
+    cache_dir = os.path.join(args.folder, THUMB_DIR)
+    t = time.perf_counter(); errors = 0
+    with _make_pool(args.workers) as pool:         # spawn, como en la UI
+        for path, _, err in pool.imap_unordered(_cli_job, [(p, cache_dir, THUMB_SIZE) for p in paths], chunksize=8):
+            if err:
+                errors += 1; print(f"{path}: {err}", file=sys.stderr)
+    print(f"{len(paths) - errors} thumbnails in {cache_dir} ({time.perf_counter() - t:.1f} s)")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,24 @@
 # ui/Modulos.py
-import sys, math, os, json, time
+import sys, math, os, time, bisect
+from collections import OrderedDict
 import pygame
 
-__all__ = ["create_window", "toggle_fullscreen", "modulos_screen", "save_configuration", "apply_config"]
+from ui.Fuentes import get_font, render_text
+from ui import Perfil, Redibujo
+# NumPy es opcional: si está, el render transforma todos los hexes en un solo paso
+from habitat.compat import NUMPY_AVAILABLE, np
+from habitat import (Habitat, Modulo, HEX_SIZE, SQRT3, APOTHEM, HEX_CORNERS, axial_to_world, hex_points_world,
+                     ITEM_DEFS, ITEM_NAMES, EMPTY_LABEL, TOTAL_KEYS, format_total)
+from habitat.journal import JOURNAL_EXT, EditJournal
+from habitat.binfmt import BIN_EXT
+from habitat.chunkstore import MANIFEST_EXT
+from habitat.files import load_save, write_save
+from habitat.jsonstream import StreamLoader
+from habitat.connectivity import Connectivity
+from habitat.autosave import SaveWorker, Autosaver, AUTOSAVE_DIR
+
+__all__ = ["create_window", "toggle_fullscreen", "modulos_screen", "save_configuration", "save_journal",
+           "apply_config", "apply_camera"]
 
 # -------------------- Config --------------------
 APP_NAME = "Hex Habitat — Pan, Zoom, UI"
@@ -19,7 +35,6 @@ PALETTE = {
     "panel": (24, 24, 28),
 }
 
-HEX_SIZE = 45
 DOT_R = 9
 LINE_W = 2
 FPS = 60
@@ -27,10 +42,15 @@ FPS = 60
 PAN_STEP_SCR = 90
 ZOOM_STEP   = 1.12
 
-# Axial (pointy-top) — orden estándar
-NEI = [(1,0),(1,-1),(0,-1),(-1,0),(-1,1),(0,1)]
-SQRT3 = math.sqrt(3.0)
-APOTHEM = HEX_SIZE * SQRT3 / 2.0
+# Carga por partes de .json grandes: ms por cuadro dedicados a seguir leyendo
+LOAD_BUDGET_MS = 8
+# Con guardados en curso el bucle quieto despierta cada tantos ms para ver si terminaron
+BUSY_WAKE_MS = 50
+
+# "json" (por defecto) / "binary": un .json / .habb completo por guardado; "journal" (opcional): Save
+# agrega las ediciones a un .habj; "dedup": un .habm que sólo escribe los bloques de módulos nuevos
+SAVE_FORMAT = os.environ.get("HAB_SAVE_FORMAT", "json")
+FULL_SAVE_EXTS = {"json": ".json", "binary": BIN_EXT, "dedup": MANIFEST_EXT}
 
 # -------------------- Sprites --------------------
 SPRITE_MAP = {
@@ -47,6 +67,18 @@ def _find_first_existing(candidates):
         if os.path.exists(p2): return p2
     return None
 
+SPRITE_LRU_MAX = 16   # tamaños exactos fuera de la pirámide que se guardan
+
+def _zoom_levels(min_zoom, max_zoom, step=ZOOM_STEP):
+    """Zooms que alcanzan la rueda y los botones +/- partiendo de 1.0 o de un extremo."""
+    levels = set()
+    for start in (1.0, min_zoom, max_zoom):
+        z = start
+        while z <= max_zoom: levels.add(z); z *= step
+        z = start
+        while z >= min_zoom: levels.add(z); z *= 1 / step
+    return sorted(levels)
+
 def _tinted_copy(src, rgb):
     s = src.copy().convert_alpha()
     tint = pygame.Surface(s.get_size(), pygame.SRCALPHA)
@@ -54,49 +86,6 @@ def _tinted_copy(src, rgb):
     s.blit(tint, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
     return s
 
-# -------------------- Equipment --------------------
-ITEM_DEFS = [
-    {"name": "O2 Generator", "dE": -200, "dO2": +5,  "dW": 0,   "dF": 0,   "dC": 0, "dV": 0.2},
-    {"name": "Recycler",     "dE": -150, "dO2":  0,  "dW": -3,  "dF": 0,   "dC": 0, "dV": 0.3},
-    {"name": "Heater",       "dE": -100, "dO2":  0,  "dW": 0,   "dF": 0,   "dC": 0, "dV": 0.1},
-    {"name": "Hydroponics",  "dE": -250, "dO2": +2,  "dW": -1,  "dF": +2,  "dC": 0, "dV": 0.8},
-    {"name": "Crew Bunks",   "dE": -50,  "dO2":  0,  "dW": 0,   "dF": 0,   "dC": +2,"dV": 1.2},
-]
-ITEM_NAMES = [x["name"] for x in ITEM_DEFS]
-EMPTY_LABEL = "Empty"   # slot vacío
-
-MODULE_BASE = {
-    0: {"name": "Prefabricated", "volume": 60.2,  "crew": 0},
-    1: {"name": "Manufactured",  "volume": 116.75,"crew": 0},
-}
-
-# -------------------- Geometry --------------------
-def axial_to_world(q, r):
-    x = HEX_SIZE * SQRT3 * (q + r/2)
-    y = HEX_SIZE * 1.5 * r
-    return (x, y)
-
-def hex_points_world(center_w):
-    cx, cy = center_w
-    pts = []
-    for i in range(6):
-        ang = math.radians(60 * i - 30)   # pointy-top
-        pts.append((cx + HEX_SIZE * math.cos(ang),
-                    cy + HEX_SIZE * math.sin(ang)))
-    return pts
-
-def point_in_polygon(pt, poly):
-    x, y = pt
-    inside = False
-    n = len(poly)
-    for i in range(n):
-        x1, y1 = poly[i]
-        x2, y2 = poly[(i + 1) % n]
-        if (y1 > y) != (y2 > y):
-            xinters = (x2 - x1) * (y - y1) / (y2 - y1 + 1e-9) + x1
-            if x < xinters: inside = not inside
-    return inside
-
 # -------------------- Camera --------------------
 class Camera:
     def __init__(self, screen):
@@ -118,6 +107,15 @@ class Camera:
                 (s[1] - self.sh * 0.5) / self.zoom + self.pos[1])
     def apply_poly(self, poly_world):
         return [self.world_to_screen(p) for p in poly_world]
+    def visible_world_rect(self, pad=0.0):
+        """(x0, y0, x1, y1) del mundo que cubre la pantalla, ampliado `pad` unidades de mundo."""
+        x0, y0 = self.screen_to_world((0, 0))
+        x1, y1 = self.screen_to_world((self.sw, self.sh))
+        return (x0 - pad, y0 - pad, x1 + pad, y1 + pad)
+    def affine(self):
+        """(escala, ox, oy) tal que pantalla = mundo * escala + (ox, oy)."""
+        z = self.zoom
+        return z, self.sw * 0.5 - self.pos[0] * z, self.sh * 0.5 - self.pos[1] * z
     def zoom_at(self, mouse_screen, zf):
         before = self.screen_to_world(mouse_screen)
         self.zoom = max(self.min_zoom, min(self.max_zoom, self.zoom * zf))
@@ -125,35 +123,32 @@ class Camera:
         self.pos = (self.pos[0] + (before[0] - after[0]),
                     self.pos[1] + (before[1] - after[1]))
 
-# -------------------- Module --------------------
-class Modulo:
-    __slots__ = ("q","r","style","equip")
-    def __init__(self, q, r, style=0, equip=None):
-        self.q=q; self.r=r; self.style=style
-        # 6 slots, -1 = empty
-        self.equip = list(equip) if equip is not None else [-1]*6
-    def axial(self): return (self.q, self.r)
-    def neighbors_axial(self):
-        q, r = self.q, self.r
-        for dq, dr in NEI:
-            yield (q + dq, r + dr)
-
 # -------------------- World --------------------
 class Mundo:
-    def __init__(self, camera):
+    """Vista pygame de un Habitat: cámara, render, selección y paneles."""
+    def __init__(self, camera, habitat=None):
         self.cam = camera
         self.screen = camera.screen
-        self.modulos = {(0,0): Modulo(0, 0, style=0)}
-        self.base_ax = (0, 0)
+        self.hab = habitat if habitat is not None else Habitat()
+        # Componentes conexas al día con cada alta/baja: no se borra un módulo que corte el hábitat
+        self.conn = Connectivity(self.hab)
+        self._delete_ok = (None, None, True)   # (seleccionado, revisión, ¿se puede borrar?)
+        # Arrays contiguos para el render por lotes (se reconstruyen al editar)
+        self._batch_dirty = True
+        self._batch_styles = []
+        self._batch_centers = None
+        # Capa de hexes ya dibujada; se rehace sólo si cambian módulos o cámara
+        self._layer = None
+        self._layer_key = None
+        self._layer_dirty = True
         self.selected = None
+        self.hover = None
         self.green_dots_screen = []
         self.red_dot_screen = None
         self.style_next = 0
 
         # Sprites
         self.sprite_surface = {0: None, 1: None}
-        self.sprite_scaled  = {0: None, 1: None}
-        self._scaled_px = None
         for style in (0,1):
             path = _find_first_existing(SPRITE_MAP[style])
             if path and os.path.exists(path):
@@ -163,6 +158,11 @@ class Mundo:
             self.sprite_surface[1] = _tinted_copy(self.sprite_surface[0], PALETTE["built"])
         if self.sprite_surface[1] and not self.sprite_surface[0]:
             self.sprite_surface[0] = _tinted_copy(self.sprite_surface[1], PALETTE["prefab"])
+        # Pirámide de sprites ya escalados (px -> Surface) para cada paso de zoom
+        self._sprite_pyramid = {0: {}, 1: {}}
+        self._pyramid_px = []
+        self._sprite_lru = OrderedDict()   # (style, px) -> Surface
+        self._build_sprite_pyramid()
 
         # Style popup
         self.selecting_style = False
@@ -170,27 +170,59 @@ class Mundo:
         self.pref_rect = None
         self.built_rect = None
         self.pending_ax = None
-        self.font_popup = pygame.font.SysFont(None, 22)
-        self._pref_text = self.font_popup.render("Prefabricated", True, PALETTE["white"])
-        self._built_text = self.font_popup.render("Manufactured",  True, PALETTE["white"])
+        self.font_popup = get_font(None, 22)
+        self._pref_text = render_text(self.font_popup, "Prefabricated", PALETTE["white"])
+        self._built_text = render_text(self.font_popup, "Manufactured",  PALETTE["white"])
 
         # Equipment panel
         self.equip_open = False
         self.equip_rect = None
         self.equip_slot_rects = []
 
-        # Totals cache
-        self.totals = {"Energy":0,"O2":0,"Waste":0,"Food":0,"Crew":0,"Volume":0}
+    # ---- modelo ----
+    @property
+    def modulos(self): return self.hab.modulos
+    @property
+    def base_ax(self): return self.hab.base_ax
+    @property
+    def totals(self): return self.hab.totals
+
+    # ---- edición: único camino para tocar self.modulos ----
+    def _modules_changed(self):
+        self._batch_dirty = self._layer_dirty = True
+
+    def add_modulo(self, axial, style=0, equip=None):
+        self.hab.add_modulo(axial, style, equip); self._modules_changed()
+
+    def remove_modulo(self, axial):
+        self.hab.remove_modulo(axial); self._modules_changed()
+
+    def set_style(self, axial, style):
+        self.hab.set_style(axial, style); self._modules_changed()
+
+    def set_equip(self, axial, slot, item):
+        self.hab.set_equip(axial, slot, item)
+
+    def clear_modulos(self):
+        self.hab.clear(); self._modules_changed()
+
+    def load_modules(self, mods):
+        self.hab.load_modules(mods); self._modules_changed()
 
     # ---- helpers ----
     def center_world_of(self, axial): return axial_to_world(axial[0], axial[1])
     def poly_world_of(self, axial): return hex_points_world(self.center_world_of(axial))
 
     def pick_modulo(self, mouse_screen):
-        mw = self.cam.screen_to_world(mouse_screen)
-        for ax in self.modulos:
-            if point_in_polygon(mw, self.poly_world_of(ax)): return ax
-        return None
+        return self.modulo_at_world(self.cam.screen_to_world(mouse_screen))
+
+    def modulo_at_world(self, pw): return self.hab.modulo_at_world(pw)
+    def modulos_in_rect(self, x0, y0, x1, y1): return self.hab.modulos_in_rect(x0, y0, x1, y1)
+    def modulos_in_lasso(self, poly_world): return self.hab.modulos_in_lasso(poly_world)
+
+    def visible_axials(self):
+        """Módulos que tocan la pantalla: centro dentro del rect visible ampliado un radio."""
+        return self.modulos_in_rect(*self.cam.visible_world_rect(pad=HEX_SIZE))
 
     def refresh_dots(self):
         self.green_dots_screen.clear(); self.red_dot_screen = None
@@ -213,19 +245,28 @@ class Mundo:
         return None
 
     def place_with_style(self, axial, style):
-        if axial not in self.modulos: self.modulos[axial] = Modulo(axial[0], axial[1], style=style)
+        if axial not in self.modulos: self.add_modulo(axial, style)
         self.selected = axial
         self.refresh_dots()
         self.open_equip_panel()
-        self.recompute_totals()
+
+    def can_delete(self, axial):
+        """Se puede borrar todo menos la base y los módulos cuyo borrado parte el hábitat."""
+        if axial is None or axial == self.base_ax or axial not in self.modulos: return False
+        sel, rev, ok = self._delete_ok
+        if sel != axial or rev != self.hab.revision:
+            ok = not self.conn.would_split(axial)
+            self._delete_ok = (axial, self.hab.revision, ok)
+        return ok
 
     def try_delete_from_red(self, mouse_screen):
         if self.selected is None or self.red_dot_screen is None: return False
         if self.selected == self.base_ax: return False
         dx = mouse_screen[0] - self.red_dot_screen[0]; dy = mouse_screen[1] - self.red_dot_screen[1]
         if dx*dx + dy*dy <= DOT_R * DOT_R:
-            del self.modulos[self.selected]; self.selected = None
-            self.refresh_dots(); self.close_equip_panel(); self.recompute_totals(); return True
+            if not self.can_delete(self.selected): return True    # se come el click sin borrar
+            self.remove_modulo(self.selected); self.selected = None
+            self.refresh_dots(); self.close_equip_panel(); return True
         return False
 
     def try_place_from_green(self, mouse_screen):
@@ -248,17 +289,33 @@ class Mundo:
         self.screen = screen; self.refresh_dots()
         if self.selected: self.open_equip_panel()
 
-    def _get_scaled_sprite(self, style):
-        surf = self.sprite_surface.get(style)
-        if surf is None: return None
+    def _build_sprite_pyramid(self):
         # El sprite es cuadrado y cubre el diámetro del hex (2*HEX_SIZE)
+        sizes = {max(1, int(2 * HEX_SIZE * z)) for z in _zoom_levels(self.cam.min_zoom, self.cam.max_zoom)}
+        self._pyramid_px = sorted(sizes)
+        top = self._pyramid_px[-1]
+        for style, base in self.sprite_surface.items():
+            if base is None: continue
+            # un solo smoothscale desde la imagen original; el resto parte de ese nivel
+            master = pygame.transform.smoothscale(base, (top, top))
+            self._sprite_pyramid[style] = {px: master if px == top else pygame.transform.smoothscale(master, (px, px))
+                                           for px in self._pyramid_px}
+
+    def _get_scaled_sprite(self, style):
+        if self.sprite_surface.get(style) is None: return None
         target = max(1, int(2 * HEX_SIZE * self.cam.zoom))
-        if self._scaled_px != target:
-            for s in (0,1):
-                base = self.sprite_surface.get(s)
-                self.sprite_scaled[s] = pygame.transform.smoothscale(base, (target, target)) if base else None
-            self._scaled_px = target
-        return self.sprite_scaled.get(style)
+        spr = self._sprite_pyramid[style].get(target)
+        if spr is not None: return spr
+        key = (style, target)
+        spr = self._sprite_lru.get(key)
+        if spr is not None:
+            self._sprite_lru.move_to_end(key); return spr
+        # tamaño fuera de la pirámide: se parte del nivel más cercano por encima
+        # y se termina con un scale sin filtrado (barato), nunca con smoothscale
+        i = min(bisect.bisect_left(self._pyramid_px, target), len(self._pyramid_px) - 1)
+        spr = self._sprite_lru[key] = pygame.transform.scale(self._sprite_pyramid[style][self._pyramid_px[i]], (target, target))
+        if len(self._sprite_lru) > SPRITE_LRU_MAX: self._sprite_lru.popitem(last=False)
+        return spr
 
     # ----- style selector -----
     def open_style_selector(self, anchor_screen_pos):
@@ -317,37 +374,72 @@ class Mundo:
         self.equip_slot_rects = []
 
     # ----- totals -----
-    def recompute_totals(self):
-        tE=tO2=tW=tF=tC=tV=0.0
-        for (q,r), m in self.modulos.items():
-            base = MODULE_BASE[m.style]
-            tV += base["volume"]; tC += base["crew"]
-            for idx in m.equip:
-                if idx < 0:   # empty
-                    continue
-                item = ITEM_DEFS[idx]
-                tE += item["dE"]; tO2 += item["dO2"]; tW += item["dW"]; tF += item["dF"]; tC += item["dC"]; tV += item["dV"]
-        self.totals = {
-            "Energy": tE, "O2": tO2, "Waste": tW, "Food": tF, "Crew": tC, "Volume": tV
-        }
+    def recompute_totals(self): return self.hab.recompute_totals()
+    def verify_totals(self, rel_tol=1e-9, abs_tol=1e-6): return self.hab.verify_totals(rel_tol, abs_tol)
 
     # ---- Draw ----
+    @Perfil.timed("world.batch")
+    def _rebuild_batch(self):
+        # mismo orden que las filas del almacén: el índice del lote es store.row_of
+        store = self.modulos
+        self._batch_styles = store.style.tolist()
+        if NUMPY_AVAILABLE:
+            q, r, _, _ = store.columns()
+            self._batch_centers = np.column_stack((HEX_SIZE * SQRT3 * (q + r / 2), HEX_SIZE * 1.5 * r))
+        else:
+            self._batch_centers = [axial_to_world(q, r) for q, r in store]
+        self._batch_dirty = False
+
+    def screen_geometry(self, axials=None):
+        """Estilos, centros (enteros) y polígonos en pantalla de `axials` (todos si None), en un solo paso."""
+        if self._batch_dirty: self._rebuild_batch()
+        if axials is None:
+            idx = None; styles = self._batch_styles
+        else:
+            row_of = self.modulos.row_of
+            idx = [row_of(q, r) for q, r in axials]
+            styles = [self._batch_styles[i] for i in idx]
+        z, ox, oy = self.cam.affine()
+        if NUMPY_AVAILABLE:
+            world = self._batch_centers if idx is None else self._batch_centers[idx]
+            centers = world * z + (ox, oy)
+            polys = centers[:, None, :] + np.array(HEX_CORNERS) * z
+            return styles, centers.astype(int).tolist(), polys.tolist()
+        world = self._batch_centers if idx is None else [self._batch_centers[i] for i in idx]
+        corners = [(dx * z, dy * z) for dx, dy in HEX_CORNERS]
+        centers = [(x * z + ox, y * z + oy) for x, y in world]
+        polys = [[(cx + dx, cy + dy) for dx, dy in corners] for cx, cy in centers]
+        return styles, [(int(cx), int(cy)) for cx, cy in centers], polys
+
+    def _draw_modules(self, surf):
+        surf.fill(PALETTE["bg"])
+        # modules: sólo los visibles, una transformación para todos, sprites en un solo blits()
+        styles, centers, polys = self.screen_geometry(self.visible_axials())
+        sprites = {0: self._get_scaled_sprite(0), 1: self._get_scaled_sprite(1)}
+        if sprites[0] and sprites[1]:
+            half = sprites[0].get_width() // 2
+            surf.blits([(sprites[st], (cx - half, cy - half))
+                        for st, (cx, cy) in zip(styles, centers)], False)
+        else:
+            for st, poly_s in zip(styles, polys):
+                pygame.draw.polygon(surf, PALETTE["prefab"] if st == 0 else PALETTE["built"], poly_s)
+        for poly_s in polys:
+            pygame.draw.polygon(surf, PALETTE["stroke"], poly_s, LINE_W)
+
     def draw(self):
         surf = self.screen
-        surf.fill(PALETTE["bg"])
-        # modules
-        for ax, mod in self.modulos.items():
-            poly_s = self.cam.apply_poly(self.poly_world_of(ax))
-            spr = self._get_scaled_sprite(mod.style)
-            if spr:
-                cx, cy = self.cam.world_to_screen(self.center_world_of(ax))
-                rect = spr.get_rect(center=(int(cx), int(cy)))
-                surf.blit(spr, rect)
-                pygame.draw.polygon(surf, PALETTE["stroke"], poly_s, LINE_W)
-            else:
-                color = PALETTE["prefab"] if mod.style == 0 else PALETTE["built"]
-                pygame.draw.polygon(surf, color, poly_s)
-                pygame.draw.polygon(surf, PALETTE["stroke"], poly_s, LINE_W)
+        # capa estática: entre ediciones y movimientos de cámara es un solo blit
+        key = (self.cam.zoom, self.cam.pos, surf.get_size())
+        if self._layer_dirty or self._layer_key != key:
+            if self._layer is None or self._layer.get_size() != surf.get_size():
+                self._layer = pygame.Surface(surf.get_size())
+            self._draw_modules(self._layer)
+            self._layer_key = key; self._layer_dirty = False
+        surf.blit(self._layer, (0, 0))
+
+        # hover
+        if self.hover is not None and self.hover in self.modulos:
+            pygame.draw.polygon(surf, PALETTE["ui_border"], self.cam.apply_poly(self.poly_world_of(self.hover)), LINE_W)
 
         # dots
         if self.selected is not None:
@@ -356,9 +448,13 @@ class Mundo:
                 pygame.draw.circle(surf, PALETTE["white"], (int(pos_s[0]), int(pos_s[1])), DOT_R, 2)
             if self.selected != self.base_ax and self.red_dot_screen is not None:
                 rx, ry = self.red_dot_screen
-                pygame.draw.circle(surf, PALETTE["red"], (int(rx), int(ry)), DOT_R)
+                # gris: borrarlo dejaría módulos separados de la base
+                color = PALETTE["red"] if self.can_delete(self.selected) else PALETTE["ui_border"]
+                pygame.draw.circle(surf, color, (int(rx), int(ry)), DOT_R)
                 pygame.draw.circle(surf, PALETTE["white"], (int(rx), int(ry)), DOT_R, 2)
 
+        Perfil.mark("world")
+
         # style popup
         if self.selecting_style and self.selector_rect:
             pygame.draw.rect(surf, PALETTE["ui"], self.selector_rect, border_radius=10)
@@ -372,7 +468,7 @@ class Mundo:
         if self.equip_open and self.equip_rect and self.selected:
             pygame.draw.rect(surf, PALETTE["ui"], self.equip_rect, border_radius=10)
             pygame.draw.rect(surf, PALETTE["ui_border"], self.equip_rect, 2, border_radius=10)
-            title = pygame.font.SysFont(None, 22).render("Equipment", True, PALETTE["white"])
+            title = render_text(self.font_popup, "Equipment", PALETTE["white"])
             surf.blit(title, (self.equip_rect.x + 10, self.equip_rect.y + 6))
 
             for idx, al, ar, label, cell in self.equip_slot_rects:
@@ -386,36 +482,30 @@ class Mundo:
                 mod = self.modulos[self.selected]
                 cur = mod.equip[idx]
                 text = EMPTY_LABEL if cur < 0 else ITEM_NAMES[cur % len(ITEM_DEFS)]
-                lab = pygame.font.SysFont(None, 22).render(text, True, PALETTE["white"])
+                lab = render_text(self.font_popup, text, PALETTE["white"])
                 surf.blit(lab, lab.get_rect(center=label.center))
 
         # totals panel (left)
         self.draw_totals_panel()
+        Perfil.mark("panels")
 
     def draw_totals_panel(self):
-        self.recompute_totals()
         pad = 12
         w = 220
         x = 12; y = 60
-        lines = [
-            ("Energy", f"{self.totals['Energy']:.0f} W"),
-            ("O2",     f"{self.totals['O2']:.2f} kg/day"),
-            ("Waste",  f"{self.totals['Waste']:.2f} kg/day"),
-            ("Food",   f"{self.totals['Food']:.2f} kg/day"),
-            ("Crew",   f"{int(self.totals['Crew'])}"),
-            ("Volume", f"{self.totals['Volume']:.2f} m³"),
-        ]
+        # una línea por columna del catálogo, con su formato y unidad
+        lines = [(k, format_total(k, self.totals[k])) for k in TOTAL_KEYS]
         h = 28 + len(lines)*(24+6) + pad
         rect = pygame.Rect(x, y, w, h)
         pygame.draw.rect(self.screen, PALETTE["panel"], rect, border_radius=10)
         pygame.draw.rect(self.screen, PALETTE["ui_border"], rect, 2, border_radius=10)
-        ftitle = pygame.font.SysFont(None, 22)
-        fline  = pygame.font.SysFont(None, 20)
-        self.screen.blit(ftitle.render("Totals", True, PALETTE["white"]), (x+pad, y+pad))
+        ftitle = get_font(None, 22)
+        fline  = get_font(None, 20)
+        self.screen.blit(render_text(ftitle, "Totals", PALETTE["white"]), (x+pad, y+pad))
         yy = y + pad + 22
         for k,v in lines:
             txt = f"{k}: {v}"
-            self.screen.blit(fline.render(txt, True, PALETTE["white"]), (x+pad, yy))
+            self.screen.blit(render_text(fline, txt, PALETTE["white"]), (x+pad, yy))
             yy += 24
 
 # -------------------- App base --------------------
@@ -478,28 +568,57 @@ def _draw_nav_grid(screen, rects):
     _draw_arrow(screen, left, "left"); _draw_arrow(screen, right, "right")
 
 # -------------------- Save/Load --------------------
-def save_configuration(world, cam, save_dir="saves"):
-    os.makedirs(save_dir, exist_ok=True)
-    data = {
-        "version": 1,
-        "camera": {"pos": list(cam.pos), "zoom": cam.zoom},
-        "modules": [
-            {"q": q, "r": r, "style": m.style, "equip": list(m.equip)}
-            for (q,r), m in world.modulos.items()
-        ],
-        "totals": world.totals,
-        "timestamp": time.time(),
-    }
-    fname = time.strftime("habitat_%Y%m%d_%H%M%S.json")
-    path = os.path.join(save_dir, fname)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+def _unique_save_path(save_dir, ext):
+    # dos guardados en el mismo segundo no se pisan: habitat_..._2.json, _3, ...
+    stem = os.path.join(save_dir, time.strftime("habitat_%Y%m%d_%H%M%S"))
+    path = stem + ext; n = 2
+    while os.path.exists(path):
+        path = f"{stem}_{n}{ext}"; n += 1
     return path
 
-def apply_config(world, cam, cfg: dict):
-    """Aplica una configuración (dict) a mundo+cámara."""
-    # cámara
-    cam_data = cfg.get("camera", {})
+def _camera_dict(cam):
+    return {"pos": list(cam.pos), "zoom": cam.zoom}
+
+def _submit_or_run(job, worker):
+    # con worker el trabajo corre en su hilo (el resultado sale por worker.poll()) y esto devuelve None
+    if worker is None: return job()
+    worker.submit(job)
+
+def _report_saves(results):
+    for ok, res, tag in results:
+        if ok: print(f"{'Autosaved' if tag == 'autosave' else 'Saved'} to: {res}")
+        else: print(f"{tag} failed: {type(res).__name__}: {res}")
+
+def _save_full(world, cam, save_dir, worker, ext):
+    """Save completo en un archivo nuevo de `save_dir`; write_save elige el formato por `ext`."""
+    snap = world.hab.snapshot() if worker is not None else world.hab
+    camera = _camera_dict(cam); ts = time.time()
+    def job():
+        os.makedirs(save_dir, exist_ok=True)
+        path = _unique_save_path(save_dir, ext)
+        write_save(snap, path, camera=camera, timestamp=ts)
+        return path
+    return _submit_or_run(job, worker)
+
+def save_configuration(world, cam, save_dir="saves", worker=None):
+    return _save_full(world, cam, save_dir, worker, ".json")
+
+def save_journal(world, cam, save_dir="saves", worker=None):
+    """Agrega las ediciones desde el último guardado al .habj de la sesión (lo crea si hace falta)."""
+    hab = world.hab
+    if hab.journal is None:
+        os.makedirs(save_dir, exist_ok=True)
+        hab.journal = EditJournal(_unique_save_path(save_dir, JOURNAL_EXT))
+    journal = hab.journal; camera = _camera_dict(cam); ts = time.time()
+    snap = hab.snapshot() if worker is not None else hab
+    batch = journal.take()        # lo editado después de este punto va al próximo guardado
+    def job():
+        journal.flush(snap, camera=camera, timestamp=ts, batch=batch)
+        return journal.path
+    return _submit_or_run(job, worker)
+
+def apply_camera(cam, cam_data):
+    cam_data = cam_data or {}
     pos = cam_data.get("pos")
     zoom = cam_data.get("zoom")
     if isinstance(pos, (list, tuple)) and len(pos)==2:
@@ -507,44 +626,61 @@ def apply_config(world, cam, cfg: dict):
     if isinstance(zoom, (int, float)) and zoom > 0:
         cam.zoom = float(zoom)
 
+def apply_config(world, cam, cfg: dict):
+    """Aplica una configuración (dict) a mundo+cámara."""
+    # cámara
+    apply_camera(cam, cfg.get("camera", {}))
+
     # módulos
-    world.modulos.clear()
-    mods = cfg.get("modules", [])
-    if not mods:
-        world.modulos[(0,0)] = Modulo(0,0,style=0)
-    else:
-        for m in mods:
-            q = int(m.get("q",0)); r = int(m.get("r",0))
-            st = int(m.get("style",0))
-            eq = m.get("equip", None)
-            if eq is None: equip = [-1]*6
-            else:
-                equip = [int(x) if int(x)>=0 else -1 for x in list(eq)[:6]]
-                equip += [-1]*(6-len(equip))
-            world.modulos[(q,r)] = Modulo(q,r,style=st,equip=equip)
+    world.load_modules(cfg.get("modules", []))
 
     world.selected = None
     world.refresh_dots()
-    world.recompute_totals()
+    _warn_detached(world)
+
+def _warn_detached(world):
+    n = world.conn.detached()
+    if n: print(f"Warning: {n} module(s) not connected to the base ({world.conn.component_count()} components)")
 
 # -------------------- Main screen --------------------
 def modulos_screen(screen, config=None):
     """
     screen: pygame.Surface (ventana)
-    config: None | dict | str(ruta .json)
+    config: None | dict | str(ruta de un save) | (Habitat, cámara) ya cargado (p. ej. precargado por Saves)
     """
-    clock = pygame.time.Clock()
+    sched = Redibujo.Scheduler(FPS)
     cam = Camera(screen)
-    world = Mundo(cam)
 
     # carga inicial opcional
-    if isinstance(config, str) and os.path.exists(config):
-        with open(config, "r", encoding="utf-8") as f:
-            cfg = json.load(f)
-        apply_config(world, cam, cfg)
-    elif isinstance(config, dict):
-        apply_config(world, cam, config)
-    # else: queda un solo módulo base
+    loader = None
+    if isinstance(config, str) and os.path.exists(config) and config.lower().endswith(".json"):
+        # .json por lotes: el editor arranca con el primer lote y el resto se lee entre
+        # cuadros; hasta que termina se puede mover la cámara pero no editar
+        def on_field(key, value):
+            if key == "camera": apply_camera(cam, value)
+        hab = Habitat()
+        loader = StreamLoader(config, hab, on_field=on_field)
+        while loader.step() and not loader.loaded: pass
+        world = Mundo(cam, hab)
+        world.refresh_dots()
+    elif isinstance(config, tuple):
+        hab, camera = config[:2]
+        world = Mundo(cam, hab)
+        apply_camera(cam, camera)
+        world.refresh_dots()
+        _warn_detached(world)
+    elif isinstance(config, str) and os.path.exists(config):
+        # .habj / .habb; un diario queda enganchado y los Save siguen agregando a él
+        hab, camera, _ = load_save(config, editable=True)
+        world = Mundo(cam, hab)
+        apply_camera(cam, camera)
+        world.refresh_dots()
+        _warn_detached(world)
+    else:
+        world = Mundo(cam)
+        if isinstance(config, dict):
+            apply_config(world, cam, config)
+        # else: queda un solo módulo base
 
     sw, sh = screen.get_size()
     btn_h = max(36, int(sh * 0.06))
@@ -555,14 +691,41 @@ def modulos_screen(screen, config=None):
 
     nav_rects = _make_nav_buttons(sw, sh)
 
-    font_title = pygame.font.SysFont(None, 32)
-    font_button = pygame.font.SysFont(None, 26)
+    font_title = get_font(None, 32)
+    font_button = get_font(None, 26)
+
+    # guardados fuera del hilo de la UI + autoguardado en saves/autosave
+    save_dir = os.path.join(os.path.dirname(__file__), "saves")
+    worker = SaveWorker()
+    autosaver = Autosaver(worker, os.path.join(save_dir, AUTOSAVE_DIR))
+    saving = 0
+    prof = Perfil.start("modulos")
 
     running = True
     while running:
-        for e in pygame.event.get():
+        # quieto: duerme hasta un evento; con guardados en curso despierta seguido para verlos terminar
+        events = sched.events(timeout=BUSY_WAKE_MS if worker.busy else None)
+        prof.begin_frame()
+        if loader is not None:
+            t_end = time.perf_counter() + LOAD_BUDGET_MS / 1000; before = loader.loaded
+            while loader.step() and time.perf_counter() < t_end: pass
+            if loader.loaded != before:
+                world._modules_changed(); world.refresh_dots()
+            if loader.done:
+                loader = None; autosaver.mark_saved(world.hab); _warn_detached(world)
+        else:
+            autosaver.tick(world.hab, _camera_dict(cam))
+        sched.animate(loader is not None)       # la barra de carga avanza sin eventos
+        results = worker.poll()
+        autosaver.finished(results); _report_saves(results)
+        if results: sched.mark_dirty()
+        saving -= sum(tag == "save" for _, _, tag in results)
+        prof.mark("background")
+
+        for e in events:
+            if prof.handle_event(e): continue
             if e.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                _report_saves(worker.close()); prof.close(); pygame.quit(); sys.exit()
             elif e.type == pygame.VIDEORESIZE:
                 screen = pygame.display.get_surface()
                 cam.set_screen(screen); world.set_screen(screen)
@@ -585,8 +748,10 @@ def modulos_screen(screen, config=None):
                     back_rect = pygame.Rect(sw - btn_w - pad, sh - btn_h - pad, btn_w, btn_h)
                     save_rect = pygame.Rect(back_rect.left - gap - btn_w, sh - btn_h - pad, btn_w, btn_h)
                     nav_rects = _make_nav_buttons(sw, sh)
-                elif e.key == pygame.K_r and world.selected is not None:
-                    world.modulos[world.selected].style ^= 1; world.recompute_totals()
+                elif e.key == pygame.K_r and world.selected is not None and loader is None:
+                    world.set_style(world.selected, world.modulos[world.selected].style ^ 1)
+            elif e.type == pygame.MOUSEMOTION:
+                world.hover = world.pick_modulo(e.pos)
             elif e.type == pygame.MOUSEWHEEL:
                 cam.zoom_at(pygame.mouse.get_pos(), ZOOM_STEP if e.y>0 else 1/ZOOM_STEP)
                 world.refresh_dots()
@@ -604,12 +769,19 @@ def modulos_screen(screen, config=None):
 
                 # save/back
                 if save_rect.collidepoint(mouse):
-                    path = save_configuration(world, cam, save_dir=os.path.join(os.path.dirname(__file__), "saves"))
-                    print(f"Saved to: {path}")
+                    if loader is not None:
+                        loader.run(); loader = None     # no guardar un hábitat a medio cargar
+                        world._modules_changed(); world.refresh_dots()
+                    if SAVE_FORMAT == "journal": save_journal(world, cam, save_dir=save_dir, worker=worker)
+                    else: _save_full(world, cam, save_dir, worker, FULL_SAVE_EXTS.get(SAVE_FORMAT, ".json"))
+                    autosaver.mark_saved(world.hab); saving += 1
                     continue
                 if back_rect.collidepoint(mouse):
                     running = False
                     continue
+                # mientras llegan lotes del .json sólo se navega: un lote posterior pisaría
+                # lo editado (extend_modules reemplaza coordenadas repetidas)
+                if loader is not None: continue
 
                 # style popup
                 if world.selecting_style and world.selector_rect and world.selector_rect.collidepoint(mouse):
@@ -624,21 +796,15 @@ def modulos_screen(screen, config=None):
                 # equipment arrows
                 if world.equip_open and world.equip_rect and world.equip_rect.collidepoint(mouse) and world.selected:
                     mod = world.modulos[world.selected]
-                    changed = False
                     for idx, al, ar, label, cell in world.equip_slot_rects:
                         if al.collidepoint(mouse):
                             # step left: …, 1,0,-1  (wrap)
                             cur = mod.equip[idx]
-                            cur = len(ITEM_DEFS)-1 if cur==-1 else cur-1
-                            mod.equip[idx] = cur
-                            changed = True
+                            world.set_equip(world.selected, idx, len(ITEM_DEFS)-1 if cur==-1 else cur-1)
                         elif ar.collidepoint(mouse):
                             # step right: -1,0,1,…
                             cur = mod.equip[idx]
-                            cur = -1 if cur==len(ITEM_DEFS)-1 else cur+1
-                            mod.equip[idx] = cur
-                            changed = True
-                    if changed: world.recompute_totals()
+                            world.set_equip(world.selected, idx, -1 if cur==len(ITEM_DEFS)-1 else cur+1)
                     continue
 
                 # place/delete/select
@@ -648,6 +814,8 @@ def modulos_screen(screen, config=None):
                     pass
                 else:
                     world.select_or_toggle(mouse)
+        prof.mark("events")
+        if not sched.frame(): continue
 
         world.draw()
 
@@ -655,23 +823,31 @@ def modulos_screen(screen, config=None):
         sw, sh = screen.get_size()
         count = len(world.modulos)
         txt = f'Modules: {count}'
-        txt_surf = font_title.render(txt, True, PALETTE['white'])
+        if loader is not None: txt += f'  (loading {loader.fraction:.0%})'
+        elif saving: txt += '  (saving...)'
+        if loader is None and world.conn.detached(): txt += f'  ({world.conn.detached()} detached)'
+        txt_surf = render_text(font_title, txt, PALETTE['white'])
         screen.blit(txt_surf, txt_surf.get_rect(center=(sw//2, 20 + txt_surf.get_height()//2)))
 
         # save/back
         pygame.draw.rect(screen, PALETTE['ui'], save_rect, border_radius=8)
         pygame.draw.rect(screen, PALETTE['ui_border'], save_rect.inflate(6,6), 3, border_radius=10)
-        lab = font_button.render('Save', True, PALETTE['white']); screen.blit(lab, lab.get_rect(center=save_rect.center))
+        lab = render_text(font_button, 'Save', PALETTE['white']); screen.blit(lab, lab.get_rect(center=save_rect.center))
         pygame.draw.rect(screen, PALETTE['ui'], back_rect, border_radius=8)
         pygame.draw.rect(screen, PALETTE['ui_border'], back_rect.inflate(6,6), 3, border_radius=10)
-        lab2 = font_button.render('Back', True, PALETTE['white']); screen.blit(lab2, lab2.get_rect(center=back_rect.center))
+        lab2 = render_text(font_button, 'Back', PALETTE['white']); screen.blit(lab2, lab2.get_rect(center=back_rect.center))
 
         # nav grid (usa los mismos rects que manejan clicks)
         _draw_nav_grid(screen, nav_rects)
+        prof.mark("hud")
+        prof.draw(screen)
 
         pygame.display.flip()
-        clock.tick(FPS)
+        prof.end_frame()
 
+    # al salir se espera a que terminen los guardados encolados
+    _report_saves(worker.close())
+    prof.close()
     return
 
 # Ejecutable directo (prueba)
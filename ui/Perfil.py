@@ -0,0 +1,225 @@
+# ui/Perfil.py
+"""Perfilador de cuadros opcional para las pantallas pygame (HAB_PROFILE=1).
+
+Cada cuadro se parte en fases por marcas de vuelta: mark("events") cierra la
+fase que empezó en la marca anterior (o en begin_frame). Encima se dibuja un
+panel con p50 / p99 por fase y el gráfico de los últimos cuadros (F3 lo
+oculta), y al cerrar la pantalla se escribe un CSV con un renglón por cuadro.
+
+    prof = Perfil.start("modulos")
+    while running:
+        prof.begin_frame()
+        ...eventos...;          prof.mark("events")
+        ...dibujo...;           prof.mark("world")
+        prof.draw(screen)
+        pygame.display.flip();  prof.end_frame()
+    prof.close()
+
+Para caminos calientes sueltos: `with Perfil.phase("rebuild"):` o el
+decorador `@Perfil.timed("world.batch")`; se suman al cuadro en curso como
+columnas aparte (no forman parte de la suma de fases). Apagado, start()
+devuelve un perfilador nulo, phase() un contexto vacío compartido y timed()
+deja la función sin envolver: el costo es unas llamadas vacías por cuadro.
+"""
+import os, csv, time, functools
+from collections import deque
+import pygame
+
+from ui.Fuentes import get_font
+
+__all__ = ["ENABLED", "PROFILE_DIR", "FrameProfiler", "start", "mark", "phase", "timed"]
+
+ENABLED = os.environ.get("HAB_PROFILE") == "1"
+PROFILE_DIR = os.environ.get("HAB_PROFILE_DIR", os.path.join(os.path.dirname(__file__), "profiles"))
+WINDOW = 240                # cuadros en las estadísticas y el gráfico
+REFRESH = 15                # cuadros entre actualizaciones del texto del panel
+BUDGET_MS = 1000.0 / 60     # línea de referencia del gráfico
+
+_now = time.perf_counter
+
+def _pct(sorted_vals, p):
+    if not sorted_vals: return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(p * len(sorted_vals)))]
+
+# -------------------- activo / nulo --------------------
+class _NullContext:
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+_NULL_CTX = _NullContext()
+
+class _NullProfiler:
+    """Lo que devuelve start() con el perfilador apagado: todo es no-op."""
+    enabled = False
+    def begin_frame(self): pass
+    def mark(self, name): pass
+    def add(self, name, dt): pass
+    def phase(self, name): return _NULL_CTX
+    def handle_event(self, e): return False
+    def draw(self, surf): pass
+    def end_frame(self): pass
+    def close(self): return None
+
+_NULL = _NullProfiler()
+_active = _NULL
+_stack = []
+
+class _Phase:
+    __slots__ = ("prof", "name", "t0")
+    def __init__(self, prof, name): self.prof = prof; self.name = name
+    def __enter__(self):
+        self.t0 = _now(); return self
+    def __exit__(self, *exc):
+        self.prof.add(self.name, _now() - self.t0); return False
+
+class FrameProfiler:
+    """Tiempos por fase de cada cuadro de una pantalla, con panel y CSV."""
+    enabled = True
+
+    def __init__(self, screen_name, window=WINDOW, out_dir=PROFILE_DIR):
+        self.screen_name = screen_name; self.out_dir = out_dir
+        self.window = window
+        self.visible = True
+        self.names = []                  # fases y tiempos sueltos, en orden de aparición
+        self.hist = {}                   # nombre -> deque de ms
+        self.frame_ms = deque(maxlen=window)
+        self.rows = []                   # (cuadro, inicio s, total ms, idle ms, {nombre: ms})
+        self._cur = {}
+        self._t0 = self._last = None
+        self._prev_end = None; self._idle = 0.0
+        self._start = _now()
+        self._panel = None; self._panel_age = REFRESH
+
+    # ---- medición ----
+    def begin_frame(self):
+        t = _now()
+        self._idle = (t - self._prev_end) * 1000 if self._prev_end is not None else 0.0
+        self._t0 = self._last = t; self._cur = {}
+
+    def add(self, name, dt):
+        if self._t0 is None: return
+        cur = self._cur
+        cur[name] = cur.get(name, 0.0) + dt * 1000
+
+    def mark(self, name):
+        t = _now()
+        if self._last is None: return
+        self.add(name, t - self._last); self._last = t
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def end_frame(self, name="flip"):
+        if self._t0 is None: return
+        self.mark(name)
+        t = self._prev_end = _now()
+        total = (t - self._t0) * 1000
+        for k, v in self._cur.items():
+            h = self.hist.get(k)
+            if h is None:
+                h = self.hist[k] = deque(maxlen=self.window); self.names.append(k)
+            h.append(v)
+        self.frame_ms.append(total)
+        self.rows.append((len(self.rows), self._t0 - self._start, total, self._idle, self._cur))
+        self._t0 = None
+
+    # ---- panel ----
+    def handle_event(self, e):
+        """F3 muestra / oculta el panel; devuelve True si consumió el evento."""
+        if e.type == pygame.KEYDOWN and e.key == pygame.K_F3:
+            self.visible = not self.visible; return True
+        return False
+
+    def stats(self):
+        """{nombre: (p50, p99)} en ms sobre la ventana, más "frame" para el cuadro entero."""
+        out = {}
+        for k in self.names:
+            vals = sorted(self.hist[k]); out[k] = (_pct(vals, 0.50), _pct(vals, 0.99))
+        vals = sorted(self.frame_ms); out["frame"] = (_pct(vals, 0.50), _pct(vals, 0.99))
+        return out
+
+    def _build_panel(self):
+        font = get_font(None, 18)
+        lines = [f"{self.screen_name}  p50 / p99 ms"]
+        for k, (p50, p99) in self.stats().items():
+            lines.append(f"{k:<14}{p50:7.2f}{p99:8.2f}")
+        # font.render directo: estos textos cambian siempre y no van a la caché compartida
+        texts = [font.render(s, True, (240, 240, 240)) for s in lines]
+        gw, gh = 220, 60
+        w = max(gw, max(t.get_width() for t in texts)) + 16
+        h = sum(t.get_height() for t in texts) + gh + 24
+        panel = pygame.Surface((w, h), pygame.SRCALPHA)
+        panel.fill((10, 10, 14, 200))
+        y = 6
+        for t in texts:
+            panel.blit(t, (8, y)); y += t.get_height()
+        self._graph_rect = pygame.Rect(8, y + 8, w - 16, gh)
+        self._panel = panel
+
+    def draw(self, surf):
+        if not self.visible or not self.frame_ms: return
+        t = _now()
+        self._panel_age += 1
+        if self._panel is None or self._panel_age >= REFRESH:
+            self._build_panel(); self._panel_age = 0
+        x0 = surf.get_width() - self._panel.get_width() - 8
+        surf.blit(self._panel, (x0, 8))
+        # gráfico de tiempos de cuadro: se redibuja siempre (es una polilínea)
+        g = self._graph_rect.move(x0, 8)
+        top = max(BUDGET_MS * 2, max(self.frame_ms))
+        pygame.draw.rect(surf, (90, 90, 100), g, 1)
+        yb = g.bottom - int(g.h * BUDGET_MS / top)
+        pygame.draw.line(surf, (220, 60, 60), (g.left, yb), (g.right - 1, yb))
+        n = len(self.frame_ms)
+        if n > 1:
+            pts = [(g.left + i * (g.w - 1) // (self.window - 1), g.bottom - 1 - int((g.h - 2) * v / top))
+                   for i, v in enumerate(self.frame_ms)]
+            pygame.draw.lines(surf, (30, 200, 90), False, pts)
+        self.add("profiler", _now() - t); self._last = _now()   # el panel no se cuenta en la fase anterior
+
+    # ---- CSV ----
+    def close(self):
+        """Escribe el CSV de la sesión y devuelve su ruta (None si no hubo cuadros)."""
+        global _active
+        if _active is self:
+            _active = _stack.pop() if _stack else _NULL
+        if not self.rows: return None
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, time.strftime(f"profile_{self.screen_name}_%Y%m%d_%H%M%S.csv"))
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["frame", "start_s", "frame_ms", "idle_ms"] + self.names)
+            for i, t0, total, idle, cur in self.rows:
+                w.writerow([i, f"{t0:.4f}", f"{total:.3f}", f"{idle:.3f}"] + [f"{cur.get(k, 0.0):.3f}" for k in self.names])
+        self.rows = []
+        print(f"Frame profile: {path}")
+        return path
+
+# -------------------- API de módulo --------------------
+def start(screen_name):
+    """Perfilador de la pantalla `screen_name` (nulo si HAB_PROFILE no está activo)."""
+    global _active
+    if not ENABLED: return _NULL
+    _stack.append(_active)
+    _active = FrameProfiler(screen_name)
+    return _active
+
+def mark(name):
+    """Marca de fase sobre el perfilador activo (para código sin acceso a él, p. ej. Mundo.draw)."""
+    _active.mark(name)
+
+def phase(name):
+    """Contexto que suma su duración a `name` en el cuadro en curso."""
+    return _active.phase(name)
+
+def timed(name):
+    """Decorador: como phase(name) alrededor de cada llamada. Apagado, no envuelve nada."""
+    def deco(fn):
+        if not ENABLED: return fn
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _active.phase(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
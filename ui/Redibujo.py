@@ -0,0 +1,82 @@
+# ui/Redibujo.py
+"""Redibujo por eventos: las pantallas sólo dibujan cuando algo cambió.
+
+Con la pantalla quieta el bucle duerme en pygame.event.wait(timeout) en lugar
+de redibujar y hacer flip a FPS fijos. Cualquier evento (entrada, cambio de
+tamaño, ventana expuesta) o una marca explícita con mark_dirty() pide el
+próximo cuadro. Lo que se mueve solo (el GIF del menú, una carga por lotes)
+va en modo animación: mientras dure se dibuja a `fps` como antes.
+
+    sched = Redibujo.Scheduler(fps=60)
+    while running:
+        for e in sched.events(): ...
+        if not sched.frame(): continue     # nada cambió: no se dibuja
+        ...dibujo...
+        pygame.display.flip()
+
+El timeout despierta el bucle aunque no haya eventos, para el trabajo de
+fondo (resultados de guardados, autoguardado). HAB_REDRAW=always vuelve al
+redibujo continuo (para comparar consumo).
+"""
+import os
+import pygame
+
+__all__ = ["ALWAYS", "IDLE_TIMEOUT_MS", "Scheduler"]
+
+ALWAYS = os.environ.get("HAB_REDRAW") == "always"
+IDLE_TIMEOUT_MS = 500       # despertar sin eventos como mucho cada tanto
+
+class Scheduler:
+    """Decide si el cuadro se dibuja y cuánto dormir entre cuadros."""
+    def __init__(self, fps=60, idle_timeout=IDLE_TIMEOUT_MS):
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.clock = pygame.time.Clock()
+        self.dirty = True            # el primer cuadro siempre se dibuja
+        self.animating = False
+        self.dt = 0                  # ms desde la vuelta anterior (como clock.tick)
+        self._anim_until = 0
+        self._last_frame = 0
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def animate(self, on=True):
+        """Modo animación: se dibuja cada cuadro a `fps` hasta animate(False)."""
+        self.animating = on
+
+    def animate_for(self, ms):
+        """Modo animación por `ms` milisegundos (transiciones cortas)."""
+        self._anim_until = max(self._anim_until, pygame.time.get_ticks() + ms)
+
+    @property
+    def active(self):
+        return ALWAYS or self.dirty or self.animating or pygame.time.get_ticks() < self._anim_until
+
+    def events(self, timeout=None):
+        """Eventos pendientes; si no hay nada que dibujar, bloquea hasta el próximo (o `timeout` ms).
+
+        Cualquier evento marca la pantalla como sucia.
+        """
+        if self.active:
+            self.dt = self.clock.tick(self.fps)
+            evs = pygame.event.get()
+        else:
+            e = pygame.event.wait(self.idle_timeout if timeout is None else timeout)
+            evs = [] if e.type == pygame.NOEVENT else [e]
+            if evs:
+                # no dibujar más rápido que `fps`: se espera el resto del cuadro y se juntan
+                # los eventos que lleguen mientras tanto (p. ej. ráfagas de MOUSEMOTION)
+                rest = 1000 // self.fps - (pygame.time.get_ticks() - self._last_frame)
+                if rest > 0: pygame.time.wait(rest)
+            evs += pygame.event.get()
+            self.dt = self.clock.tick()
+        if evs: self.dirty = True
+        return evs
+
+    def frame(self):
+        """True si este cuadro hay que dibujarlo; lo da por dibujado."""
+        if not self.active: return False
+        self.dirty = False
+        self._last_frame = pygame.time.get_ticks()
+        return True
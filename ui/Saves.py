@@ -1,5 +1,5 @@
 # ui/saves.py
-import os, json, time, math, sys, pygame, importlib, importlib.util
+import os, time, math, sys, pygame, importlib, importlib.util
 
 APP_NAME = "Saved Configurations"
 PALETTE = {
@@ -10,17 +10,28 @@ PALETTE = {
     "text": (235, 235, 240),
     "muted": (170, 175, 185),
     "back": (60, 140, 110),
+    "error": (220, 90, 80),
 }
 
 GRID_COLS = 5
 GRID_ROWS = 3
-MAX_SHOW  = GRID_COLS * GRID_ROWS
+MAX_SHOW  = GRID_COLS * GRID_ROWS     # cards por página
+PREFETCH_MODULES = 20000              # saves más grandes sólo se precargan bajo el mouse
+BUSY_WAKE_MS = 50                     # con lecturas en curso el bucle quieto despierta seguido
 
 # --- asegurar que el directorio del proyecto esté disponible ---
 HERE = os.path.dirname(__file__)
 PROJECT_ROOT = os.path.abspath(os.path.join(HERE, ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+from ui.Fuentes import get_font, render_text
+from ui import Perfil, Redibujo
+from habitat.catalog import TOTAL_KEYS, format_total
+from habitat.summaries import SummaryIndex
+from habitat.query import parse_query
+from habitat.files import load_save
+from habitat.autosave import SaveWorker
+from ui.Miniaturas import ThumbnailCache
 
 # ---------------- utilidades básicas ----------------
 def _saves_dir():
@@ -46,73 +57,274 @@ def _human_time(ts):
     except Exception:
         return "unknown"
 
-def _load_summaries(limit=MAX_SHOW):
+def _refresh_index():
+    """Sincroniza saves/.summaries.sqlite con la carpeta: sólo relee los archivos nuevos o cambiados."""
+    d = _saves_dir()
+    if not os.path.isdir(d):
+        return (0, 0)
+    with SummaryIndex(d) as idx:
+        return idx.refresh()
+
+def _load_summaries(limit=MAX_SHOW, offset=0, query=None):
+    """Resúmenes del índice; con `query` (habitat.query.Query) filtrados y en su orden."""
     d = _saves_dir()
     if not os.path.isdir(d):
         return []
-    items = []
-    for name in os.listdir(d):
-        if not name.lower().endswith(".json"):
-            continue
-        path = os.path.join(d, name)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            ts = data.get("timestamp", os.path.getmtime(path))
-            mods = len(data.get("modules", []))
-            totals = data.get("totals", {})
-            items.append({
-                "path": path,
-                "timestamp": ts,
-                "when": _human_time(ts),
-                "modules": mods,
-                "energy": totals.get("Energy", 0),
-                "o2": totals.get("O2", 0),
-                "waste": totals.get("Waste", 0),
-                "food": totals.get("Food", 0),
-                "crew": totals.get("Crew", 0),
-                "volume": totals.get("Volume", 0),
-            })
-        except Exception:
-            continue
-    items.sort(key=lambda x: x["timestamp"], reverse=True)
-    return items[:limit]
+    with SummaryIndex(d) as idx:
+        if query is None:
+            items = idx.latest(limit, offset)
+        else:
+            if query.limit is not None: limit = max(0, min(limit, query.limit - offset))
+            items = query.run(idx, offset, limit)
+    for it in items:
+        it["when"] = _human_time(it["timestamp"])
+    return items
+
+def _count_summaries(query=None):
+    d = _saves_dir()
+    if not os.path.isdir(d): return 0
+    with SummaryIndex(d) as idx:
+        return len(idx) if query is None else query.count(idx)
+
+def _file_key(path):
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+def _load_config(path):
+    """(clave del archivo, (Habitat, cámara)): lo que modulos_screen acepta ya cargado."""
+    key = _file_key(path)
+    hab, camera, _ = load_save(path, editable=True)   # un diario queda enganchado, como al abrirlo por ruta
+    return key, (hab, camera)
+
+# configs elegidas en la última saves_screen, listas para el lanzador
+_preloaded = {}
+
+def take_preloaded(path):
+    """(Habitat, cámara) precargado de `path` si el archivo no cambió desde entonces; si no, None."""
+    entry = _preloaded.pop(path, None)
+    if entry is not None and entry[0] == _file_key(path):
+        return entry[1]
+    return None
+
+# ---------------- paginación y precarga ----------------
+class _Browser:
+    """Páginas de resúmenes y configs precargadas alrededor de la página visible.
+
+    Sólo se guardan la página actual y sus vecinas. Las vecinas (resúmenes y
+    configs) se leen en un hilo; un trabajo cuya página dejó de ser vecina
+    cuando le toca correr no hace nada. El card bajo el mouse se carga en otro
+    hilo para no esperar detrás de la precarga de páginas.
+
+    Con una consulta (set_query) las páginas salen del índice ya filtradas y
+    ordenadas; las páginas pedidas con la consulta anterior se descartan.
+
+    El índice se sincroniza con la carpeta en el hilo de fondo (con miles de
+    saves nuevos tarda segundos); hasta que termina no hay páginas y la
+    pantalla dibuja cards de espera.
+    """
+    def __init__(self, page_size=MAX_SHOW):
+        self.page_size = page_size
+        self.page = 0
+        self.pages = {}            # página -> resúmenes
+        self.configs = {}          # ruta -> (clave del archivo, (Habitat, cámara))
+        self.pending = set()       # etiquetas encoladas y sin resultado
+        self.closed = False
+        self.query = None
+        self.generation = 0        # sube con cada consulta: invalida las páginas en vuelo
+        self.indexed = False       # True cuando terminó el refresh del índice
+        self.total = 0
+        self.bg = SaveWorker(); self.fg = SaveWorker()
+        # primero en la cola de fondo: la precarga de páginas espera detrás
+        self._submit(self.bg, ("index", None), lambda: None if self.closed else _refresh_index())
+
+    def set_query(self, query):
+        """Muestra sólo lo que cumple `query` (None: todo, del más nuevo al más viejo)."""
+        self.query = query; self.generation += 1
+        self.page = 0; self.pages = {}
+        if not self.indexed: return          # se aplica cuando termine el refresh
+        self.pages[0] = self._load(0)
+        self.total = _count_summaries(query)
+        self._prefetch()
+
+    def _load(self, page):
+        return _load_summaries(self.page_size, page * self.page_size, query=self.query)
+
+    @property
+    def page_count(self): return max(1, -(-self.total // self.page_size))
+
+    @property
+    def busy(self): return bool(self.pending)
+
+    def items(self):
+        if not self.indexed: return []
+        items = self.pages.get(self.page)
+        if items is None:
+            # salto a una página no precargada: la consulta al índice es de ~1 ms
+            items = self.pages[self.page] = self._load(self.page)
+            self._prefetch()
+        return items
+
+    def go(self, page):
+        page = max(0, min(self.page_count - 1, page))
+        if page == self.page: return False
+        self.page = page
+        self._prefetch()
+        return True
+
+    def _near(self, page):
+        return not self.closed and abs(page - self.page) <= 1
+
+    def _submit(self, worker, tag, job):
+        if tag in self.pending: return
+        self.pending.add(tag); worker.submit(job, tag)
+
+    def want_config(self, path, page=None):
+        """Encola la carga de `path`; page=None es el card bajo el mouse (hilo aparte)."""
+        if path in self.configs: return
+        if page is None:
+            self._submit(self.fg, ("config", path), lambda: None if self.closed else _load_config(path))
+        else:
+            self._submit(self.bg, ("config", path), lambda: _load_config(path) if self._near(page) else None)
+
+    def _prefetch(self):
+        if not self.indexed: return
+        keep = set()
+        for p in (self.page, self.page - 1, self.page + 1):
+            if not 0 <= p < self.page_count: continue
+            items = self.pages.get(p)
+            if items is None:
+                if p != self.page:
+                    gen = self.generation
+                    self._submit(self.bg, ("page", (gen, p)),
+                                 lambda p=p, gen=gen: self._load(p) if self._near(p) and gen == self.generation else None)
+                continue
+            for it in items:
+                keep.add(it["path"])
+                if p != self.page and it["modules"] <= PREFETCH_MODULES:
+                    self.want_config(it["path"], p)
+        for p in [p for p in self.pages if not self._near(p)]: del self.pages[p]
+        for path in [x for x in self.configs if x not in keep]: del self.configs[path]
+
+    def poll(self):
+        """Incorpora lo que terminaron los hilos; True si llegó algo."""
+        results = self.bg.poll() + self.fg.poll()
+        new_page = False
+        for ok, res, tag in results:
+            self.pending.discard(tag)
+            if tag[0] == "index":
+                # aunque el refresh falle se muestra lo que el índice ya tenía
+                if not self.closed: self._indexed(); new_page = True
+                continue
+            if not ok or res is None: continue      # descartado o ilegible: se abre por ruta
+            kind, key = tag
+            if kind == "page":
+                gen, p = key
+                if gen == self.generation and self._near(p): self.pages[p] = res; new_page = True
+            else:
+                self.configs[key] = res
+        if new_page: self._prefetch()
+        return bool(results)
+
+    def _indexed(self):
+        self.indexed = True
+        self.page = 0; self.pages = {0: self._load(0)}
+        self.total = _count_summaries(self.query)
+
+    def ready(self, path):
+        """Entrada precargada de `path` si sigue al día con el archivo (o None)."""
+        entry = self.configs.get(path)
+        return entry if entry is not None and entry[0] == _file_key(path) else None
+
+    def close(self):
+        # lo encolado se descarta; una carga en curso termina sola en su hilo
+        self.closed = True
+        self.bg.close(timeout=0); self.fg.close(timeout=0)
 
 # ---------------- dibujado ----------------
 def _draw_back_button(screen, rect, font):
     pygame.draw.rect(screen, PALETTE["back"], rect, border_radius=10)
-    label = font.render("Back", True, (255, 255, 255))
+    label = render_text(font, "Back", (255, 255, 255))
     screen.blit(label, label.get_rect(center=rect.center))
 
-def _draw_card(screen, rect, item, fonts):
+def _draw_pager(screen, prev_rect, next_rect, page, count, total, font, noun="saves"):
+    for r, sign, active in ((prev_rect, -1, page > 0), (next_rect, 1, page < count - 1)):
+        pygame.draw.rect(screen, PALETTE["accent"] if active else PALETTE["card"], r, border_radius=10)
+        cx, cy = r.center; s = r.w * 0.2
+        pts = [(cx + sign * s, cy), (cx - sign * s, cy - s), (cx - sign * s, cy + s)]
+        pygame.draw.polygon(screen, PALETTE["text"] if active else PALETTE["muted"], pts)
+    label = render_text(font, f"Page {page + 1} / {count}  ·  {total} {noun}", PALETTE["muted"])
+    screen.blit(label, label.get_rect(midright=(prev_rect.left - 12, prev_rect.centery)))
+
+def _draw_search(screen, rect, text, editing, error, font):
+    """Campo de consulta (habitat.query): "/" o click para escribir, Enter aplica, Esc limpia."""
+    pygame.draw.rect(screen, PALETTE["card"], rect, border_radius=8)
+    pygame.draw.rect(screen, PALETTE["error"] if error else PALETTE["accent"] if editing else PALETTE["card_border"],
+                     rect, 2, border_radius=8)
+    if text or editing:
+        label = render_text(font, text + ("|" if editing else ""), PALETTE["text"])
+    else:
+        label = render_text(font, "/  filter: crew>=8 energy>=-2000 sort:volume", PALETTE["muted"])
+    # si no entra, se ve el final (lo que se está escribiendo)
+    clip = screen.get_clip(); screen.set_clip(rect.inflate(-16, 0))
+    screen.blit(label, label.get_rect(midleft=(rect.x + 8, rect.centery)).move(min(0, rect.w - 16 - label.get_width()), 0))
+    screen.set_clip(clip)
+    if error:
+        msg = render_text(font, error, PALETTE["error"])
+        screen.blit(msg, msg.get_rect(topright=(rect.right, rect.bottom + 4)))
+
+def _scaled_thumb(thumb, box):
+    """La miniatura ajustada a `box` (w, h) conservando la proporción; en caché por tamaño."""
+    key = (id(thumb), box)
+    out = _thumb_scaled.get(key)
+    if out is None:
+        tw, th = thumb.get_size()
+        k = min(box[0] / tw, box[1] / th)
+        out = pygame.transform.smoothscale(thumb, (max(1, int(tw * k)), max(1, int(th * k))))
+        if len(_thumb_scaled) > 4 * MAX_SHOW: _thumb_scaled.clear()
+        _thumb_scaled[key] = out
+    return out
+
+_thumb_scaled = {}
+
+def _draw_card(screen, rect, item, fonts, hover=False, ready=False, thumb=None):
     f_title, f_line, f_small = fonts
     pygame.draw.rect(screen, PALETTE["card"], rect, border_radius=12)
-    pygame.draw.rect(screen, PALETTE["card_border"], rect, 2, border_radius=12)
+    pygame.draw.rect(screen, PALETTE["accent"] if hover else PALETTE["card_border"], rect, 2, border_radius=12)
+    if ready:   # config ya en memoria: se abre sin esperar
+        pygame.draw.circle(screen, PALETTE["back"], (rect.right - 14, rect.y + 14), 5)
 
     when = item["when"]
-    title = f_title.render(when, True, PALETTE["text"])
+    title = render_text(f_title, when, PALETTE["text"])
     screen.blit(title, (rect.x + 12, rect.y + 10))
 
     base = os.path.basename(item["path"])
-    tpath = f_small.render(base, True, PALETTE["muted"])
+    tpath = render_text(f_small, base, PALETTE["muted"])
     screen.blit(tpath, (rect.x + 12, rect.y + 10 + title.get_height() + 4))
 
     y_sep = rect.y + 10 + title.get_height() + 8 + tpath.get_height()
     pygame.draw.line(screen, PALETTE["card_border"], (rect.x + 10, y_sep), (rect.right - 10, y_sep), 1)
 
-    lines = [
-        ("Modules", f"{item['modules']}"),
-        ("Crew",    f"{int(item['crew'])}"),
-        ("Energy",  f"{int(item['energy'])} W"),
-        ("O2",      f"{item['o2']:.2f} kg/d"),
-        ("Waste",   f"{item['waste']:.2f} kg/d"),
-        ("Food",    f"{item['food']:.2f} kg/d"),
-        ("Volume",  f"{item['volume']:.2f} m³"),
-    ]
-    y = y_sep + 8
+    # franja de la miniatura (placeholder hasta que llega del Pool)
+    band = pygame.Rect(rect.x + 10, y_sep + 6, rect.w - 20, max(24, int(rect.h * 0.3)))
+    if thumb is not None:
+        img = _scaled_thumb(thumb, band.size)
+        screen.blit(img, img.get_rect(center=band.center))
+    else:
+        pygame.draw.rect(screen, PALETTE["bg"], band, border_radius=6)
+        dots = render_text(f_small, "...", PALETTE["muted"])
+        screen.blit(dots, dots.get_rect(center=band.center))
+
+    # columnas del catálogo que el save trae guardadas, con las unidades cortas de siempre ("kg/d")
+    totals = item["totals"]
+    lines = [("Modules", f"{item['modules']}")]
+    lines += [(k, format_total(k, totals[k], short=True)) for k in TOTAL_KEYS if k in totals]
+    y = band.bottom + 6
     for k, v in lines:
-        text = f_line.render(f"{k}: ", True, PALETTE["muted"])
-        val  = f_line.render(v, True, PALETTE["text"])
+        text = render_text(f_line, f"{k}: ", PALETTE["muted"])
+        val  = render_text(f_line, v, PALETTE["text"])
         screen.blit(text, (rect.x + 12, y))
         screen.blit(val,  (rect.x + 12 + text.get_width(), y))
         y += text.get_height() + 6
@@ -125,8 +337,10 @@ def _grid_layout(sw, sh):
     spacing_x = max(12, int(sw * 0.01))
     spacing_y = max(12, int(sh * 0.02))
 
+    back_h = max(36,  int(sh * 0.06))
     usable_w = sw - margin_x * 2 - spacing_x * (GRID_COLS - 1)
-    usable_h = sh - margin_y - margin_x - spacing_y * (GRID_ROWS - 1)
+    # abajo queda la fila de Back y el paginado
+    usable_h = sh - margin_y - margin_x - back_h - spacing_y * GRID_ROWS
 
     card_w = max(180, usable_w // GRID_COLS)
     card_h = max(150, usable_h // GRID_ROWS)
@@ -141,68 +355,150 @@ def _grid_layout(sw, sh):
         y += card_h + spacing_y
 
     back_w = max(120, int(sw * 0.12))
-    back_h = max(36,  int(sh * 0.06))
     back_rect = pygame.Rect(margin_x, sh - back_h - margin_x, back_w, back_h)
-    return rects, back_rect
+    # paginado abajo a la derecha: [<] [>]
+    next_rect = pygame.Rect(sw - margin_x - back_h, back_rect.top, back_h, back_h)
+    prev_rect = next_rect.move(-(back_h + spacing_x), 0)
+    # consulta arriba a la derecha, en la fila del título
+    search_w = max(240, int(sw * 0.35))
+    search_rect = pygame.Rect(sw - margin_x - search_w, max(10, int(sh * 0.03)), search_w, back_h)
+    return rects, back_rect, prev_rect, next_rect, search_rect
 
 def _fonts_for_screen(sw, sh):
     base = max(12, int(min(sw, sh) * 0.018))
-    f_title = pygame.font.SysFont(None, base + 4)
-    f_line  = pygame.font.SysFont(None, base)
-    f_small = pygame.font.SysFont(None, max(12, base - 2))
-    f_h1    = pygame.font.SysFont(None, base + 10)
+    f_title = get_font(None, base + 4)
+    f_line  = get_font(None, base)
+    f_small = get_font(None, max(12, base - 2))
+    f_h1    = get_font(None, base + 10)
     return f_h1, f_title, f_line, f_small
 
 # ---------------- pantalla de saves ----------------
 def saves_screen(screen):
-    clock = pygame.time.Clock()
+    prof = Perfil.start("saves")
+    try:
+        return _saves_loop(screen, prof)
+    finally:
+        prof.close()
+
+def _saves_loop(screen, prof):
+    sched = Redibujo.Scheduler(60)
     pygame.display.set_caption(APP_NAME)
 
-    items = _load_summaries()
+    browser = _Browser()
+    thumbs = ThumbnailCache(_saves_dir())
+    try:
+        return _browse(screen, prof, sched, browser, thumbs)
+    finally:
+        browser.close(); thumbs.close()
+
+def _browse(screen, prof, sched, browser, thumbs):
     sw, sh = screen.get_size()
-    rects, back_rect = _grid_layout(sw, sh)
+    rects, back_rect, prev_rect, next_rect, search_rect = _grid_layout(sw, sh)
     f_h1, f_title, f_line, f_small = _fonts_for_screen(sw, sh)
+    hover = None
+    thumbs_for = None          # página cuyas miniaturas (y las de sus vecinas) ya se pidieron
+    search, editing, search_error = "", False, None
 
-    running = True
-    selected_path = None
-
-    while running:
-        for e in pygame.event.get():
+    def apply_search(text):
+        nonlocal search_error, thumbs_for
+        try:
+            browser.set_query(parse_query(text) if text.strip() else None)
+        except ValueError as err:
+            search_error = str(err); return False
+        search_error = None; thumbs_for = None
+        return True
+
+    def card_at(pos):
+        items = browser.items()
+        for i, r in enumerate(rects):
+            if i < len(items) and r.collidepoint(pos): return i
+        return None
+
+    while True:
+        events = sched.events(timeout=BUSY_WAKE_MS if browser.busy or thumbs.busy else None)
+        prof.begin_frame()
+        if browser.poll(): sched.mark_dirty(); thumbs_for = None
+        if thumbs.poll(): sched.mark_dirty()
+        prof.mark("prefetch")
+        for e in events:
+            if prof.handle_event(e): continue
             if e.type == pygame.QUIT:
                 return None
-            elif e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
-                return None
+            elif e.type == pygame.KEYDOWN and editing:
+                if e.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                    if apply_search(search): editing = False
+                elif e.key == pygame.K_ESCAPE:
+                    search, editing = "", False
+                    if browser.query is not None or search_error: apply_search("")
+                elif e.key == pygame.K_BACKSPACE: search = search[:-1]
+                elif e.unicode and e.unicode.isprintable(): search += e.unicode
+                continue
+            elif e.type == pygame.KEYDOWN:
+                if e.key == pygame.K_ESCAPE: return None
+                elif e.key == pygame.K_SLASH or e.unicode == "/": editing = True; continue
+                elif e.key in (pygame.K_PAGEUP, pygame.K_LEFT):    browser.go(browser.page - 1)
+                elif e.key in (pygame.K_PAGEDOWN, pygame.K_RIGHT): browser.go(browser.page + 1)
+                elif e.key == pygame.K_HOME: browser.go(0)
+                elif e.key == pygame.K_END:  browser.go(browser.page_count - 1)
+            elif e.type == pygame.MOUSEWHEEL:
+                browser.go(browser.page - (1 if e.y > 0 else -1))
             elif e.type == pygame.VIDEORESIZE:
                 screen = pygame.display.get_surface()
                 sw, sh = screen.get_size()
-                rects, back_rect = _grid_layout(sw, sh)
+                rects, back_rect, prev_rect, next_rect, search_rect = _grid_layout(sw, sh)
                 f_h1, f_title, f_line, f_small = _fonts_for_screen(sw, sh)
             elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
-                mouse = pygame.mouse.get_pos()
+                mouse = e.pos
+                editing = search_rect.collidepoint(mouse)
+                if editing: continue
                 if back_rect.collidepoint(mouse):
                     return None
-                for i, r in enumerate(rects):
-                    if i < len(items) and r.collidepoint(mouse):
-                        selected_path = items[i]["path"]
-                        return selected_path
+                if prev_rect.collidepoint(mouse): browser.go(browser.page - 1); continue
+                if next_rect.collidepoint(mouse): browser.go(browser.page + 1); continue
+                i = card_at(mouse)
+                if i is not None:
+                    path = browser.items()[i]["path"]
+                    entry = browser.ready(path)
+                    if entry is not None: _preloaded[path] = entry
+                    return path
+            # el card bajo el mouse se empieza a cargar antes del click
+            if e.type in (pygame.MOUSEMOTION, pygame.MOUSEWHEEL, pygame.KEYDOWN):
+                hover = card_at(e.pos if e.type == pygame.MOUSEMOTION else pygame.mouse.get_pos())
+                if hover is not None: browser.want_config(browser.items()[hover]["path"])
+        prof.mark("events")
+        if not sched.frame(): continue
 
         screen.fill(PALETTE["bg"])
-        title = f_h1.render("Saved configurations", True, PALETTE["text"])
+        title = render_text(f_h1, "Saved configurations", PALETTE["text"])
         screen.blit(title, (max(16, int(sw*0.02)), max(10, int(sh*0.03))))
 
+        # sólo los cards de la página visible
+        items = browser.items()
+        if thumbs_for != browser.page:
+            # primero la página visible, después las vecinas ya leídas
+            visible = [it["path"] for p in (browser.page, browser.page - 1, browser.page + 1)
+                       for it in browser.pages.get(p, ())]
+            for path in visible: thumbs.request(path)
+            thumbs.forget(visible); thumbs_for = browser.page
         fonts_card = (f_title, f_line, f_small)
         for i, r in enumerate(rects):
             if i < len(items):
-                _draw_card(screen, r, items[i], fonts_card)
+                _draw_card(screen, r, items[i], fonts_card, hover=i == hover,
+                           ready=items[i]["path"] in browser.configs, thumb=thumbs.get(items[i]["path"]))
             else:
                 pygame.draw.rect(screen, PALETTE["card"], r, border_radius=12)
                 pygame.draw.rect(screen, (80, 80, 90), r, 1, border_radius=12)
-                hint = f_small.render("Empty", True, (120, 120, 130))
+                hint = render_text(f_small, "Empty" if browser.indexed else "...", (120, 120, 130))
                 screen.blit(hint, hint.get_rect(center=r.center))
 
         _draw_back_button(screen, back_rect, f_title)
+        _draw_search(screen, search_rect, search, editing, search_error, f_small)
+        _draw_pager(screen, prev_rect, next_rect, browser.page, browser.page_count, browser.total, f_small,
+                    "saves" if browser.query is None else "matches")
+        prof.mark("cards")
+        prof.draw(screen)
         pygame.display.flip()
-        clock.tick(60)
+        prof.end_frame()
 
 # ---------------- lanzador principal ----------------
 def _load_module_by_path(module_name: str, file_path: str):
@@ -245,7 +541,8 @@ def open_saves_and_launch(launch_module: str = os.environ.get("HAB_LAUNCH_MOD",
 
     pygame.quit()
     screen2 = create_window()
-    modulos_screen(screen2, config=selected)
+    # si el save se precargó al pasar el mouse se entrega ya armado
+    modulos_screen(screen2, config=take_preloaded(selected) or selected)
 
 # -------------- ejecutable directo --------------
 if __name__ == "__main__":
@@ -28,14 +28,16 @@ NAVY =_hex_rgb(PALETTE["navy"])
 AREA_MARTE=_hex_rgba01(PALETTE["mars"],0.55)
 AREA_LUNA =_hex_rgba01(PALETTE["moon"],0.55)
 
+from ui.Fuentes import get_font, render_text
+from ui import Perfil, Redibujo
+
 # ---------- Estado exportado ----------
 GLOBAL_YMAX = 1.0
 GLOBAL_MIN_ENERGY = None
 
 # ---------- Utilidades UI ----------
 def _text(surf, txt, size, color, center=None, topleft=None):
-    f = pygame.font.SysFont(None, size)
-    r = f.render(txt, True, color)
+    r = render_text(get_font(None, size), txt, color)
     rect = r.get_rect()
     if center: rect.center = center
     if topleft: rect.topleft = topleft
@@ -112,9 +114,16 @@ def _load_bg(body, size):
 # ---------- Pantalla pública ----------
 def energia_screen(screen):
     """Annual energy screen. Returns dict with {'body','lat'} or None when returning to the menu."""
+    prof = Perfil.start("energia")
+    try:
+        return _energia_loop(screen, prof)
+    finally:
+        prof.close()
+
+def _energia_loop(screen, prof):
     global GLOBAL_YMAX, GLOBAL_MIN_ENERGY
 
-    clock = pygame.time.Clock()
+    sched = Redibujo.Scheduler(60)
     running = True
     lat_norm = 0.5
     dragging = False
@@ -123,7 +132,8 @@ def energia_screen(screen):
     tmp_path = os.path.join(tempfile.gettempdir(), f"energia_{os.getpid()}.png")
 
     while running:
-        dt = clock.tick(60)
+        events = sched.events()
+        prof.begin_frame()
         W, H = screen.get_size()
         # Relative, more compact layout for small screens
         m = max(8, int(min(W, H) * 0.03))           # horizontal margin (3% of the smaller dimension)
@@ -144,7 +154,8 @@ def energia_screen(screen):
         graph_h = max(100, min(int(H * 0.45), H - graph_top - m))
         graph = pygame.Rect(m, graph_top, max(160, W - 2 * m), graph_h)
 
-        for e in pygame.event.get():
+        for e in events:
+            if prof.handle_event(e): continue
             if e.type == pygame.QUIT:
                 return None
             elif e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
@@ -177,6 +188,8 @@ def energia_screen(screen):
                 x0, x1 = slider.left+12, slider.right-12
                 if x1 > x0:
                     lat_norm = max(0, min(1, (e.pos[0]-x0)/float(x1-x0)))
+        prof.mark("events")
+        if not sched.frame(): continue
 
         # Background with body image + veil
         bg = _cache_bg.get(body)
@@ -210,8 +223,11 @@ def energia_screen(screen):
             y_offset = max(6, int(H * 0.01))
             screen.blit(frame, (graph.left-6, graph.top-6 + y_offset))
             screen.blit(graph_surf, (graph.left, graph.top + y_offset))
+        prof.mark("draw")
+        prof.draw(screen)
 
         pygame.display.flip()
+        prof.end_frame()
 
     # nunca llega
 